@@ -0,0 +1,83 @@
+"""
+Self-test demo for Performance-Tracker
+
+These functions used to live at the bottom of performance_tracker/monitor.py,
+which meant every import of the package defined and decorated them. Run this
+file directly to exercise timing, memory and recursion tracking end to end.
+"""
+
+from time import sleep
+
+from performance_tracker import (
+    performance_monitor,
+    reset_performance_stats,
+    show_performance_report,
+)
+
+
+@performance_monitor(track_recursion=False, track_memory=True, verbose=True)
+def simple_function():
+    sleep(0.1)
+    return "done"
+
+
+@performance_monitor(track_memory=True, verbose=True)
+def memory_heavy_function():
+    big_list = [i for i in range(1000000)]
+    return len(big_list)
+
+
+@performance_monitor(track_memory=True, verbose=True)
+def recursive_factorial(n):
+    if n <= 1:
+        return 1
+    return n * recursive_factorial(n - 1)
+
+
+# Global variable to test memory retention
+memory_keeper = []
+
+
+@performance_monitor(track_memory=True, verbose=True)
+def function_that_keeps_memory():
+    big_list = [i for i in range(500000)]
+    memory_keeper.append(big_list)
+    return len(big_list)
+
+
+@performance_monitor(track_memory=True, verbose=True)
+def function_that_releases_memory():
+    big_list = [i for i in range(500000)]
+    return len(big_list)
+
+
+# Example usage
+if __name__ == "__main__":
+    print("Running performance tests...")
+
+    # Test each function multiple times
+    simple_function()
+    simple_function()
+
+    memory_heavy_function()
+    memory_heavy_function()
+
+    recursive_factorial(5)
+    recursive_factorial(3)
+
+    function_that_keeps_memory()
+    function_that_releases_memory()
+    function_that_keeps_memory()
+
+    # Show the comprehensive report
+    show_performance_report(output="detailed")
+
+    print("\n" + "=" * 50)
+    print("Testing report functions...")
+
+    # Test reset functionality
+    print("\nResetting stats...")
+    reset_performance_stats()
+
+    # Verify reset worked
+    show_performance_report(output="detailed")
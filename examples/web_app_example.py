@@ -2,7 +2,9 @@
 Web application performance monitoring example
 
 This demonstrates how to use Performance-Tracker in a Flask web application
-to monitor API endpoint performance.
+to monitor API endpoint performance. The WSGI middleware records per-route
+latency and status codes, and attributes the decorated helpers below to the
+route that called them.
 """
 
 try:
@@ -14,10 +16,16 @@ except ImportError:
 import random
 import time
 
+from performance_tracker import WSGIMiddleware
 from performance_tracker import get_performance_stats as get_stats
-from performance_tracker import performance_monitor, show_performance_report
+from performance_tracker import (
+    get_request_stats,
+    performance_monitor,
+    show_performance_report,
+)
 
 app = Flask(__name__)
+app.wsgi_app = WSGIMiddleware(app.wsgi_app)
 
 # Database simulation
 fake_users = [
@@ -88,6 +96,12 @@ def get_performance_stats():
     return jsonify(stats)
 
 
+@app.route("/performance/requests")
+def request_performance():
+    """Get per-route request latency, status classes and attributed calls"""
+    return jsonify(get_request_stats())
+
+
 @app.route("/performance/report")
 def performance_report():
     """Get formatted performance report"""
@@ -112,6 +126,7 @@ if __name__ == "__main__":
     print("  http://localhost:5000/users/1")
     print("  http://localhost:5000/report")
     print("  http://localhost:5000/performance")
+    print("  http://localhost:5000/performance/requests")
     print("  http://localhost:5000/performance/report")
 
     app.run(debug=True, port=5000)
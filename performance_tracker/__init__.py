@@ -10,23 +10,93 @@ Key Features:
     - Memory leak detection and analysis
     - Recursion-aware tracking for complex algorithms
     - Thread-safe operation for concurrent applications
+    - Optional GC pause attribution via enable_gc_tracking()
+    - Columnar bulk analysis with an optional NumPy fast path
+    - Class, module and package-wide auto-instrumentation
+    - Span API for timing code blocks with track() and start_span()
+    - WSGI/ASGI middleware with per-route latency histograms
+    - Memoization advice and an instrumented LRU/TTL cache decorator
+    - Thread/process pool executors that record queue wait and utilization
+    - Coroutine support and asyncio loop-lag and slow-callback monitoring
+    - Sampling profiler with folded stacks and per-function hot lines
+    - Runtime attach/detach over a control socket or config reload signal
+    - O(functions) read-only snapshots and deltas between reads
+    - Self-calibrated instrumentation overhead, optionally subtracted
+    - Cold-start calls kept apart from steady-state latency
+    - Per-label breakdowns (tenant, endpoint, ...) with bounded cardinality
+    - Chrome trace-event / Perfetto timelines of calls across threads and tasks
+    - Batched StatsD/DogStatsD push exporter with per-interval aggregation
+    - In-flight call table and a watchdog that reports hung calls with stacks
+    - Instrumented locks that charge lock wait time to monitored functions
     - Minimal performance overhead (~1-2 μs per function call)
 
 For complete documentation, visit:
 https://github.com/usakocher/python-performance-monitor
 """
 
-from typing import TYPE_CHECKING
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
 from .monitor import (
     get_performance_stats,
+    mark_warm,
+    merge_performance_stats,
     performance_monitor,
     reset_performance_stats,
     show_performance_report,
 )
 
 if TYPE_CHECKING:
-    from typing import Any, Callable, Dict, TypeVar
+    from typing import Callable, Dict, TypeVar
+
+    from .analysis import StatsColumns, columnar_stats, export_columnar
+    from .cache import cached_monitor
+    from .control import attach, detach, start_control_server
+    from .executors import MonitoredProcessPoolExecutor, MonitoredThreadPoolExecutor
+    from .gc_tracking import (
+        disable_gc_tracking,
+        enable_gc_tracking,
+        is_gc_tracking_enabled,
+    )
+    from .histogram import LatencyHistogram
+    from .instrument import (
+        install_import_hook,
+        instrument_class,
+        instrument_module,
+        uninstall_import_hook,
+        uninstrument_class,
+        uninstrument_module,
+    )
+    from .labels import bind_labels, current_labels
+    from .locks import (
+        MonitoredBoundedSemaphore,
+        MonitoredCondition,
+        MonitoredLock,
+        MonitoredRLock,
+        MonitoredSemaphore,
+        get_lock_stats,
+        patch_threading,
+        reset_lock_stats,
+        unpatch_threading,
+    )
+    from .loop_monitor import LoopMonitor, monitor_event_loop
+    from .middleware import (
+        ASGIMiddleware,
+        WSGIMiddleware,
+        get_request_stats,
+        reset_request_stats,
+    )
+    from .overhead import (
+        calibrate_overhead,
+        disable_overhead_accounting,
+        enable_overhead_accounting,
+    )
+    from .profiler import SamplingProfiler, start_profiler
+    from .snapshots import StatsSnapshot, delta, take_snapshot
+    from .spans import Span, start_span, track
+    from .statsd import StatsDExporter, start_statsd_exporter
+    from .timeline import TraceRecorder, TraceWriter, capture_trace
+    from .watchdog import Watchdog, concurrency, in_flight_calls, start_watchdog
 
     # Type aliases for better IDE support
     PerformanceStats = Dict[str, Dict[str, Any]]
@@ -35,18 +105,154 @@ if TYPE_CHECKING:
 __version__ = "1.0.1"
 __author__ = "Adam Kocher"
 
+# Optional subsystems are only imported when one of their names is first used,
+# so `import performance_tracker` stays cheap for short-lived CLI processes.
+_LAZY_ATTRIBUTES = {
+    "enable_gc_tracking": "gc_tracking",
+    "disable_gc_tracking": "gc_tracking",
+    "is_gc_tracking_enabled": "gc_tracking",
+    "columnar_stats": "analysis",
+    "export_columnar": "analysis",
+    "StatsColumns": "analysis",
+    "instrument_class": "instrument",
+    "uninstrument_class": "instrument",
+    "instrument_module": "instrument",
+    "uninstrument_module": "instrument",
+    "install_import_hook": "instrument",
+    "uninstall_import_hook": "instrument",
+    "track": "spans",
+    "start_span": "spans",
+    "Span": "spans",
+    "WSGIMiddleware": "middleware",
+    "ASGIMiddleware": "middleware",
+    "get_request_stats": "middleware",
+    "reset_request_stats": "middleware",
+    "LatencyHistogram": "histogram",
+    "cached_monitor": "cache",
+    "MonitoredThreadPoolExecutor": "executors",
+    "MonitoredProcessPoolExecutor": "executors",
+    "LoopMonitor": "loop_monitor",
+    "monitor_event_loop": "loop_monitor",
+    "SamplingProfiler": "profiler",
+    "start_profiler": "profiler",
+    "attach": "control",
+    "detach": "control",
+    "start_control_server": "control",
+    "take_snapshot": "snapshots",
+    "delta": "snapshots",
+    "StatsSnapshot": "snapshots",
+    "enable_overhead_accounting": "overhead",
+    "disable_overhead_accounting": "overhead",
+    "calibrate_overhead": "overhead",
+    "bind_labels": "labels",
+    "current_labels": "labels",
+    "TraceRecorder": "timeline",
+    "TraceWriter": "timeline",
+    "capture_trace": "timeline",
+    "StatsDExporter": "statsd",
+    "start_statsd_exporter": "statsd",
+    "Watchdog": "watchdog",
+    "start_watchdog": "watchdog",
+    "in_flight_calls": "watchdog",
+    "concurrency": "watchdog",
+    "MonitoredLock": "locks",
+    "MonitoredRLock": "locks",
+    "MonitoredCondition": "locks",
+    "MonitoredSemaphore": "locks",
+    "MonitoredBoundedSemaphore": "locks",
+    "patch_threading": "locks",
+    "unpatch_threading": "locks",
+    "get_lock_stats": "locks",
+    "reset_lock_stats": "locks",
+}
+
 __all__ = [
     "performance_monitor",
     "show_performance_report",
     "reset_performance_stats",
     "get_performance_stats",
+    "merge_performance_stats",
+    "mark_warm",
+    "enable_gc_tracking",
+    "disable_gc_tracking",
+    "is_gc_tracking_enabled",
+    "columnar_stats",
+    "export_columnar",
+    "StatsColumns",
+    "instrument_class",
+    "uninstrument_class",
+    "instrument_module",
+    "uninstrument_module",
+    "install_import_hook",
+    "uninstall_import_hook",
+    "track",
+    "start_span",
+    "Span",
+    "WSGIMiddleware",
+    "ASGIMiddleware",
+    "get_request_stats",
+    "reset_request_stats",
+    "LatencyHistogram",
+    "cached_monitor",
+    "MonitoredThreadPoolExecutor",
+    "MonitoredProcessPoolExecutor",
+    "LoopMonitor",
+    "monitor_event_loop",
+    "SamplingProfiler",
+    "start_profiler",
+    "attach",
+    "detach",
+    "start_control_server",
+    "take_snapshot",
+    "delta",
+    "StatsSnapshot",
+    "enable_overhead_accounting",
+    "disable_overhead_accounting",
+    "calibrate_overhead",
+    "bind_labels",
+    "current_labels",
+    "TraceRecorder",
+    "TraceWriter",
+    "capture_trace",
+    "StatsDExporter",
+    "start_statsd_exporter",
+    "Watchdog",
+    "start_watchdog",
+    "in_flight_calls",
+    "concurrency",
+    "MonitoredLock",
+    "MonitoredRLock",
+    "MonitoredCondition",
+    "MonitoredSemaphore",
+    "MonitoredBoundedSemaphore",
+    "patch_threading",
+    "unpatch_threading",
+    "get_lock_stats",
+    "reset_lock_stats",
     # Type exports for advanced users
     "PerformanceStats",
     "MonitoredFunction",
 ]
 
+
+def __getattr__(name: str) -> Any:
+    """Import an optional subsystem the first time one of its names is used"""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
 # Module-level docstring attributes for better IDE discovery
 performance_monitor.__module__ = __name__
 show_performance_report.__module__ = __name__
 reset_performance_stats.__module__ = __name__
 get_performance_stats.__module__ = __name__
+merge_performance_stats.__module__ = __name__
+mark_warm.__module__ = __name__
@@ -0,0 +1,365 @@
+"""Columnar, bulk analysis of collected performance statistics
+
+The per-function stats dicts are convenient for recording, but walking them
+in Python is slow once there are thousands of functions and millions of
+samples. ``columnar_stats()`` flattens them once into column arrays (NumPy
+when installed, ``array.array`` otherwise) and computes aggregates for every
+function in a single pass.
+"""
+
+import math
+from array import array
+from itertools import chain
+from typing import Any, Optional, Sequence
+
+from .monitor import performance_stats
+
+# Scalar fields copied into one column each, with their array typecodes
+SCALAR_COLUMNS: dict[str, str] = {
+    "call_count": "q",
+    "success_count": "q",
+    "failure_count": "q",
+    "total_time": "d",
+    "min_time": "d",
+    "max_time": "d",
+    "total_memory_used": "d",
+    "max_memory_peak": "d",
+    "gc_pause_time": "d",
+}
+
+# Per-call sample fields stored as one flat column plus shared offsets
+SAMPLE_COLUMNS = ("times", "memory_peaks")
+
+_numpy: Any = None
+
+
+def _load_numpy() -> Any:
+    """Import NumPy on first use, returning None if it is not installed"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            _numpy = False
+        else:
+            _numpy = numpy
+    return _numpy or None
+
+
+def has_numpy() -> bool:
+    """Return True if the NumPy fast path is available"""
+    return _load_numpy() is not None
+
+
+class StatsColumns:
+    """Column-oriented view of performance statistics
+
+    Row ``i`` of every column belongs to ``names[i]``. The samples of
+    function ``i`` are ``samples[offsets[i]:offsets[i + 1]]``.
+    """
+
+    def __init__(
+        self, stats: dict[str, dict[str, Any]], backend: Optional[str] = None
+    ) -> None:
+        np = _load_numpy()
+        if backend is None:
+            backend = "numpy" if np is not None else "array"
+        if backend == "numpy" and np is None:
+            raise ImportError(
+                "NumPy backend requested but numpy is not installed. "
+                "Install with: pip install numpy"
+            )
+        if backend not in ("numpy", "array"):
+            raise ValueError(f"Unknown backend: {backend!r}")
+
+        self.backend = backend
+        self.names: list[str] = list(stats)
+        entries = [stats[name] for name in self.names]
+
+        counts = [len(entry["times"]) for entry in entries]
+        offsets = [0]
+        for count in counts:
+            offsets.append(offsets[-1] + count)
+
+        self.columns: dict[str, Any] = {}
+        if backend == "numpy":
+            self.offsets = np.array(offsets, dtype=np.int64)
+            for field, typecode in SCALAR_COLUMNS.items():
+                dtype = np.int64 if typecode == "q" else np.float64
+                self.columns[field] = np.fromiter(
+                    (entry.get(field, 0) for entry in entries),
+                    dtype=dtype,
+                    count=len(entries),
+                )
+            for field in SAMPLE_COLUMNS:
+                self.columns[field] = np.fromiter(
+                    chain.from_iterable(entry[field] for entry in entries),
+                    dtype=np.float64,
+                    count=offsets[-1],
+                )
+        else:
+            self.offsets = array("q", offsets)
+            for field, typecode in SCALAR_COLUMNS.items():
+                self.columns[field] = array(
+                    typecode, (entry.get(field, 0) for entry in entries)
+                )
+            for field in SAMPLE_COLUMNS:
+                self.columns[field] = array(
+                    "d", chain.from_iterable(entry[field] for entry in entries)
+                )
+
+        self._sorted: dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, field: str) -> Any:
+        return self.columns[field]
+
+    def _empty(self) -> Any:
+        if self.backend == "numpy":
+            return _load_numpy().zeros(len(self.names))
+        return array("d", bytes(8 * len(self.names)))
+
+    def sum(self, field: str = "times") -> Any:
+        """Per-function sum of a sample column"""
+        values = self.columns[field]
+        offsets = self.offsets
+        if self.backend == "numpy":
+            np = _load_numpy()
+            cumulative = np.concatenate(([0.0], np.cumsum(values)))
+            return cumulative[offsets[1:]] - cumulative[offsets[:-1]]
+
+        result = self._empty()
+        for i in range(len(self.names)):
+            result[i] = math.fsum(values[offsets[i] : offsets[i + 1]])
+        return result
+
+    def mean(self, field: str = "times") -> Any:
+        """Per-function mean of a sample column (0.0 for no samples)"""
+        sums = self.sum(field)
+        offsets = self.offsets
+        if self.backend == "numpy":
+            np = _load_numpy()
+            counts = np.diff(offsets)
+            return np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+
+        result = self._empty()
+        for i in range(len(self.names)):
+            count = offsets[i + 1] - offsets[i]
+            result[i] = sums[i] / count if count else 0.0
+        return result
+
+    def std(self, field: str = "times") -> Any:
+        """Per-function sample standard deviation (0.0 below two samples)"""
+        values = self.columns[field]
+        offsets = self.offsets
+        means = self.mean(field)
+        if self.backend == "numpy":
+            np = _load_numpy()
+            counts = np.diff(offsets)
+            deviations = (values - np.repeat(means, counts)) ** 2
+            cumulative = np.concatenate(([0.0], np.cumsum(deviations)))
+            squares = cumulative[offsets[1:]] - cumulative[offsets[:-1]]
+            variance = np.divide(
+                squares,
+                counts - 1,
+                out=np.zeros_like(squares),
+                where=counts > 1,
+            )
+            return np.sqrt(variance)
+
+        result = self._empty()
+        for i in range(len(self.names)):
+            start, end = offsets[i], offsets[i + 1]
+            if end - start < 2:
+                continue
+            mean = means[i]
+            squares = math.fsum((v - mean) ** 2 for v in values[start:end])
+            result[i] = math.sqrt(squares / (end - start - 1))
+        return result
+
+    def _sorted_samples(self, field: str) -> Any:
+        """Sample column sorted within each function's segment, cached"""
+        if field not in self._sorted:
+            values = self.columns[field]
+            offsets = self.offsets
+            if self.backend == "numpy":
+                np = _load_numpy()
+                segment_ids = np.repeat(np.arange(len(self.names)), np.diff(offsets))
+                self._sorted[field] = values[np.lexsort((values, segment_ids))]
+            else:
+                ordered = array("d")
+                for i in range(len(self.names)):
+                    ordered.extend(sorted(values[offsets[i] : offsets[i + 1]]))
+                self._sorted[field] = ordered
+        return self._sorted[field]
+
+    def percentile(self, q: float, field: str = "times") -> Any:
+        """Per-function percentile ``q`` (0-100) with linear interpolation"""
+        if not 0 <= q <= 100:
+            raise ValueError("Percentile must be between 0 and 100")
+        ordered = self._sorted_samples(field)
+        offsets = self.offsets
+        if self.backend == "numpy":
+            np = _load_numpy()
+            starts = offsets[:-1]
+            counts = np.diff(offsets)
+            present = counts > 0
+            position = starts + (np.maximum(counts, 1) - 1) * (q / 100)
+            low = np.floor(position).astype(np.int64)
+            high = np.minimum(low + 1, np.maximum(offsets[1:] - 1, 0))
+            low = np.where(present, low, 0)
+            high = np.where(present, high, 0)
+            if not len(ordered):
+                return np.zeros(len(self.names))
+            fraction = position - np.floor(position)
+            result = ordered[low] + (ordered[high] - ordered[low]) * fraction
+            return np.where(present, result, 0.0)
+
+        result = self._empty()
+        for i in range(len(self.names)):
+            start, end = offsets[i], offsets[i + 1]
+            if end == start:
+                continue
+            position = start + (end - start - 1) * (q / 100)
+            low = int(position)
+            high = min(low + 1, end - 1)
+            fraction = position - low
+            result[i] = ordered[low] + (ordered[high] - ordered[low]) * fraction
+        return result
+
+    def rank(
+        self,
+        values: Any = "total_time",
+        descending: bool = True,
+        limit: Optional[int] = None,
+    ) -> list[str]:
+        """Function names ordered by a column name or a per-function array"""
+        if isinstance(values, str):
+            values = self.columns[values]
+        if self.backend == "numpy":
+            np = _load_numpy()
+            order = np.argsort(-values if descending else values, kind="stable")
+            indices: Sequence[int] = order[:limit].tolist()
+        else:
+            indices = sorted(
+                range(len(self.names)), key=values.__getitem__, reverse=descending
+            )[:limit]
+        return [self.names[i] for i in indices]
+
+    def summary(self, percentiles: Sequence[float] = (50, 95, 99)) -> dict[str, Any]:
+        """Derived per-function metrics as a dict of columns"""
+        calls = self.columns["call_count"]
+        failures = self.columns["failure_count"]
+        if self.backend == "numpy":
+            np = _load_numpy()
+            error_rate = np.divide(
+                failures,
+                calls,
+                out=np.zeros(len(self.names)),
+                where=calls > 0,
+            )
+        else:
+            error_rate = array(
+                "d",
+                (f / c if c else 0.0 for f, c in zip(failures, calls)),
+            )
+
+        result: dict[str, Any] = {
+            "name": self.names,
+            "mean_time": self.mean("times"),
+            "std_time": self.std("times"),
+            "mean_memory_peak": self.mean("memory_peaks"),
+            "error_rate": error_rate,
+        }
+        for q in percentiles:
+            result[f"p{q:g}_time"] = self.percentile(q, "times")
+        return result
+
+    def to_arrow(self) -> Any:
+        """Return the columns as a ``pyarrow.Table``
+
+        Scalar fields become plain columns and per-call samples become list
+        columns that share this view's offsets, so no data is re-grouped.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError(
+                "Columnar export requires pyarrow. Install with: pip install pyarrow"
+            ) from None
+
+        offsets = pa.array(self.offsets, type=pa.int32())
+        data: dict[str, Any] = {"name": pa.array(self.names, type=pa.string())}
+        for field in SCALAR_COLUMNS:
+            data[field] = pa.array(self.columns[field])
+        for field in SAMPLE_COLUMNS:
+            values = pa.array(self.columns[field], type=pa.float64())
+            data[field] = pa.ListArray.from_arrays(offsets, values)
+        return pa.table(data)
+
+
+def estimate_complexity(buckets: dict[Any, dict[str, Any]]) -> Optional[float]:
+    """Estimate the exponent k in time ~ size**k from size-bucketed stats
+
+    Fits a least-squares line through (log mean size, log mean time) over the
+    buckets with a positive size and time; the slope is the empirical
+    exponent (about 1 for linear, 2 for quadratic). Returns None when fewer
+    than two distinct sizes have been seen.
+    """
+    points = []
+    for entry in buckets.values():
+        calls = entry["call_count"]
+        if not calls or entry["total_size"] <= 0 or entry["total_time"] <= 0:
+            continue
+        points.append(
+            (
+                math.log(entry["total_size"] / calls),
+                math.log(entry["total_time"] / calls),
+            )
+        )
+    if len(points) < 2:
+        return None
+
+    mean_x = math.fsum(x for x, _ in points) / len(points)
+    mean_y = math.fsum(y for _, y in points) / len(points)
+    variance = math.fsum((x - mean_x) ** 2 for x, _ in points)
+    if variance == 0:
+        return None
+    covariance = math.fsum((x - mean_x) * (y - mean_y) for x, y in points)
+    return covariance / variance
+
+
+def columnar_stats(
+    stats: Optional[dict[str, dict[str, Any]]] = None, backend: Optional[str] = None
+) -> StatsColumns:
+    """Build a columnar view of ``stats`` (default: the live global stats)
+
+    ``backend`` is ``"numpy"`` or ``"array"``; by default NumPy is used when
+    it is installed.
+    """
+    return StatsColumns(performance_stats if stats is None else stats, backend)
+
+
+def export_columnar(
+    path: str, stats: Optional[dict[str, dict[str, Any]]] = None
+) -> None:
+    """Write stats to a columnar file, chosen by the path's extension
+
+    ``.parquet`` writes Parquet; ``.arrow`` and ``.feather`` write Arrow IPC.
+    Requires pyarrow.
+    """
+    if not path.endswith((".parquet", ".arrow", ".feather")):
+        raise ValueError(
+            "Unsupported export format; use a .parquet, .arrow or .feather path"
+        )
+    table = columnar_stats(stats).to_arrow()
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path)
+    else:
+        import pyarrow.feather as feather
+
+        feather.write_feather(table, path)
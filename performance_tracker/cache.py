@@ -0,0 +1,119 @@
+"""An LRU/TTL cache decorator that reports into performance_stats
+
+``cached_monitor`` wraps a function with ``performance_monitor`` and puts a
+cache in front of it. Misses run (and are timed as) normal monitored calls;
+hits skip the function and are counted in the same stats entry together with
+the time they saved, estimated from the average duration of a miss.
+"""
+
+from collections import OrderedDict
+from functools import wraps
+from threading import RLock
+from time import monotonic
+from typing import Any, Callable, NamedTuple, Optional
+
+from .monitor import (
+    F,
+    FunctionStats,
+    _call_key,
+    _init_function_stats,
+    performance_monitor,
+    performance_stats,
+)
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: Optional[int]
+    currsize: int
+    time_saved: float
+
+
+def cached_monitor(
+    maxsize: Optional[int] = 128,
+    ttl: Optional[float] = None,
+    **monitor_options: Any,
+) -> Callable[[F], F]:
+    """Monitor a function and cache its results in an LRU/TTL cache
+
+    Args:
+        maxsize: Maximum number of cached results; None for unbounded
+        ttl: Seconds a cached result stays valid; None to never expire
+        **monitor_options: Passed to ``performance_monitor``; ``verbose``
+            and ``track_memory`` default to False here
+
+    Arguments must be hashable, as with ``functools.lru_cache``. The wrapper
+    exposes ``cache_info()`` and ``cache_clear()``.
+    """
+    if maxsize is not None and maxsize < 1:
+        raise ValueError("maxsize must be at least 1 or None")
+    monitor_options.setdefault("verbose", False)
+    monitor_options.setdefault("track_memory", False)
+
+    def decorator(func: F) -> F:
+        monitored = performance_monitor(**monitor_options)(func)
+        func_name = monitor_options.get("name") or func.__name__
+        cache: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        lock = RLock()
+
+        def stats() -> FunctionStats:
+            _init_function_stats(func_name, func.__module__)
+            return performance_stats[func_name]
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = _call_key(args, kwargs)
+            with lock:
+                cached = cache.get(key)
+                if cached is not None:
+                    stored_at, value = cached
+                    if ttl is None or monotonic() - stored_at < ttl:
+                        cache.move_to_end(key)
+                        entry = stats()
+                        entry.cache_hits += 1
+                        if entry.success_count:
+                            entry.cache_time_saved += (
+                                entry.total_ns / entry.success_count / 1e9
+                            )
+                        return value
+                    # Expired: drop it and fall through to a miss
+                    del cache[key]
+                    stats().cache_evictions += 1
+
+            value = monitored(*args, **kwargs)
+
+            with lock:
+                entry = stats()
+                entry.cache_misses += 1
+                cache[key] = (monotonic(), value)
+                cache.move_to_end(key)
+                if maxsize is not None:
+                    while len(cache) > maxsize:
+                        cache.popitem(last=False)
+                        entry.cache_evictions += 1
+            return value
+
+        def cache_info() -> CacheInfo:
+            with lock:
+                entry = performance_stats.get(func_name, {})
+                return CacheInfo(
+                    entry.get("cache_hits", 0),
+                    entry.get("cache_misses", 0),
+                    entry.get("cache_evictions", 0),
+                    maxsize,
+                    len(cache),
+                    entry.get("cache_time_saved", 0.0),
+                )
+
+        def cache_clear() -> None:
+            with lock:
+                cache.clear()
+
+        wrapper.cache_info = cache_info  # type: ignore
+        wrapper.cache_clear = cache_clear  # type: ignore
+        wrapper.__performance_monitored__ = True  # type: ignore
+        return wrapper  # type: ignore
+
+    return decorator
@@ -0,0 +1,304 @@
+"""Attach and detach monitoring in a running process
+
+Functions are named by target strings, ``"package.module:function"`` or
+``"package.module:Class.method"`` (the ``:`` may be omitted for module-level
+functions, ``"package.module.function"``). ``attach`` swaps the attribute for
+a ``performance_monitor`` wrapper and ``detach`` puts the original back; both
+are a single attribute assignment, so running threads are never paused.
+Code that imported the function by value before it was attached (``from
+module import function``) keeps calling the original.
+
+The same operations are available to other processes through a line-based
+JSON protocol on a UNIX domain socket (``start_control_server``), or by
+editing a JSON config file and sending the process a signal
+(``install_reload_signal``).
+"""
+
+import json
+import math
+import os
+import signal
+import socket
+import socketserver
+import stat
+import threading
+from collections.abc import Mapping
+from importlib import import_module
+from typing import Any, Optional
+
+from .instrument import (
+    DEFAULT_MONITOR_OPTIONS,
+    _instrument_attribute,
+    _restore_attribute,
+)
+from .monitor import performance_stats
+
+# target -> monitor options of everything attached through this module
+_attached: dict[str, dict[str, Any]] = {}
+_lock = threading.RLock()
+
+# Profiler started through the control API, if any
+_profiler: Any = None
+
+
+def _resolve(target: str) -> tuple[Any, str]:
+    """Return (owner, attribute name) for a target string"""
+    if ":" in target:
+        module_name, _, qualname = target.partition(":")
+        owner: Any = import_module(module_name)
+    else:
+        # Longest importable prefix is the module, the rest the qualname
+        parts = target.split(".")
+        for split in range(len(parts) - 1, 0, -1):
+            try:
+                owner = import_module(".".join(parts[:split]))
+            except ImportError:
+                continue
+            qualname = ".".join(parts[split:])
+            break
+        else:
+            raise ValueError(f"Cannot import a module from target {target!r}")
+
+    *path, attr = qualname.split(".")
+    for name in path:
+        owner = getattr(owner, name)
+    if attr not in vars(owner):
+        raise ValueError(f"{target!r} is not defined on {owner!r}")
+    return owner, attr
+
+
+def attach(target: str, **monitor_options: Any) -> None:
+    """Wrap ``target`` with ``performance_monitor``
+
+    Options default to ``verbose=False, track_memory=False``. Attaching an
+    already attached target re-wraps it with the new options. Stats are
+    recorded under the function's qualified name.
+    """
+    options = {**DEFAULT_MONITOR_OPTIONS, **monitor_options}
+    with _lock:
+        owner, attr = _resolve(target)
+        if target in _attached:
+            _restore_attribute(owner, attr)
+        if not _instrument_attribute(owner, attr, vars(owner)[attr], options):
+            raise ValueError(f"{target!r} is not a function or is already monitored")
+        _attached[target] = options
+
+
+def detach(target: str) -> bool:
+    """Restore the original of an attached target; False if not attached"""
+    with _lock:
+        if _attached.pop(target, None) is None:
+            return False
+        owner, attr = _resolve(target)
+        return _restore_attribute(owner, attr)
+
+
+def attached() -> dict[str, dict[str, Any]]:
+    """Targets attached at runtime and their monitor options"""
+    with _lock:
+        return {target: dict(options) for target, options in _attached.items()}
+
+
+def _jsonable(value: Any) -> Any:
+    # Bucket labels may be any hashable; JSON object keys must be strings
+    if isinstance(value, Mapping):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    # min_time of a function that was never called is inf, which strict JSON
+    # parsers reject
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def dump_stats(path: str) -> int:
+    """Write ``performance_stats`` to ``path`` as JSON; returns the number of
+    functions written"""
+    stats = {name: _jsonable(entry) for name, entry in list(performance_stats.items())}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(stats, handle, default=list)
+    os.replace(tmp_path, path)
+    return len(stats)
+
+
+def set_profiling(interval: Optional[float]) -> None:
+    """Start the sampling profiler at ``interval`` seconds, change its
+    interval, or stop it with ``None``/``0``"""
+    global _profiler
+    from .profiler import SamplingProfiler
+
+    with _lock:
+        if _profiler is not None:
+            _profiler.stop()
+            if not interval:
+                return
+            _profiler.interval = interval
+            _profiler.start()
+        elif interval:
+            _profiler = SamplingProfiler(interval).start()
+
+
+def handle_command(request: dict[str, Any]) -> dict[str, Any]:
+    """Run one control command and return a JSON-serializable response
+
+    Commands: ``{"cmd": "attach", "target": ..., "options": {...}}``,
+    ``{"cmd": "detach", "target": ...}``, ``{"cmd": "list"}``,
+    ``{"cmd": "dump", "path": ...}``, ``{"cmd": "profile", "interval": ...}``
+    (0 stops), ``{"cmd": "folded"}`` for the profiler's folded stacks and
+    ``{"cmd": "trace", "path": ..., "seconds": ...}`` to stream a timeline
+    of the next ``seconds`` (default 10) to a trace-event file.
+    """
+    command = request.get("cmd")
+    try:
+        if command == "attach":
+            attach(request["target"], **request.get("options", {}))
+            return {"ok": True}
+        if command == "detach":
+            return {"ok": detach(request["target"])}
+        if command == "list":
+            return {"ok": True, "attached": attached()}
+        if command == "dump":
+            return {"ok": True, "functions": dump_stats(request["path"])}
+        if command == "profile":
+            set_profiling(request.get("interval"))
+            return {"ok": True}
+        if command == "folded":
+            folded = _profiler.folded() if _profiler is not None else ""
+            return {"ok": True, "folded": folded}
+        if command == "trace":
+            from .timeline import capture_trace
+
+            capture_trace(request["path"], request.get("seconds", 10.0))
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown command {command!r}"}
+    except Exception as exc:
+        return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def apply_config(config: dict[str, Any]) -> None:
+    """Make the attached functions match a config mapping
+
+    ``{"functions": {target: options, ...}, "profile_interval": seconds,
+    "dump": path, "trace": {"path": path, "seconds": seconds}}``. Targets
+    attached earlier but missing from ``functions`` are detached; all keys
+    are optional. ``trace`` starts a timeline capture on every reload.
+    """
+    wanted = config.get("functions", {})
+    with _lock:
+        for target in set(_attached) - set(wanted):
+            detach(target)
+        for target, options in wanted.items():
+            options = {**DEFAULT_MONITOR_OPTIONS, **(options or {})}
+            if _attached.get(target) != options:
+                attach(target, **options)
+    if "profile_interval" in config:
+        set_profiling(config["profile_interval"])
+    if config.get("dump"):
+        dump_stats(config["dump"])
+    if config.get("trace"):
+        from .timeline import capture_trace
+
+        capture_trace(config["trace"]["path"], config["trace"].get("seconds", 10.0))
+
+
+def load_config(path: str) -> None:
+    """Read a JSON config file and apply it with ``apply_config``"""
+    with open(path, encoding="utf-8") as handle:
+        apply_config(json.load(handle))
+
+
+def install_reload_signal(path: str, signum: Optional[int] = None) -> None:
+    """Reload the config file at ``path`` whenever ``signum`` (default
+    ``SIGHUP``) arrives
+
+    The signal handler only starts a thread; importing targets and dumping
+    stats happen there, off the main thread. Must be called from the main
+    thread.
+    """
+
+    def handler(received: int, frame: Any) -> None:
+        threading.Thread(
+            target=load_config, args=(path,), name="performance-tracker-reload"
+        ).start()
+
+    signal.signal(signal.SIGHUP if signum is None else signum, handler)
+
+
+class _CommandHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as exc:
+                response = {"ok": False, "error": f"invalid JSON: {exc}"}
+            else:
+                response = handle_command(request)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+# Not available on Windows; ControlServer refuses to start there
+_UnixStreamServer: Any = getattr(
+    socketserver, "UnixStreamServer", socketserver.BaseServer
+)
+
+
+class ControlServer(socketserver.ThreadingMixIn, _UnixStreamServer):
+    """UNIX socket server accepting one JSON command per line"""
+
+    daemon_threads = True
+
+    def __init__(self, path: str) -> None:
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("UNIX domain sockets are not available on this platform")
+        try:
+            mode = os.lstat(path).st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            # A stale socket from an earlier run is replaced; anything else
+            # at the path is not ours to delete
+            if not stat.S_ISSOCK(mode):
+                raise FileExistsError(f"{path!r} exists and is not a socket")
+            os.unlink(path)
+        # Only the owning user may control the process. The socket is created
+        # with these permissions rather than chmod-ed afterwards, so there is
+        # no window in which others can connect.
+        umask = os.umask(0o077)
+        try:
+            super().__init__(path, _CommandHandler)
+        finally:
+            os.umask(umask)
+        self.path = path
+        self._thread = threading.Thread(
+            target=self.serve_forever,
+            name="performance-tracker-control",
+            daemon=True,
+        )
+
+    def start(self) -> "ControlServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def start_control_server(path: str) -> ControlServer:
+    """Serve control commands on a UNIX socket at ``path`` in the background"""
+    return ControlServer(path).start()
+
+
+def send_command(path: str, request: dict[str, Any]) -> dict[str, Any]:
+    """Send one command to a control server and return its response"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        client.sendall(json.dumps(request).encode() + b"\n")
+        with client.makefile("rb") as reader:
+            return json.loads(reader.readline())  # type: ignore[no-any-return]
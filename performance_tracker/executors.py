@@ -0,0 +1,265 @@
+"""Instrumented ``concurrent.futures`` executors
+
+``MonitoredThreadPoolExecutor`` and ``MonitoredProcessPoolExecutor`` record,
+for every submitted task, how long it waited in the executor queue and how
+long it ran, under the task function's entry in ``performance_stats``
+(``task_count``, ``queue_wait_time``, ``max_queue_wait``, ``task_run_time``).
+Each executor also tracks its own worker utilization.
+
+Process-pool workers record monitored calls into their own
+``performance_stats``. Each task result carries everything the worker
+recorded since its previous result, aggregated per function, and the parent
+merges it with ``merge_performance_stats`` when the future completes.
+"""
+
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, islice
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from .histogram import LatencyHistogram
+from .monitor import _init_function_stats, merge_performance_stats, performance_stats
+
+
+def _task_name(fn: Callable[..., Any]) -> str:
+    return getattr(fn, "__performance_name__", None) or getattr(
+        fn, "__name__", repr(fn)
+    )
+
+
+class _ExecutorStats:
+    """Queue-wait and busy-time accounting shared by both executors"""
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self.started = perf_counter()
+        self.busy_time = 0.0
+        self.busy_by_function: dict[str, float] = {}
+        self.queue_waits: dict[str, LatencyHistogram] = {}
+        self.lock = Lock()
+
+    def record(self, func_name: str, module: str, wait: float, run: float) -> None:
+        with self.lock:
+            self.busy_time += run
+            self.busy_by_function[func_name] = (
+                self.busy_by_function.get(func_name, 0.0) + run
+            )
+            histogram = self.queue_waits.get(func_name)
+            if histogram is None:
+                histogram = self.queue_waits[func_name] = LatencyHistogram()
+            histogram.record(wait)
+
+            _init_function_stats(func_name, module)
+            stats = performance_stats[func_name]
+            with stats._lock:
+                stats.task_count += 1
+                stats.queue_wait_time += wait
+                stats.max_queue_wait = max(stats.max_queue_wait, wait)
+                stats.task_run_time += run
+
+    def utilization(self) -> dict[str, Any]:
+        with self.lock:
+            elapsed = perf_counter() - self.started
+            capacity = self.workers * elapsed
+            return {
+                "workers": self.workers,
+                "elapsed": elapsed,
+                "busy_time": self.busy_time,
+                "utilization": self.busy_time / capacity if capacity else 0.0,
+                "by_function": {
+                    name: busy / capacity if capacity else 0.0
+                    for name, busy in self.busy_by_function.items()
+                },
+                "queue_wait": {
+                    name: histogram.to_dict()
+                    for name, histogram in self.queue_waits.items()
+                },
+            }
+
+
+class MonitoredThreadPoolExecutor(ThreadPoolExecutor):
+    """A ``ThreadPoolExecutor`` recording queue wait and run time per task
+
+    Accepts the same arguments as ``ThreadPoolExecutor``.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._monitor = _ExecutorStats(self._max_workers)
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        return super().submit(self._run, fn, perf_counter(), args, kwargs)
+
+    def _run(
+        self,
+        fn: Callable[..., Any],
+        submitted: float,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> Any:
+        start = perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._monitor.record(
+                _task_name(fn),
+                getattr(fn, "__module__", "") or "",
+                start - submitted,
+                perf_counter() - start,
+            )
+
+    def utilization(self) -> dict[str, Any]:
+        """Busy fraction of worker capacity, overall and per task function,
+        plus queue-wait histograms per task function"""
+        return self._monitor.utilization()
+
+
+def _init_worker(
+    initializer: Optional[Callable[..., Any]], initargs: tuple[Any, ...]
+) -> None:
+    # Forked workers inherit the parent's stats; start from a clean slate so
+    # only work done in this process is shipped back
+    performance_stats.clear()
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _take_worker_stats() -> Optional[dict[str, dict[str, Any]]]:
+    """Hand over everything recorded in this worker since the last call"""
+    if not performance_stats:
+        return None
+    batch = dict(performance_stats)
+    performance_stats.clear()
+    return batch
+
+
+def _run_in_worker(
+    fn: Callable[..., Any],
+    submitted: float,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> tuple[bool, Any, float, float, Optional[dict[str, dict[str, Any]]]]:
+    # Wall-clock time is the only clock comparable across processes
+    start = time.time()
+    start_counter = perf_counter()
+    try:
+        ok, value = True, fn(*args, **kwargs)
+    except BaseException as exc:
+        ok, value = False, exc
+    run = perf_counter() - start_counter
+    return ok, value, max(start - submitted, 0.0), run, _take_worker_stats()
+
+
+class _Chunk:
+    """Run a function over a chunk of argument tuples in one worker task"""
+
+    def __init__(self, fn: Callable[..., Any]) -> None:
+        self.fn = fn
+        # Record the chunk under the mapped function, not under _Chunk
+        self.__performance_name__ = _task_name(fn)
+        self.__module__ = getattr(fn, "__module__", "") or ""
+
+    def __call__(self, chunk: list[tuple[Any, ...]]) -> list[Any]:
+        return [self.fn(*args) for args in chunk]
+
+
+def _chunked(
+    items: Iterator[tuple[Any, ...]], size: int
+) -> Iterator[list[tuple[Any, ...]]]:
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class MonitoredProcessPoolExecutor(ProcessPoolExecutor):
+    """A ``ProcessPoolExecutor`` recording queue wait and run time per task
+
+    Accepts the same arguments as ``ProcessPoolExecutor``. Statistics of
+    monitored functions called inside the workers are merged into this
+    process's ``performance_stats`` as tasks complete. Queue wait is
+    measured with the wall clock, so it includes the time taken to start a
+    worker process for the first tasks.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        mp_context: Any = None,
+        initializer: Optional[Callable[..., Any]] = None,
+        initargs: tuple[Any, ...] = (),
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(
+            max_workers,
+            mp_context,
+            initializer=_init_worker,
+            initargs=(initializer, initargs),
+            **kwargs,
+        )
+        self._monitor = _ExecutorStats(self._max_workers)
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        func_name = _task_name(fn)
+        module = getattr(fn, "__module__", "") or ""
+        inner = super().submit(_run_in_worker, fn, time.time(), args, kwargs)
+        outer = _TaskFuture(inner)
+
+        def complete(done: Future) -> None:
+            if done.cancelled():
+                outer.cancel()
+                return
+            try:
+                ok, value, wait, run, batch = done.result()
+            except BaseException as exc:  # pickling errors, broken pool
+                outer.set_exception(exc)
+                return
+            if batch:
+                merge_performance_stats(batch)
+            self._monitor.record(func_name, module, wait, run)
+            if ok:
+                outer.set_result(value)
+            else:
+                outer.set_exception(value)
+
+        inner.add_done_callback(complete)
+        return outer
+
+    def map(
+        self,
+        fn: Callable[..., Any],
+        *iterables: Iterable[Any],
+        timeout: Optional[float] = None,
+        chunksize: int = 1,
+    ) -> Iterator[Any]:
+        """Like ``ProcessPoolExecutor.map``; with ``chunksize > 1`` each
+        chunk counts as one task of ``fn``"""
+        if chunksize < 1:
+            raise ValueError("chunksize must be >= 1.")
+        if chunksize == 1:
+            return Executor.map(self, fn, *iterables, timeout=timeout)
+        results = Executor.map(
+            self, _Chunk(fn), _chunked(zip(*iterables), chunksize), timeout=timeout
+        )
+        return chain.from_iterable(results)
+
+    def utilization(self) -> dict[str, Any]:
+        """Busy fraction of worker capacity, overall and per task function,
+        plus queue-wait histograms per task function"""
+        return self._monitor.utilization()
+
+
+class _TaskFuture(Future):
+    """The future handed to callers; cancelling it cancels the pool's task"""
+
+    def __init__(self, inner: Future) -> None:
+        super().__init__()
+        self._inner = inner
+
+    def cancel(self) -> bool:
+        if not self._inner.cancel() and not self._inner.cancelled():
+            return False
+        return super().cancel()
@@ -0,0 +1,50 @@
+"""Attribute garbage collection pauses to the monitored calls they interrupt"""
+
+import gc
+from threading import local
+from time import perf_counter
+from typing import Any
+
+from .monitor import _active_calls, performance_stats
+
+_gc_local = local()
+
+
+def _gc_callback(phase: str, info: dict[str, Any]) -> None:
+    """Time a collection and charge it to every active monitored call"""
+    if phase == "start":
+        _gc_local.start = perf_counter()
+        return
+
+    start = getattr(_gc_local, "start", None)
+    if start is None:
+        return
+    _gc_local.start = None
+    pause = perf_counter() - start
+    generation = info.get("generation", 0)
+
+    # A recursive or re-entrant function only pays for the pause once
+    for func_name in set(_active_calls()):
+        stats = performance_stats.get(func_name)
+        if stats is None:
+            continue
+        stats.gc_pause_time += pause
+        stats.max_gc_pause = max(stats.max_gc_pause, pause)
+        stats.gc_collections[generation] += 1
+
+
+def enable_gc_tracking() -> None:
+    """Start attributing GC pauses and collection counts to monitored calls"""
+    if _gc_callback not in gc.callbacks:
+        gc.callbacks.append(_gc_callback)
+
+
+def disable_gc_tracking() -> None:
+    """Stop attributing GC pauses to monitored calls"""
+    if _gc_callback in gc.callbacks:
+        gc.callbacks.remove(_gc_callback)
+
+
+def is_gc_tracking_enabled() -> bool:
+    """Return True if the GC callback is currently installed"""
+    return _gc_callback in gc.callbacks
@@ -0,0 +1,133 @@
+"""Fixed-bucket latency histograms
+
+A histogram keeps one counter per bucket instead of every sample, so its
+memory is constant no matter how many values are recorded. Percentiles are
+estimated by interpolating inside the bucket that contains them.
+"""
+
+from bisect import bisect_left
+from typing import Any, Optional, Sequence
+
+
+def log_buckets(start: float, factor: float, count: int) -> tuple[float, ...]:
+    """Return ``count`` upper bounds growing geometrically from ``start``"""
+    if start <= 0 or factor <= 1 or count < 1:
+        raise ValueError("log_buckets needs start > 0, factor > 1 and count >= 1")
+    return tuple(start * factor**i for i in range(count))
+
+
+# 100 μs to ~105 s in factor-2 steps: fine enough for percentiles of anything
+# from a cache hit to a slow request
+DEFAULT_LATENCY_BUCKETS = log_buckets(0.0001, 2, 21)
+
+
+class LatencyHistogram:
+    """Counts of values per bucket, plus exact count, sum, min and max
+
+    ``bounds`` are inclusive upper bounds; values above the last bound go to
+    an overflow bucket.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "total", "min", "max")
+
+    def __init__(self, bounds: Optional[Sequence[float]] = None) -> None:
+        self.bounds = tuple(DEFAULT_LATENCY_BUCKETS if bounds is None else bounds)
+        if list(self.bounds) != sorted(set(self.bounds)):
+            raise ValueError("Histogram bounds must be strictly increasing")
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    @classmethod
+    def from_counts(
+        cls,
+        counts: Sequence[int],
+        total: float,
+        minimum: float,
+        maximum: float,
+        bounds: Optional[Sequence[float]] = None,
+    ) -> "LatencyHistogram":
+        """Rebuild a histogram from bucket counts kept elsewhere
+
+        ``minimum`` and ``maximum`` only need to bound the recorded values;
+        they clamp percentile estimates.
+        """
+        histogram = cls(bounds)
+        if len(counts) != len(histogram.counts):
+            raise ValueError("counts must have one entry per bucket plus overflow")
+        histogram.counts = list(counts)
+        histogram.count = sum(counts)
+        histogram.total = total
+        if histogram.count:
+            histogram.min = minimum
+            histogram.max = maximum
+        return histogram
+
+    def record(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram with the same bounds into this one"""
+        if other.bounds != self.bounds:
+            raise ValueError("Cannot merge histograms with different bounds")
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Estimate percentile ``q`` (0-100); exact at 0 and 100"""
+        if not 0 <= q <= 100:
+            raise ValueError("Percentile must be between 0 and 100")
+        if not self.count:
+            return 0.0
+        if q == 0:
+            return self.min
+        if q == 100:
+            return self.max
+
+        rank = q / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                # Clamp to the observed range so sparse data stays sensible
+                lower = max(lower, self.min)
+                upper = min(upper, self.max)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.mean,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": {
+                **{f"{bound:g}": c for bound, c in zip(self.bounds, self.counts)},
+                "+Inf": self.counts[-1],
+            },
+        }
+
+    def __repr__(self) -> str:
+        return f"<LatencyHistogram count={self.count} mean={self.mean:.6f}>"
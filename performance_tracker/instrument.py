@@ -0,0 +1,270 @@
+"""Instrument whole classes, modules and packages without per-function decorators
+
+Every wrapper installed here is a plain ``performance_monitor`` wrapper, so
+auto-instrumented functions record into the same ``performance_stats`` store
+as hand-decorated ones. Originals are remembered per class or module so that
+``uninstrument_*`` restores them exactly.
+"""
+
+import sys
+from fnmatch import fnmatchcase
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import ModuleSpec
+from types import FunctionType, ModuleType
+from typing import Any, Iterable, Optional, Sequence, Union
+from weakref import WeakKeyDictionary
+
+from .monitor import performance_monitor
+
+Patterns = Union[str, Iterable[str], None]
+
+# Decorator defaults for auto-instrumentation: hundreds of wrapped functions
+# printing every call would drown the application's own output
+DEFAULT_MONITOR_OPTIONS: dict[str, Any] = {"verbose": False, "track_memory": False}
+
+# Original attribute values, per instrumented class or module
+_originals: "WeakKeyDictionary[Any, dict[str, Any]]" = WeakKeyDictionary()
+
+
+def _as_patterns(patterns: Patterns) -> Sequence[str]:
+    if patterns is None:
+        return ()
+    if isinstance(patterns, str):
+        return (patterns,)
+    return tuple(patterns)
+
+
+def _selected(name: str, include: Sequence[str], exclude: Sequence[str]) -> bool:
+    """Dunder names are skipped unless an include pattern names them"""
+    if include:
+        if not any(fnmatchcase(name, pattern) for pattern in include):
+            return False
+    elif name.startswith("__") and name.endswith("__"):
+        return False
+    return not any(fnmatchcase(name, pattern) for pattern in exclude)
+
+
+def _is_monitored(func: Any) -> bool:
+    return getattr(func, "__performance_monitored__", False)
+
+
+def _wrap(func: FunctionType, options: dict[str, Any]) -> Any:
+    return performance_monitor(name=func.__qualname__, **options)(func)
+
+
+def _instrument_attribute(
+    owner: Any, attr: str, value: Any, options: dict[str, Any]
+) -> bool:
+    """Replace one function-like attribute with a monitored wrapper"""
+    if isinstance(value, (staticmethod, classmethod)):
+        func = value.__func__
+        if not isinstance(func, FunctionType) or _is_monitored(func):
+            return False
+        wrapped: Any = type(value)(_wrap(func, options))
+    elif isinstance(value, FunctionType):
+        if _is_monitored(value):
+            return False
+        wrapped = _wrap(value, options)
+    else:
+        return False
+
+    _originals.setdefault(owner, {}).setdefault(attr, value)
+    setattr(owner, attr, wrapped)
+    return True
+
+
+def _restore_attribute(owner: Any, attr: str) -> bool:
+    """Restore one attribute replaced by ``_instrument_attribute``"""
+    originals = _originals.get(owner)
+    if not originals or attr not in originals:
+        return False
+    setattr(owner, attr, originals.pop(attr))
+    if not originals:
+        del _originals[owner]
+    return True
+
+
+def _restore(owner: Any) -> None:
+    for attr, value in _originals.pop(owner, {}).items():
+        setattr(owner, attr, value)
+
+
+def instrument_class(
+    cls: type,
+    include: Patterns = None,
+    exclude: Patterns = None,
+    **monitor_options: Any,
+) -> list[str]:
+    """Wrap the methods defined on ``cls`` with ``performance_monitor``
+
+    Plain, static and class methods are wrapped; properties and inherited
+    methods are left alone. ``include``/``exclude`` are glob patterns (or
+    lists of them) matched against method names. Stats are recorded under
+    the method's qualified name, e.g. ``"UserService.fetch"``.
+
+    Returns the names of the attributes that were wrapped.
+    """
+    options = {**DEFAULT_MONITOR_OPTIONS, **monitor_options}
+    include_patterns = _as_patterns(include)
+    exclude_patterns = _as_patterns(exclude)
+
+    wrapped = []
+    for attr, value in list(vars(cls).items()):
+        if _selected(attr, include_patterns, exclude_patterns):
+            if _instrument_attribute(cls, attr, value, options):
+                wrapped.append(attr)
+    return wrapped
+
+
+def uninstrument_class(cls: type) -> None:
+    """Restore the methods replaced by ``instrument_class``"""
+    _restore(cls)
+
+
+def instrument_module(
+    module: ModuleType,
+    include: Patterns = None,
+    exclude: Patterns = None,
+    classes: bool = False,
+    **monitor_options: Any,
+) -> list[str]:
+    """Wrap every function defined in ``module`` with ``performance_monitor``
+
+    Functions imported into the module from elsewhere are skipped. With
+    ``classes=True`` the methods of classes defined in the module are
+    instrumented as well, using the same patterns.
+
+    Returns the qualified names of everything that was wrapped.
+    """
+    options = {**DEFAULT_MONITOR_OPTIONS, **monitor_options}
+    include_patterns = _as_patterns(include)
+    exclude_patterns = _as_patterns(exclude)
+
+    wrapped = []
+    for attr, value in list(vars(module).items()):
+        if getattr(value, "__module__", None) != module.__name__:
+            continue
+        if isinstance(value, type):
+            if classes:
+                wrapped.extend(
+                    f"{value.__qualname__}.{method}"
+                    for method in instrument_class(
+                        value, include_patterns, exclude_patterns, **options
+                    )
+                )
+        elif _selected(attr, include_patterns, exclude_patterns):
+            if _instrument_attribute(module, attr, value, options):
+                wrapped.append(attr)
+    return wrapped
+
+
+def uninstrument_module(module: ModuleType) -> None:
+    """Restore the functions and class methods replaced by ``instrument_module``"""
+    _restore(module)
+    for value in list(vars(module).values()):
+        if isinstance(value, type) and value in _originals:
+            _restore(value)
+
+
+class _InstrumentingLoader(Loader):
+    """Delegate loading, then instrument the freshly executed module"""
+
+    def __init__(self, loader: Loader, hook: "ImportHook") -> None:
+        self._loader = loader
+        self._hook = hook
+
+    def __getattr__(self, name: str) -> Any:
+        # get_resource_reader, is_package, get_source, ...
+        return getattr(self._loader, name)
+
+    def create_module(self, spec: ModuleSpec) -> Optional[ModuleType]:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        self._loader.exec_module(module)
+        self._hook.instrument(module)
+
+
+class ImportHook(MetaPathFinder):
+    """Meta path finder that instruments modules under a package prefix
+
+    Imports outside the prefix return after one string comparison, so
+    unrelated modules pay essentially nothing.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        include: Patterns = None,
+        exclude: Patterns = None,
+        classes: bool = False,
+        **monitor_options: Any,
+    ) -> None:
+        self.prefix = prefix
+        self.include = _as_patterns(include)
+        self.exclude = _as_patterns(exclude)
+        self.classes = classes
+        self.monitor_options = monitor_options
+        self.modules: list[str] = []
+
+    def matches(self, fullname: str) -> bool:
+        return fullname == self.prefix or fullname.startswith(self.prefix + ".")
+
+    def find_spec(
+        self, fullname: str, path: Any = None, target: Any = None
+    ) -> Optional[ModuleSpec]:
+        if not self.matches(fullname):
+            return None
+
+        # Let the rest of the meta path find the module, then wrap its loader
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _InstrumentingLoader(spec.loader, self)
+            return spec
+        return None
+
+    def instrument(self, module: ModuleType) -> None:
+        instrument_module(
+            module,
+            self.include,
+            self.exclude,
+            classes=self.classes,
+            **self.monitor_options,
+        )
+        self.modules.append(module.__name__)
+
+
+def install_import_hook(
+    prefix: str,
+    include: Patterns = None,
+    exclude: Patterns = None,
+    classes: bool = False,
+    **monitor_options: Any,
+) -> ImportHook:
+    """Instrument every module under ``prefix`` as it is imported
+
+    Modules under the prefix that are already imported are instrumented
+    immediately. Returns the hook, to pass to ``uninstall_import_hook``.
+    """
+    hook = ImportHook(prefix, include, exclude, classes, **monitor_options)
+    sys.meta_path.insert(0, hook)
+    for name, module in list(sys.modules.items()):
+        if module is not None and hook.matches(name):
+            hook.instrument(module)
+    return hook
+
+
+def uninstall_import_hook(hook: ImportHook) -> None:
+    """Remove the hook and restore every module it instrumented"""
+    if hook in sys.meta_path:
+        sys.meta_path.remove(hook)
+    for name in hook.modules:
+        module = sys.modules.get(name)
+        if module is not None:
+            uninstrument_module(module)
+    hook.modules.clear()
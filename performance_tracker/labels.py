@@ -0,0 +1,161 @@
+"""Break monitored calls down by labels such as tenant, endpoint or shard
+
+Labels come from ``bind_labels()``, which binds them to the current context
+(thread or asyncio task), and from a ``labels=`` extractor passed to
+``performance_monitor``, which derives them from the call's arguments. Each
+distinct combination is one row in the function's ``labels`` table, keyed
+``"shard=3,tenant=acme"``.
+
+The table holds at most ``max_labels`` rows plus ``"other"``. Which labels
+keep a row is decided by space-saving heavy-hitter counting: a new label
+takes the row of the least counted one, whose statistics are folded into
+``"other"``. Frequent labels therefore keep accurate rows however many rare
+ones pass through, and memory stays bounded.
+"""
+
+import os
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, Callable, Iterator, Mapping, Optional
+
+from .monitor import _label_tables, _latency_bounds, performance_stats
+from .sketches import SpaceSaving
+
+# Row that collects the calls of labels without a row of their own
+OTHER = "other"
+
+_bound_labels: ContextVar[Optional[dict[str, str]]] = ContextVar(
+    "performance_tracker_labels", default=None
+)
+
+# Guards label tables; rows and counters are updated together. Taken after
+# a function's entry lock when both are held.
+_lock = Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_lock._at_fork_reinit)  # type: ignore
+
+
+@contextmanager
+def bind_labels(**labels: Any) -> Iterator[None]:
+    """Attach labels to the monitored calls made inside the block
+
+    Nested blocks add to (and may override) the labels of enclosing ones.
+    Only functions monitored with ``labels=`` set record them.
+    """
+    current = _bound_labels.get()
+    values = {name: str(value) for name, value in labels.items()}
+    token = _bound_labels.set({**current, **values} if current else values)
+    try:
+        yield
+    finally:
+        _bound_labels.reset(token)
+
+
+def current_labels() -> dict[str, str]:
+    """The labels bound to the current context"""
+    return dict(_bound_labels.get() or {})
+
+
+def label_key(labels: Mapping[str, Any]) -> str:
+    """Row key for a set of labels: ``name=value`` pairs sorted by name"""
+    return ",".join(f"{name}={labels[name]}" for name in sorted(labels))
+
+
+def _call_label(
+    extractor: Optional[Callable[..., Optional[Mapping[str, Any]]]],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> Optional[str]:
+    """Row key for a call, or None if it has no labels"""
+    labels: Optional[Mapping[str, Any]] = _bound_labels.get()
+    if extractor is not None:
+        try:
+            extracted = extractor(*args, **kwargs)
+            if extracted and isinstance(extracted, Mapping):
+                return label_key({**labels, **extracted} if labels else extracted)
+        except Exception:
+            # A broken extractor must never break the monitored function
+            pass
+        # Without a usable result the call keeps only its bound labels
+    return label_key(labels) if labels else None
+
+
+def _new_row() -> dict[str, Any]:
+    return {
+        "count": 0,
+        "error": 0,
+        "calls": 0,
+        "failures": 0,
+        "total_time": 0.0,
+        "min_time": float("inf"),
+        "max_time": 0.0,
+        "latency": [0] * (len(_latency_bounds()) + 1),
+    }
+
+
+def _fold(into: dict[str, Any], row: Mapping[str, Any]) -> None:
+    into["count"] += row["calls"]
+    into["calls"] += row["calls"]
+    into["failures"] += row["failures"]
+    into["total_time"] += row["total_time"]
+    into["min_time"] = min(into["min_time"], row["min_time"])
+    into["max_time"] = max(into["max_time"], row["max_time"])
+    into["latency"] = [a + b for a, b in zip(into["latency"], row["latency"])]
+
+
+def _record_label_stats(
+    func_name: str, key: str, duration: float, success: bool, max_labels: int
+) -> None:
+    """Record one call under its label row, evicting into ``"other"``"""
+    with _lock:
+        stats = performance_stats.get(func_name)
+        if stats is None:
+            return
+        rows = stats.labels
+        counter = _label_tables.get(func_name)
+        if counter is None:
+            counter = _label_tables[func_name] = SpaceSaving(max_labels)
+
+        evicted = counter.add(key)
+        if evicted is not None:
+            other = rows.get(OTHER)
+            if other is None:
+                other = rows[OTHER] = _new_row()
+            _fold(other, rows.pop(evicted))
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = _new_row()
+        row["count"], row["error"] = counter.get(key)
+
+        row["calls"] += 1
+        if not success:
+            row["failures"] += 1
+        row["total_time"] += duration
+        row["min_time"] = min(row["min_time"], duration)
+        row["max_time"] = max(row["max_time"], duration)
+        row["latency"][bisect_left(_latency_bounds(), duration)] += 1
+
+
+def _enforce_label_cap(func_name: str, max_labels: int = 100) -> None:
+    """Bring a label table merged from elsewhere back under its cap"""
+    with _lock:
+        stats = performance_stats.get(func_name)
+        if stats is None or not stats.labels:
+            return
+        counter = _label_tables.get(func_name)
+        capacity = counter.capacity if counter is not None else max_labels
+        rows = stats.labels
+        entries = [
+            (key, row["count"], row["error"])
+            for key, row in rows.items()
+            if key != OTHER
+        ]
+        counter = _label_tables[func_name] = SpaceSaving.from_counts(entries, capacity)
+        for key in [key for key in rows if key != OTHER and key not in counter]:
+            other = rows.get(OTHER)
+            if other is None:
+                other = rows[OTHER] = _new_row()
+            _fold(other, rows.pop(key))
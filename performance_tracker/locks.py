@@ -0,0 +1,399 @@
+"""Measure lock contention and charge lock waits to monitored functions
+
+``MonitoredLock``, ``MonitoredRLock``, ``MonitoredCondition``,
+``MonitoredSemaphore`` and ``MonitoredBoundedSemaphore`` are drop-in
+replacements for their ``threading`` counterparts. Each records, per lock
+name, how often it was acquired, how long threads waited for it and how
+long it was held. Time spent waiting is also added to the ``lock_wait_time``
+of every monitored function active on the waiting thread (or to the
+running monitored coroutine), so the report can show how much of a
+function's time went to lock waits.
+
+An acquisition that succeeds straight away costs a non-blocking attempt and
+two clock reads for the hold time; only contended acquisitions are timed
+and attributed. ``patch_threading()`` makes ``threading.Lock()`` and
+friends return monitored locks, named after the line that created them.
+"""
+
+import os
+import sys
+import threading
+from threading import local
+from time import perf_counter_ns
+from typing import Any, Optional
+
+from .monitor import _active_calls, _current_coroutine, performance_stats
+
+# The originals, kept for the locks' own internals and for unpatching
+_Lock = threading.Lock
+_RLock = threading.RLock
+_Condition = threading.Condition
+_Semaphore = threading.Semaphore
+_BoundedSemaphore = threading.BoundedSemaphore
+
+
+class LockStats:
+    """Contention statistics for all locks sharing one name"""
+
+    __slots__ = (
+        "acquisitions",
+        "contended",
+        "failed",
+        "wait_ns",
+        "max_wait_ns",
+        "holds",
+        "hold_ns",
+        "max_hold_ns",
+        "functions",
+    )
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self.acquisitions = 0
+        self.contended = 0
+        # Acquisitions that timed out or were not allowed to block
+        self.failed = 0
+        self.wait_ns = 0
+        self.max_wait_ns = 0
+        self.holds = 0
+        self.hold_ns = 0
+        self.max_hold_ns = 0
+        # func_name -> ns spent waiting for this lock inside that function
+        self.functions: dict[str, int] = {}
+
+    def to_dict(self) -> dict[str, Any]:
+        attempts = self.acquisitions + self.failed
+        return {
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "failed": self.failed,
+            "contention_rate": self.contended / attempts if attempts else 0.0,
+            "wait_time": self.wait_ns / 1e9,
+            "avg_wait": self.wait_ns / self.contended / 1e9 if self.contended else 0.0,
+            "max_wait": self.max_wait_ns / 1e9,
+            "holds": self.holds,
+            "hold_time": self.hold_ns / 1e9,
+            "avg_hold": self.hold_ns / self.holds / 1e9 if self.holds else 0.0,
+            "max_hold": self.max_hold_ns / 1e9,
+            "functions": {
+                name: wait_ns / 1e9 for name, wait_ns in self.functions.items()
+            },
+        }
+
+
+# Global storage for lock data, keyed by lock name
+lock_stats: dict[str, LockStats] = {}
+
+# Patched threading attributes and their originals
+_patched: dict[str, Any] = {}
+
+
+def _creation_site(depth: int) -> str:
+    """``file.py:line`` of the frame ``depth`` levels above the caller"""
+    frame = sys._getframe(depth + 1)
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno}"
+
+
+def _stats_for(name: str) -> LockStats:
+    stats = lock_stats.get(name)
+    if stats is None:
+        stats = lock_stats.setdefault(name, LockStats())
+    return stats
+
+
+def _record_wait(stats: LockStats, wait_ns: int, acquired: bool) -> None:
+    """Count a contended acquisition and charge the wait to monitored calls"""
+    stats.contended += 1
+    stats.wait_ns += wait_ns
+    if wait_ns > stats.max_wait_ns:
+        stats.max_wait_ns = wait_ns
+    if acquired:
+        stats.acquisitions += 1
+    else:
+        stats.failed += 1
+
+    # Every enclosing call's time includes the wait, but only once each
+    names = set(_active_calls())
+    coroutine = _current_coroutine.get()
+    if coroutine is not None:
+        names.add(coroutine)
+    wait = wait_ns / 1e9
+    for func_name in names:
+        entry = performance_stats.get(func_name)
+        if entry is not None:
+            with entry._lock:
+                entry.lock_waits += 1
+                entry.lock_wait_time += wait
+        stats.functions[func_name] = stats.functions.get(func_name, 0) + wait_ns
+
+
+def _record_hold(stats: LockStats, hold_ns: int) -> None:
+    stats.holds += 1
+    stats.hold_ns += hold_ns
+    if hold_ns > stats.max_hold_ns:
+        stats.max_hold_ns = hold_ns
+
+
+def _acquire(
+    lock: Any, stats: LockStats, blocking: bool, timeout: Optional[float]
+) -> bool:
+    """Acquire ``lock``, timing the wait only if it is not free right away"""
+    if lock.acquire(False):
+        stats.acquisitions += 1
+        return True
+    if not blocking:
+        stats.failed += 1
+        return False
+    start = perf_counter_ns()
+    if timeout is None or timeout < 0:
+        acquired = lock.acquire()
+    else:
+        acquired = lock.acquire(True, timeout)
+    _record_wait(stats, perf_counter_ns() - start, acquired)
+    return acquired
+
+
+class MonitoredLock:
+    """``threading.Lock`` that records its contention under ``name``
+
+    ``name`` defaults to the ``file.py:line`` that created the lock.
+    """
+
+    __slots__ = ("name", "_lock", "_stats", "_acquired_at")
+
+    def __init__(self, name: Optional[str] = None) -> None:
+        self.name = name or _creation_site(1)
+        self._lock = _Lock()
+        self._stats: Optional[LockStats] = None
+        self._acquired_at = 0
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        stats = self._stats or self._load_stats()
+        if _acquire(self._lock, stats, blocking, timeout):
+            self._acquired_at = perf_counter_ns()
+            return True
+        return False
+
+    def release(self) -> None:
+        held = perf_counter_ns() - self._acquired_at
+        self._lock.release()
+        _record_hold(self._stats or self._load_stats(), held)
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    def _is_owned(self) -> bool:
+        # What threading.Condition assumes for a plain lock, without
+        # recording the probe acquisition it would otherwise make
+        return self._lock.locked()
+
+    def _at_fork_reinit(self) -> None:
+        """Reset to unlocked in a forked child, as ``threading`` expects of
+        every lock it reinitializes after ``os.fork()``"""
+        self._lock._at_fork_reinit()
+        self._acquired_at = 0
+
+    def _load_stats(self) -> LockStats:
+        self._stats = _stats_for(self.name)
+        return self._stats
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+    def __repr__(self) -> str:
+        state = "locked" if self.locked() else "unlocked"
+        return f"<MonitoredLock {self.name!r} {state}>"
+
+
+class MonitoredRLock:
+    """``threading.RLock`` that records its contention under ``name``
+
+    Hold time runs from the outermost acquire to the matching release.
+    """
+
+    __slots__ = ("name", "_lock", "_stats", "_acquired_at", "_count")
+
+    def __init__(self, name: Optional[str] = None) -> None:
+        self.name = name or _creation_site(1)
+        self._lock = _RLock()
+        self._stats: Optional[LockStats] = None
+        self._acquired_at = 0
+        # Recursion level; only changed by the owning thread
+        self._count = 0
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        stats = self._stats or self._load_stats()
+        if not _acquire(self._lock, stats, blocking, timeout):
+            return False
+        self._count += 1
+        if self._count == 1:
+            self._acquired_at = perf_counter_ns()
+        return True
+
+    def release(self) -> None:
+        if not self._lock._is_owned():
+            raise RuntimeError("cannot release un-acquired lock")
+        self._count -= 1
+        if self._count:
+            self._lock.release()
+            return
+        held = perf_counter_ns() - self._acquired_at
+        self._lock.release()
+        _record_hold(self._stats or self._load_stats(), held)
+
+    def _is_owned(self) -> bool:
+        return bool(self._lock._is_owned())
+
+    def _at_fork_reinit(self) -> None:
+        """Reset to unowned in a forked child; see ``MonitoredLock``"""
+        self._lock._at_fork_reinit()
+        self._count = 0
+        self._acquired_at = 0
+
+    def _release_save(self) -> int:
+        """Release every level for ``Condition.wait``; returns the level"""
+        count = self._count
+        held = perf_counter_ns() - self._acquired_at
+        self._count = 0
+        for _ in range(count):
+            self._lock.release()
+        _record_hold(self._stats or self._load_stats(), held)
+        return count
+
+    def _acquire_restore(self, count: int) -> None:
+        """Reacquire after ``Condition.wait``, timing the wait like acquire()"""
+        self.acquire()
+        for _ in range(count - 1):
+            self._lock.acquire()
+        self._count = count
+
+    def _load_stats(self) -> LockStats:
+        self._stats = _stats_for(self.name)
+        return self._stats
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+    def __repr__(self) -> str:
+        return f"<MonitoredRLock {self.name!r} count={self._count}>"
+
+
+class MonitoredCondition(_Condition):
+    """``threading.Condition`` over a monitored lock
+
+    Waiting for a notification is not contention; only reacquiring the lock
+    afterwards is recorded as a wait. Without ``lock`` a ``MonitoredRLock``
+    named ``name`` is used.
+    """
+
+    def __init__(self, lock: Any = None, name: Optional[str] = None) -> None:
+        if lock is None:
+            lock = MonitoredRLock(name or _creation_site(1))
+        super().__init__(lock)
+
+
+class _MonitoredSemaphoreMixin:
+    """Contention and per-thread hold time for the semaphore classes"""
+
+    _cond: Any
+    _value: int
+
+    def __init__(self, value: int = 1, name: Optional[str] = None) -> None:
+        super().__init__(value)  # type: ignore[call-arg]
+        # The semaphore's own lock stays unmonitored, even when patched
+        self._cond = _Condition(_Lock())
+        self.name = name or _creation_site(1)
+        self._stats = _stats_for(self.name)
+        self._holds = local()
+
+    def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        if not _acquire(super(), self._stats, blocking, timeout):
+            return False
+        starts = getattr(self._holds, "starts", None)
+        if starts is None:
+            starts = self._holds.starts = []
+        starts.append(perf_counter_ns())
+        return True
+
+    __enter__ = acquire
+
+    def release(self, n: int = 1) -> None:
+        # Hold time is only known when the acquiring thread releases
+        starts = getattr(self._holds, "starts", None) or []
+        held = [perf_counter_ns() - starts.pop() for _ in range(min(n, len(starts)))]
+        super().release(n)  # type: ignore[misc]
+        for hold_ns in held:
+            _record_hold(self._stats, hold_ns)
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+
+class MonitoredSemaphore(_MonitoredSemaphoreMixin, _Semaphore):
+    """``threading.Semaphore`` that records its contention under ``name``
+
+    A thread waits when the counter is zero. Hold time is recorded when a
+    thread releases a permit it acquired itself.
+    """
+
+
+class MonitoredBoundedSemaphore(_MonitoredSemaphoreMixin, _BoundedSemaphore):
+    """``threading.BoundedSemaphore`` that records its contention"""
+
+
+def _lock_factory() -> MonitoredLock:
+    return MonitoredLock(_creation_site(1))
+
+
+def _rlock_factory(*args: Any, **kwargs: Any) -> MonitoredRLock:
+    return MonitoredRLock(_creation_site(1))
+
+
+def patch_threading() -> None:
+    """Make ``threading``'s lock types create monitored locks
+
+    Only locks created afterwards through the ``threading`` module are
+    monitored; code that imported ``Lock`` by name keeps the original.
+    """
+    replacements = {
+        "Lock": _lock_factory,
+        "RLock": _rlock_factory,
+        "Condition": MonitoredCondition,
+        "Semaphore": MonitoredSemaphore,
+        "BoundedSemaphore": MonitoredBoundedSemaphore,
+    }
+    for attr, replacement in replacements.items():
+        if attr not in _patched:
+            _patched[attr] = getattr(threading, attr)
+            setattr(threading, attr, replacement)
+
+
+def unpatch_threading() -> None:
+    """Restore ``threading``'s lock types; existing monitored locks keep
+    recording"""
+    for attr, original in _patched.items():
+        setattr(threading, attr, original)
+    _patched.clear()
+
+
+def is_threading_patched() -> bool:
+    return bool(_patched)
+
+
+def get_lock_stats() -> dict[str, dict[str, Any]]:
+    """Return per-lock contention statistics as plain dicts, most waited
+    on first"""
+    entries = sorted(lock_stats.items(), key=lambda item: -item[1].wait_ns)
+    return {name: stats.to_dict() for name, stats in entries}
+
+
+def reset_lock_stats() -> None:
+    """Zero the statistics of every lock; the locks keep recording"""
+    for stats in list(lock_stats.values()):
+        stats.clear()
@@ -0,0 +1,185 @@
+"""Event-loop lag and slow-callback monitoring for asyncio
+
+A ``LoopMonitor`` does two things while it runs on a loop:
+
+* A probe task sleeps for ``probe_interval`` seconds at a time and records
+  how much later than requested it woke up. That lag is how long ready work
+  had to wait for the loop, whatever the cause.
+* Every callback the loop runs (including each step of a task) is timed.
+  Callbacks that hold the loop for at least ``slow_callback_threshold``
+  seconds are attributed to the monitored coroutine active in that task, or
+  to the monitored function on the loop thread's call stack, and recorded
+  under that function's stats entry (``slow_callbacks``,
+  ``loop_block_time``, ``max_loop_block``).
+
+Callback timing hooks ``asyncio.Handle._run`` while at least one monitor is
+running, so it covers the standard library loops but not third-party loops
+(e.g. uvloop) that bring their own handle type.
+"""
+
+import asyncio
+from asyncio import events
+from threading import get_ident
+from time import perf_counter
+from typing import Any, Optional
+
+from .histogram import LatencyHistogram
+from .monitor import (
+    _current_coroutine,
+    _init_function_stats,
+    _thread_calls,
+    performance_stats,
+)
+
+# Running monitors by loop, consulted by the Handle._run hook
+_monitors: dict[asyncio.AbstractEventLoop, "LoopMonitor"] = {}
+_original_run: Any = None
+
+
+def _timed_run(handle: events.Handle) -> None:
+    monitor = _monitors.get(handle._loop)  # type: ignore[attr-defined]
+    if monitor is None:
+        _original_run(handle)
+        return
+    start = perf_counter()
+    try:
+        _original_run(handle)
+    finally:
+        duration = perf_counter() - start
+        if duration >= monitor.slow_callback_threshold:
+            monitor._record_slow(handle, duration)
+
+
+def _install_hook() -> None:
+    global _original_run
+    if _original_run is None:
+        _original_run = events.Handle._run
+        events.Handle._run = _timed_run  # type: ignore[assignment]
+
+
+def _uninstall_hook() -> None:
+    global _original_run
+    if _original_run is not None and not _monitors:
+        events.Handle._run = _original_run  # type: ignore[assignment]
+        _original_run = None
+
+
+def _describe_callback(handle: events.Handle) -> str:
+    """Name an unattributed callback: its task's coroutine, or the callable"""
+    callback = handle._callback  # type: ignore[attr-defined]
+    task = getattr(callback, "__self__", None)
+    if isinstance(task, asyncio.Task):
+        coro = task.get_coro()
+        return f"task {getattr(coro, '__qualname__', task.get_name())}"
+    return getattr(callback, "__qualname__", repr(callback))
+
+
+class LoopMonitor:
+    """Measure event-loop lag and attribute slow callbacks
+
+    Args:
+        slow_callback_threshold: Seconds a single callback must hold the
+            loop to be recorded as slow
+        probe_interval: Seconds between lag probes
+
+    Use ``start()``/``stop()`` from within the loop, or ``async with``.
+    """
+
+    def __init__(
+        self, slow_callback_threshold: float = 0.1, probe_interval: float = 0.1
+    ) -> None:
+        if slow_callback_threshold <= 0 or probe_interval <= 0:
+            raise ValueError("threshold and probe interval must be positive")
+        self.slow_callback_threshold = slow_callback_threshold
+        self.probe_interval = probe_interval
+        self.lag = LatencyHistogram()
+        self.slow_callbacks: dict[str, LatencyHistogram] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._probe: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def start(self) -> "LoopMonitor":
+        """Start monitoring the running event loop"""
+        if self._loop is not None:
+            raise RuntimeError("LoopMonitor is already running")
+        loop = asyncio.get_running_loop()
+        if loop in _monitors:
+            raise RuntimeError("another LoopMonitor is running on this loop")
+        self._loop = loop
+        self._loop_thread = get_ident()
+        _monitors[loop] = self
+        _install_hook()
+        self._probe = loop.create_task(self._run_probe())
+        return self
+
+    def stop(self) -> None:
+        """Stop the probe and callback timing"""
+        if self._loop is None:
+            return
+        if self._probe is not None:
+            self._probe.cancel()
+            self._probe = None
+        _monitors.pop(self._loop, None)
+        _uninstall_hook()
+        self._loop = None
+
+    async def __aenter__(self) -> "LoopMonitor":
+        return self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    async def _run_probe(self) -> None:
+        interval = self.probe_interval
+        while True:
+            start = perf_counter()
+            await asyncio.sleep(interval)
+            self.lag.record(max(perf_counter() - start - interval, 0.0))
+
+    def _attribute(self, handle: events.Handle) -> Optional[str]:
+        context = getattr(handle, "_context", None)
+        if context is not None:
+            name = context.get(_current_coroutine)
+            if name is not None:
+                return name
+        calls = _thread_calls.get(self._loop_thread)  # type: ignore[arg-type]
+        if calls:
+            return calls[-1]
+        return None
+
+    def _record_slow(self, handle: events.Handle, duration: float) -> None:
+        name = self._attribute(handle)
+        if name is not None:
+            _init_function_stats(name)
+            stats = performance_stats[name]
+            with stats._lock:
+                stats.slow_callbacks += 1
+                stats.loop_block_time += duration
+                stats.max_loop_block = max(stats.max_loop_block, duration)
+        else:
+            name = _describe_callback(handle)
+        histogram = self.slow_callbacks.get(name)
+        if histogram is None:
+            histogram = self.slow_callbacks[name] = LatencyHistogram()
+        histogram.record(duration)
+
+    def stats(self) -> dict[str, Any]:
+        """Loop lag and slow-callback histograms as plain dicts"""
+        return {
+            "lag": self.lag.to_dict(),
+            "slow_callbacks": {
+                name: histogram.to_dict()
+                for name, histogram in self.slow_callbacks.items()
+            },
+        }
+
+
+def monitor_event_loop(
+    slow_callback_threshold: float = 0.1, probe_interval: float = 0.1
+) -> LoopMonitor:
+    """Start a ``LoopMonitor`` on the running event loop and return it"""
+    return LoopMonitor(slow_callback_threshold, probe_interval).start()
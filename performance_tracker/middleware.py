@@ -0,0 +1,366 @@
+"""WSGI and ASGI middleware recording request-level performance
+
+Requests are grouped by method and templated route (``GET /users/{id}``,
+never the raw URL). Paths the templating cannot collapse, such as slugs or
+scanners probing random URLs, would still add a route each, so at most
+``max_routes`` routes are kept and requests to further routes are counted
+under ``"other"``. For each route the middleware keeps a latency histogram,
+counts per status class, request and response body sizes, and an in-flight
+gauge. Calls to functions decorated with ``performance_monitor`` (and spans)
+made while a request is being handled are attributed to that request's route.
+"""
+
+import re
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Iterable, Iterator, Optional
+
+from .histogram import LatencyHistogram
+from .monitor import _call_listeners
+
+# Path segments that identify a resource rather than a route
+_ID_SEGMENT = re.compile(
+    r"^(?:\d+|[0-9a-fA-F]{16,}|"
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$"
+)
+
+
+def template_path(path: str) -> str:
+    """Replace numeric, hex and UUID path segments with ``{id}``"""
+    return "/".join(
+        "{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/")
+    )
+
+
+class RouteStats:
+    """Request statistics for one method and route"""
+
+    __slots__ = (
+        "latency",
+        "status_classes",
+        "request_bytes",
+        "response_bytes",
+        "in_flight",
+        "max_in_flight",
+        "functions",
+    )
+
+    def __init__(self) -> None:
+        self.latency = LatencyHistogram()
+        self.status_classes: dict[str, int] = {}
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # func_name -> [calls, total time] for monitored calls in requests
+        self.functions: dict[str, list[float]] = {}
+
+    def to_dict(self) -> dict[str, Any]:
+        requests = self.latency.count
+        return {
+            "requests": requests,
+            "latency": self.latency.to_dict(),
+            "status_classes": dict(self.status_classes),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "avg_request_bytes": self.request_bytes / requests if requests else 0.0,
+            "avg_response_bytes": self.response_bytes / requests if requests else 0.0,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "functions": {
+                name: {"calls": int(calls), "total_time": total}
+                for name, (calls, total) in self.functions.items()
+            },
+        }
+
+
+# Routes kept by default before new ones are counted under OTHER_ROUTE
+DEFAULT_MAX_ROUTES = 1000
+OTHER_ROUTE = "other"
+
+# Global storage for request data, keyed by "METHOD /templated/route"
+request_stats: dict[str, RouteStats] = {}
+_in_flight_total = 0
+_lock = Lock()
+
+_current_route: ContextVar[Optional[RouteStats]] = ContextVar(
+    "performance_tracker_current_route", default=None
+)
+
+
+def _attribute_call(func_name: str, duration: float, success: bool) -> None:
+    """Charge a monitored call to the request being handled, if any"""
+    route = _current_route.get()
+    if route is None:
+        return
+    with _lock:
+        entry = route.functions.get(func_name)
+        if entry is None:
+            route.functions[func_name] = [1, duration]
+        else:
+            entry[0] += 1
+            entry[1] += duration
+
+
+def _begin_request(key: str, request_bytes: int, max_routes: int) -> RouteStats:
+    global _in_flight_total
+    with _lock:
+        route = request_stats.get(key)
+        if route is None:
+            if len(request_stats) >= max_routes:
+                key = OTHER_ROUTE
+                route = request_stats.get(key)
+            if route is None:
+                route = request_stats[key] = RouteStats()
+        route.in_flight += 1
+        route.max_in_flight = max(route.max_in_flight, route.in_flight)
+        route.request_bytes += request_bytes
+        _in_flight_total += 1
+    return route
+
+
+def _end_request(
+    route: RouteStats, duration: float, status: int, response_bytes: int
+) -> None:
+    global _in_flight_total
+    status_class = f"{status // 100}xx" if status else "unknown"
+    with _lock:
+        route.in_flight -= 1
+        _in_flight_total -= 1
+        route.latency.record(duration)
+        route.status_classes[status_class] = (
+            route.status_classes.get(status_class, 0) + 1
+        )
+        route.response_bytes += response_bytes
+
+
+def get_request_stats() -> dict[str, dict[str, Any]]:
+    """Return a snapshot of per-route request statistics as plain dicts"""
+    with _lock:
+        return {key: route.to_dict() for key, route in request_stats.items()}
+
+
+def in_flight_requests() -> int:
+    """Number of requests currently being handled by any middleware"""
+    return _in_flight_total
+
+
+def reset_request_stats() -> None:
+    """Clear per-route request statistics (in-flight requests keep counting)"""
+    with _lock:
+        for key in [k for k, route in request_stats.items() if not route.in_flight]:
+            del request_stats[key]
+        for route in request_stats.values():
+            route.latency = LatencyHistogram()
+            route.status_classes.clear()
+            route.request_bytes = route.response_bytes = 0
+            route.max_in_flight = route.in_flight
+            route.functions.clear()
+
+
+def _install_listener() -> None:
+    if _attribute_call not in _call_listeners:
+        _call_listeners.append(_attribute_call)
+
+
+class _ResponseIterator:
+    """Wrap a WSGI response body to count bytes and finish on close()"""
+
+    def __init__(
+        self,
+        body: Iterable[bytes],
+        route: RouteStats,
+        finish: Callable[[int], None],
+    ) -> None:
+        self._body = body
+        self._iterator: Optional[Iterator[bytes]] = None
+        self._route = route
+        self._finish = finish
+        self._bytes = 0
+        self._closed = False
+
+    def __iter__(self) -> "_ResponseIterator":
+        self._iterator = iter(self._body)
+        return self
+
+    def __next__(self) -> bytes:
+        if self._iterator is None:
+            self._iterator = iter(self._body)
+        # Body generators run lazily, so attribute their work to the request
+        token = _current_route.set(self._route)
+        try:
+            chunk = next(self._iterator)
+        finally:
+            _current_route.reset(token)
+        self._bytes += len(chunk)
+        return chunk
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            close = getattr(self._body, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self._finish(self._bytes)
+
+
+class _SizedResponseIterator(_ResponseIterator):
+    """Response wrapper that keeps ``len()`` of list and tuple bodies
+
+    Servers such as wsgiref set Content-Length when ``len(body) == 1``.
+    """
+
+    def __len__(self) -> int:
+        return len(self._body)  # type: ignore[arg-type]
+
+
+class WSGIMiddleware:
+    """Record per-route request metrics for a WSGI application
+
+    Args:
+        app: The WSGI application to wrap
+        route_resolver: Optional ``callable(environ) -> str`` returning the
+            route template for a request. Defaults to the request path with
+            ID-like segments replaced by ``{id}``.
+        max_routes: Routes kept before requests to new routes are counted
+            under ``"other"``
+    """
+
+    def __init__(
+        self,
+        app: Callable[..., Iterable[bytes]],
+        route_resolver: Optional[Callable[[dict[str, Any]], str]] = None,
+        max_routes: int = DEFAULT_MAX_ROUTES,
+    ) -> None:
+        self.app = app
+        self.route_resolver = route_resolver
+        self.max_routes = max_routes
+        _install_listener()
+
+    def _route_key(self, environ: dict[str, Any]) -> str:
+        if self.route_resolver is not None:
+            route = self.route_resolver(environ)
+        else:
+            route = template_path(environ.get("PATH_INFO", "") or "/")
+        return f"{environ.get('REQUEST_METHOD', 'GET')} {route}"
+
+    def __call__(
+        self, environ: dict[str, Any], start_response: Callable[..., Any]
+    ) -> Iterable[bytes]:
+        try:
+            request_bytes = int(environ.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            request_bytes = 0
+        route = _begin_request(self._route_key(environ), request_bytes, self.max_routes)
+        status_code = [0]
+
+        def tracking_start_response(
+            status: str, headers: list[Any], exc_info: Any = None
+        ) -> Any:
+            try:
+                status_code[0] = int(status.split(" ", 1)[0])
+            except ValueError:
+                pass
+            if exc_info is not None:
+                return start_response(status, headers, exc_info)
+            return start_response(status, headers)
+
+        start_time = perf_counter()
+
+        def finish(response_bytes: int) -> None:
+            _end_request(
+                route, perf_counter() - start_time, status_code[0], response_bytes
+            )
+
+        token = _current_route.set(route)
+        try:
+            body = self.app(environ, tracking_start_response)
+        except BaseException:
+            status_code[0] = status_code[0] or 500
+            finish(0)
+            raise
+        finally:
+            _current_route.reset(token)
+        if hasattr(body, "__len__"):
+            return _SizedResponseIterator(body, route, finish)
+        return _ResponseIterator(body, route, finish)
+
+
+class ASGIMiddleware:
+    """Record per-route request metrics for an ASGI application
+
+    Only ``http`` scopes are measured; lifespan and websocket traffic is
+    passed straight through.
+
+    Args:
+        app: The ASGI application to wrap
+        route_resolver: Optional ``callable(scope) -> str`` returning the
+            route template for a request. Defaults to the request path with
+            ID-like segments replaced by ``{id}``.
+        max_routes: Routes kept before requests to new routes are counted
+            under ``"other"``
+    """
+
+    def __init__(
+        self,
+        app: Callable[..., Awaitable[None]],
+        route_resolver: Optional[Callable[[dict[str, Any]], str]] = None,
+        max_routes: int = DEFAULT_MAX_ROUTES,
+    ) -> None:
+        self.app = app
+        self.route_resolver = route_resolver
+        self.max_routes = max_routes
+        _install_listener()
+
+    def _route_key(self, scope: dict[str, Any]) -> str:
+        if self.route_resolver is not None:
+            route = self.route_resolver(scope)
+        else:
+            route = template_path(scope.get("path", "") or "/")
+        return f"{scope.get('method', 'GET')} {route}"
+
+    async def __call__(
+        self,
+        scope: dict[str, Any],
+        receive: Callable[[], Awaitable[dict[str, Any]]],
+        send: Callable[[dict[str, Any]], Awaitable[None]],
+    ) -> None:
+        if scope.get("type") != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = _begin_request(self._route_key(scope), 0, self.max_routes)
+        status_code = 0
+        response_bytes = 0
+
+        async def tracking_receive() -> dict[str, Any]:
+            message = await receive()
+            if message.get("type") == "http.request":
+                body_bytes = len(message.get("body", b""))
+                with _lock:
+                    route.request_bytes += body_bytes
+            return message
+
+        async def tracking_send(message: dict[str, Any]) -> None:
+            nonlocal status_code, response_bytes
+            if message.get("type") == "http.response.start":
+                status_code = message.get("status", 0)
+            elif message.get("type") == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        start_time = perf_counter()
+        token = _current_route.set(route)
+        try:
+            await self.app(scope, tracking_receive, tracking_send)
+        except BaseException:
+            status_code = status_code or 500
+            raise
+        finally:
+            _current_route.reset(token)
+            duration = perf_counter() - start_time
+            _end_request(route, duration, status_code, response_bytes)
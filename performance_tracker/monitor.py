@@ -1,80 +1,935 @@
-import tracemalloc
-from threading import local
-from time import perf_counter, sleep
-from typing import Any, Callable, TypeVar
+import os
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+from sys import getallocatedblocks
+from threading import RLock, get_ident, local
+from time import perf_counter_ns
+from typing import Any, Callable, Iterator, Mapping, Optional, TypeVar, Union
 
 # Type variable for function decoration
 F = TypeVar("F", bound=Callable[..., Any])
 
+# Memory backend, imported on first use by _load_memory_backend()
+tracemalloc: Any = None
+
 # Global storage for performance data
-performance_stats: dict[str, dict[str, Any]] = {}
+performance_stats: dict[str, "FunctionStats"] = {}
 _local = local()
 
+# Called as listener(func_name, duration, success) after every recorded call;
+# integrations (request attribution, exporters) register themselves here
+_call_listeners: list[Callable[[str, float, bool], None]] = []
+
+# Called as sink(func_name, start_ns, elapsed_ns, success) for every timed
+# call while a timeline capture is running (see the timeline module)
+_trace_sinks: list[Callable[[str, int, int, bool], None]] = []
+
+# Distinct-argument sketches for functions monitored with advise_memo=True
+_memo_sketches: dict[str, "_MemoSketch"] = {}
+
+# Space-saving counters deciding which labels keep a row, for functions
+# monitored with labels=
+_label_tables: dict[str, Any] = {}
+
+# Upper bounds of the success/failure latency histograms, loaded with the
+# histogram module on first use by _latency_bounds()
+_LATENCY_BOUNDS: Optional[tuple[float, ...]] = None
+
+# Names of the monitored calls currently running, one stack per thread,
+# and their start times (perf_counter_ns) in a parallel stack
+_thread_calls: dict[int, list[str]] = {}
+_thread_starts: dict[int, list[int]] = {}
+
+# Monitored coroutine calls in progress: coroutine -> (name, start ns,
+# thread id)
+_running_coroutines: dict[Any, tuple[str, int, int]] = {}
+
+# Instrumentation overhead accounting (see the overhead module): the
+# calibrated cost in ns that a call through each wrapper configuration adds
+# to its caller, and whether enclosing calls have it subtracted
+_overhead_accounting = False
+_subtract_overhead = False
+_overhead_ns: dict[tuple[Any, ...], int] = {}
+_wrapper_configs: set[tuple[Any, ...]] = set()
+
+# Set by mark_warm() without a name: warmup_calls=None functions start out
+# warm from then on
+_all_warm = False
+
+
+# Innermost monitored coroutine running in the current task (or context)
+_current_coroutine: ContextVar[Optional[str]] = ContextVar(
+    "performance_tracker_current_coroutine", default=None
+)
+
+# inspect.CO_COROUTINE, without importing inspect
+_CO_COROUTINE = 0x80
+
+
+def _is_coroutine_function(func: Callable[..., Any]) -> bool:
+    code = getattr(func, "__code__", None)
+    return bool(getattr(code, "co_flags", 0) & _CO_COROUTINE)
 
-def _init_function_stats(func_name: str) -> None:
+
+def _active_calls() -> list[str]:
+    """Return the calling thread's stack of active monitored calls"""
+    try:
+        return _local.active_calls  # type: ignore
+    except AttributeError:
+        calls: list[str] = []
+        starts: list[int] = []
+        _local.active_calls = calls
+        _local.call_starts = starts
+        _thread_calls[get_ident()] = calls
+        _thread_starts[get_ident()] = starts
+        return calls
+
+
+def _call_starts() -> list[int]:
+    """Return the start times of the calling thread's active calls"""
+    _active_calls()
+    return _local.call_starts  # type: ignore
+
+
+def _overhead_frames() -> list[int]:
+    """Return the calling thread's stack of nested-overhead accumulators"""
+    try:
+        return _local.overhead_frames  # type: ignore
+    except AttributeError:
+        frames: list[int] = []
+        _local.overhead_frames = frames
+        return frames
+
+
+def _settle_overhead(
+    func_name: str, config: tuple[Any, ...], frames: list[int], elapsed_ns: int
+) -> int:
+    """Close a call's overhead frame and charge its wrapper cost to the caller
+
+    Returns the call's duration, net of the overhead of the monitored calls
+    nested in it when subtraction is on.
+    """
+    nested_ns = frames.pop()
+    own_ns = _overhead_ns.get(config, 0)
+    if frames:
+        frames[-1] += nested_ns + own_ns
+    stats = performance_stats.get(func_name)
+    net_ns = max(elapsed_ns - nested_ns, 0) if _subtract_overhead else elapsed_ns
+    if stats is not None:
+        with stats._lock:
+            stats.own_overhead += own_ns / 1e9
+            stats.nested_overhead += nested_ns / 1e9
+            stats.subtracted_overhead += (elapsed_ns - net_ns) / 1e9
+    return net_ns
+
+
+def _trace_call(func_name: str, start_ns: int, elapsed_ns: int, success: bool) -> None:
+    for sink in _trace_sinks:
+        sink(func_name, start_ns, elapsed_ns, success)
+
+
+def _pop_active_call(calls: list[str], starts: list[int], name: str) -> None:
+    """Remove ``name`` and its start time from an active-call stack
+
+    Calls that suspend (async spans) can finish out of order, so fall back to
+    removing the most recent entry with this name when it is not on top.
+    """
+    if calls and calls[-1] == name:
+        calls.pop()
+        starts.pop()
+        return
+    for index in range(len(calls) - 1, -1, -1):
+        if calls[index] == name:
+            del calls[index]
+            del starts[index]
+            return
+
+
+def _load_memory_backend() -> Any:
+    """Import tracemalloc the first time a decorator asks for memory tracking"""
+    global tracemalloc
+    if tracemalloc is None:
+        import tracemalloc as backend
+
+        tracemalloc = backend
+    return tracemalloc
+
+
+def _latency_bounds() -> tuple[float, ...]:
+    global _LATENCY_BOUNDS
+    if _LATENCY_BOUNDS is None:
+        from .histogram import DEFAULT_LATENCY_BUCKETS
+
+        _LATENCY_BOUNDS = DEFAULT_LATENCY_BUCKETS
+    return _LATENCY_BOUNDS
+
+
+def _type_name(cls: type) -> str:
+    """``TimeoutError`` for builtins, ``package.module.Error`` otherwise"""
+    module = getattr(cls, "__module__", "builtins")
+    qualname = getattr(cls, "__qualname__", repr(cls))
+    return qualname if module == "builtins" else f"{module}.{qualname}"
+
+
+def _exception_name(error: Optional[type]) -> str:
+    return "Exception" if error is None else _type_name(error)
+
+
+# Legacy keys of a stats entry whose values are kept as integer nanoseconds
+_NS_SLOTS = {
+    "total_time": "total_ns",
+    "min_time": "min_ns",
+    "max_time": "max_ns",
+    "failure_time": "failure_ns",
+    "cold_time": "cold_ns",
+    "max_cold_time": "max_cold_ns",
+}
+
+# min_ns before the first call; read back as float("inf")
+_NO_MIN_NS = 1 << 63
+
+
+class FunctionStats(Mapping[str, Any]):
+    """One function's statistics, stored in slots
+
+    Call durations accumulate as ``perf_counter_ns()`` integers
+    (``total_ns``, ``min_ns``, ``max_ns``, ``failure_ns``, ``cold_ns``,
+    ``max_cold_ns``), so totals stay exact however many calls are recorded.
+    Read as a mapping, an entry is a read-only view with the documented keys
+    and those fields in float seconds (``total_time``, ``min_time``, ...);
+    ``dict(entry)`` gives a plain copy.
+    """
+
+    _FIELDS = (
+        "module",
+        "call_count",
+        "total_time",
+        "min_time",
+        "max_time",
+        "times",
+        "total_memory_used",
+        "max_memory_peak",
+        "memory_peaks",
+        "success_count",
+        "failure_count",
+        "success_latency",
+        "failure_latency",
+        "failure_time",
+        "failures",
+        "gc_pause_time",
+        "max_gc_pause",
+        "gc_collections",
+        "buckets",
+        "bucket_kind",
+        "labels",
+        "recursive_calls",
+        "max_depth",
+        "depth_counts",
+        "depth_self_time",
+        "memo_calls",
+        "repeat_calls",
+        "repeat_time",
+        "cache_hits",
+        "cache_misses",
+        "cache_evictions",
+        "cache_time_saved",
+        "task_count",
+        "queue_wait_time",
+        "max_queue_wait",
+        "task_run_time",
+        "alloc_calls",
+        "alloc_blocks",
+        "max_alloc_blocks",
+        "alloc_samples",
+        "alloc_sites",
+        "slow_callbacks",
+        "loop_block_time",
+        "max_loop_block",
+        "own_overhead",
+        "nested_overhead",
+        "subtracted_overhead",
+        "warm",
+        "cold_calls",
+        "cold_failures",
+        "cold_time",
+        "max_cold_time",
+        "cold_times",
+        "max_cold_memory_peak",
+        "hung_calls",
+        "max_concurrency",
+        "lock_waits",
+        "lock_wait_time",
+    )
+    __slots__ = tuple(_NS_SLOTS.get(field, field) for field in _FIELDS) + ("_lock",)
+
+    def __init__(self, module: str = "") -> None:
+        buckets = len(_latency_bounds()) + 1
+        self.module = module
+        # Held while a call is recorded and while a snapshot copies the entry,
+        # so snapshots see each call either wholly or not at all
+        self._lock = RLock()
+        self.call_count = 0
+        self.total_ns = 0
+        self.min_ns = _NO_MIN_NS
+        self.max_ns = 0
+        self.times: list[float] = []
+        self.total_memory_used = 0.0
+        self.max_memory_peak = 0.0
+        self.memory_peaks: list[float] = []
+        self.success_count = 0
+        self.failure_count = 0
+        self.success_latency = [0] * buckets
+        self.failure_latency = [0] * buckets
+        self.failure_ns = 0
+        self.failures: dict[str, dict[str, Any]] = {}
+        self.gc_pause_time = 0.0
+        self.max_gc_pause = 0.0
+        self.gc_collections = [0, 0, 0]
+        self.buckets: dict[Any, dict[str, Any]] = {}
+        # "size" for size_of= buckets, "key" for key= buckets
+        self.bucket_kind = ""
+        self.labels: dict[str, dict[str, Any]] = {}
+        self.recursive_calls = 0
+        self.max_depth = 0
+        self.depth_counts: dict[int, int] = {}
+        self.depth_self_time: dict[int, float] = {}
+        self.memo_calls = 0
+        self.repeat_calls = 0
+        self.repeat_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+        self.cache_time_saved = 0.0
+        self.task_count = 0
+        self.queue_wait_time = 0.0
+        self.max_queue_wait = 0.0
+        self.task_run_time = 0.0
+        self.alloc_calls = 0
+        self.alloc_blocks = 0
+        self.max_alloc_blocks = 0
+        self.alloc_samples = 0
+        # "file.py:line" -> blocks allocated there and still held at return
+        self.alloc_sites: dict[str, int] = {}
+        self.slow_callbacks = 0
+        self.loop_block_time = 0.0
+        self.max_loop_block = 0.0
+        self.own_overhead = 0.0
+        self.nested_overhead = 0.0
+        # Part of nested_overhead taken out of the recorded durations
+        self.subtracted_overhead = 0.0
+        self.warm = False
+        self.cold_calls = 0
+        self.cold_failures = 0
+        self.cold_ns = 0
+        self.max_cold_ns = 0
+        self.cold_times: list[float] = []
+        self.max_cold_memory_peak = 0.0
+        self.hung_calls = 0
+        self.max_concurrency = 0
+        self.lock_waits = 0
+        self.lock_wait_time = 0.0
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Entries travel between processes; the lock stays behind
+        return {slot: getattr(self, slot) for slot in self.__slots__[:-1]}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self._lock = RLock()
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def __getitem__(self, key: str) -> Any:
+        slot = _NS_SLOTS.get(key)
+        if slot is not None:
+            value = getattr(self, slot)
+            if value == _NO_MIN_NS:
+                return float("inf")
+            return value / 1e9
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._FIELDS)
+
+    def __len__(self) -> int:
+        return len(self._FIELDS)
+
+    def __repr__(self) -> str:
+        return (
+            f"<FunctionStats {self.module}: {self.call_count} calls, "
+            f"{self.total_ns / 1e9:.6f}s>"
+        )
+
+    def _merge(self, incoming: Mapping[str, Any]) -> None:
+        """Fold another entry (or a plain dict of the same keys) into this one"""
+        raw = isinstance(incoming, FunctionStats)
+        for field, value in incoming.items():
+            slot = _NS_SLOTS.get(field)
+            if slot is None:
+                if field not in _FIELD_SET:
+                    continue
+                slot = field
+            elif raw:
+                value = getattr(incoming, slot)
+            elif value == float("inf"):
+                value = _NO_MIN_NS
+            else:
+                value = round(value * 1e9)
+            current = getattr(self, slot)
+            if field in _SAMPLE_LISTS:
+                # Extend in place; snapshots hold prefix views of these lists
+                current.extend(value)
+            else:
+                setattr(self, slot, _merge_values(field, current, value))
+
+
+_FIELD_SET = frozenset(FunctionStats._FIELDS)
+
+# Per-call sample lists, only ever appended to
+_SAMPLE_LISTS = ("times", "memory_peaks", "cold_times")
+
+
+def _reinit_locks_after_fork() -> None:
+    # A thread of the parent may have held an entry's lock while it forked
+    for stats in list(performance_stats.values()):
+        stats._lock._at_fork_reinit()  # type: ignore[attr-defined]
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_locks_after_fork)
+
+
+def _init_function_stats(func_name: str, module: str = "") -> None:
     """Initialize stats for a function if not exists"""
     if func_name not in performance_stats:
-        performance_stats[func_name] = {
-            "call_count": 0,
-            "total_time": 0.0,
-            "min_time": float("inf"),
-            "max_time": 0.0,
-            "times": [],
-            "total_memory_used": 0.0,
-            "max_memory_peak": 0.0,
-            "memory_peaks": [],
-            "success_count": 0,
-            "failure_count": 0,
-        }
+        performance_stats[func_name] = FunctionStats(module)
 
 
 def _record_function_stats(
     func_name: str,
-    duration: float,
+    duration_ns: int,
     memory_used: float,
     memory_peak: float,
     success: bool,
-) -> None:
-    """Record performance data for a function call"""
+    error: Optional[type] = None,
+    warmup_calls: Optional[int] = 0,
+) -> tuple[float, bool]:
+    """Record performance data for a function call
+
+    ``duration_ns`` is the ``perf_counter_ns()`` difference and ``error`` the
+    exception class of a failed call. Until the function is warm (after
+    ``warmup_calls`` calls, or ``mark_warm()`` when it is None) the call
+    goes to the cold-start fields instead. Returns the duration in seconds
+    and whether the call was cold. Callers hold the entry's ``_lock`` and
+    notify ``_call_listeners`` after releasing it.
+    """
     stats = performance_stats[func_name]
+    duration = duration_ns / 1e9
+
+    if warmup_calls != 0 and not stats.warm:
+        if warmup_calls is None and _all_warm:
+            # First called after mark_warm(): there is nothing left to wait for
+            stats.warm = True
+        else:
+            _record_cold_call(stats, duration_ns, duration, memory_peak, success)
+            if warmup_calls is not None and stats.cold_calls >= warmup_calls:
+                stats.warm = True
+            return duration, True
 
     # Update timing stats
-    stats["total_time"] += duration
-    stats["min_time"] = min(stats["min_time"], duration)
-    stats["max_time"] = max(stats["max_time"], duration)
-    stats["times"].append(duration)
+    stats.call_count += 1
+    if duration_ns < stats.min_ns:
+        stats.min_ns = duration_ns
+    if duration_ns > stats.max_ns:
+        stats.max_ns = duration_ns
 
     # Update memory stats
-    stats["total_memory_used"] += memory_used
-    stats["max_memory_peak"] = max(stats["max_memory_peak"], memory_peak)
-    stats["memory_peaks"].append(memory_peak)
+    stats.total_memory_used += memory_used
+    if memory_peak > stats.max_memory_peak:
+        stats.max_memory_peak = memory_peak
 
-    # Update success/failure counts
+    # Update success/failure counts and keep their latencies apart: the
+    # samples and total_time describe successful calls only
+    bucket = bisect_left(_LATENCY_BOUNDS or _latency_bounds(), duration)
     if success:
-        stats["success_count"] += 1
+        stats.success_count += 1
+        stats.success_latency[bucket] += 1
+        stats.total_ns += duration_ns
+        stats.times.append(duration)
+        stats.memory_peaks.append(memory_peak)
     else:
-        stats["failure_count"] += 1
+        stats.failure_count += 1
+        stats.failure_latency[bucket] += 1
+        stats.failure_ns += duration_ns
+        label = _exception_name(error)
+        failure = stats.failures.get(label)
+        if failure is None:
+            stats.failures[label] = {
+                "count": 1,
+                "total_time": duration,
+                "min_time": duration,
+                "max_time": duration,
+            }
+        else:
+            failure["count"] += 1
+            failure["total_time"] += duration
+            failure["min_time"] = min(failure["min_time"], duration)
+            failure["max_time"] = max(failure["max_time"], duration)
+
+    return duration, False
+
+
+def _record_cold_call(
+    stats: FunctionStats,
+    duration_ns: int,
+    duration: float,
+    memory_peak: float,
+    success: bool,
+) -> None:
+    stats.cold_calls += 1
+    if not success:
+        stats.cold_failures += 1
+    stats.cold_ns += duration_ns
+    if duration_ns > stats.max_cold_ns:
+        stats.max_cold_ns = duration_ns
+    stats.cold_times.append(duration)
+    if memory_peak > stats.max_cold_memory_peak:
+        stats.max_cold_memory_peak = memory_peak
+
+
+def mark_warm(name: Optional[str] = None) -> None:
+    """End the cold-start period of one function, or of every function
+
+    Calls recorded after this count as steady state, even for functions
+    monitored with ``warmup_calls`` that have not had that many calls yet.
+    Without ``name`` it applies to every function called so far, and
+    functions monitored with ``warmup_calls=None`` that are first called
+    later start out warm, until ``reset_performance_stats()``. Functions
+    with ``warmup_calls=N`` first called later still record N cold calls.
+    """
+    global _all_warm
+    if name is not None:
+        _init_function_stats(name)
+        performance_stats[name].warm = True
+        return
+    _all_warm = True
+    for stats in list(performance_stats.values()):
+        stats.warm = True
+
+
+# Bucket collecting the calls of key= labels past max_buckets
+OTHER_BUCKET = "other"
+
+
+def _size_bucket(size: float) -> int:
+    """Lower bound of the power-of-two bucket containing ``size``"""
+    if size < 1:
+        return 0
+    return 1 << (int(size).bit_length() - 1)
+
+
+def _derive_bucket(
+    key: Optional[Callable[..., Any]],
+    size_of: Optional[Callable[..., float]],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> tuple[Any, float]:
+    """Return (bucket, size) for a call, or (None, 0.0) if it can't be derived"""
+    try:
+        if size_of is not None:
+            size = size_of(*args, **kwargs)
+            return _size_bucket(size), float(size)
+        if key is not None:
+            bucket = key(*args, **kwargs)
+            # Buckets are dict keys, so an unhashable one is unusable too
+            hash(bucket)
+            return bucket, 0.0
+    except Exception:
+        # A broken extractor must never break the monitored function
+        pass
+    return None, 0.0
+
+
+def _record_bucket_stats(
+    func_name: str,
+    bucket: Any,
+    size: float,
+    duration: float,
+    kind: str,
+    max_buckets: int,
+) -> None:
+    """Record one call's duration under its argument bucket
+
+    Past ``max_buckets`` buckets, calls in new buckets are recorded under
+    ``"other"``.
+    """
+    stats = performance_stats[func_name]
+    buckets = stats.buckets
+    entry = buckets.get(bucket)
+    if entry is None and len(buckets) >= max_buckets:
+        bucket = OTHER_BUCKET
+        entry = buckets.get(bucket)
+    if entry is None:
+        stats.bucket_kind = kind
+        entry = buckets[bucket] = {
+            "call_count": 0,
+            "total_time": 0.0,
+            "min_time": float("inf"),
+            "max_time": 0.0,
+            "total_size": 0.0,
+        }
+    entry["call_count"] += 1
+    entry["total_time"] += duration
+    entry["min_time"] = min(entry["min_time"], duration)
+    entry["max_time"] = max(entry["max_time"], duration)
+    entry["total_size"] += size
+
+
+def _record_recursion_stats(
+    func_name: str, max_depth: int, level_ns: list[int], nested_calls: int
+) -> None:
+    """Record a top-level call's recursion depth and self time per level
+
+    ``level_ns[i]`` is the time spent at depth ``i + 1`` excluding deeper
+    recursive calls.
+    """
+    stats = performance_stats[func_name]
+    stats.recursive_calls += nested_calls
+    if max_depth > stats.max_depth:
+        stats.max_depth = max_depth
+    counts = stats.depth_counts
+    counts[max_depth] = counts.get(max_depth, 0) + 1
+    self_time = stats.depth_self_time
+    for depth, elapsed_ns in enumerate(level_ns, 1):
+        self_time[depth] = self_time.get(depth, 0.0) + elapsed_ns / 1e9
+
+
+def _start_allocation_sample() -> bool:
+    """Trace a sampled call's allocations; True if tracing was started here"""
+    if tracemalloc.is_tracing():
+        tracemalloc.clear_traces()
+        return False
+    tracemalloc.start()
+    return True
+
+
+def _allocation_sites() -> dict[str, int]:
+    """Traced blocks still allocated, per source line that allocated them"""
+    # Grouping costs a few microseconds per traced block, so the monitoring
+    # code's own blocks are skipped after grouping rather than filtered out
+    own_files = (tracemalloc.__file__, __file__)
+    sites: dict[str, int] = {}
+    for statistic in tracemalloc.take_snapshot().statistics("lineno"):
+        frame = statistic.traceback[0]
+        if frame.filename in own_files:
+            continue
+        site = f"{os.path.basename(frame.filename)}:{frame.lineno}"
+        sites[site] = sites.get(site, 0) + statistic.count
+    return sites
+
+
+def _finish_allocation_sample(sample: Optional[bool]) -> Optional[dict[str, int]]:
+    """Allocation sites of a sampled call, or None if it was not sampled
+
+    ``sample`` is None for calls that were not sampled, otherwise whether
+    ``_start_allocation_sample()`` started tracing for the call.
+    """
+    if sample is None or not tracemalloc.is_tracing():
+        return None
+    try:
+        return _allocation_sites()
+    finally:
+        if sample:
+            tracemalloc.stop()
+
+
+def _record_allocation_stats(
+    func_name: str, blocks: int, sites: Optional[dict[str, int]]
+) -> None:
+    """Record a call's net retained blocks and, if sampled, where they were
+    allocated"""
+    stats = performance_stats[func_name]
+    stats.alloc_calls += 1
+    stats.alloc_blocks += blocks
+    if blocks > stats.max_alloc_blocks:
+        stats.max_alloc_blocks = blocks
+    if sites is None:
+        return
+    stats.alloc_samples += 1
+    totals = stats.alloc_sites
+    for site, count in sites.items():
+        totals[site] = totals.get(site, 0) + count
+
+
+# Separates positional from keyword arguments in call keys
+_KWARGS_MARK = object()
+
+
+def _call_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+    """Hashable key for a call's arguments, like functools.lru_cache builds"""
+    if kwargs:
+        return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+    return args
+
+
+def _call_fingerprint(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Optional[int]:
+    """Hash of a call's arguments, or None if they are unhashable"""
+    try:
+        return hash(_call_key(args, kwargs))
+    except TypeError:
+        return None
+
+
+class _MemoSketch:
+    """Distinct argument sets of a function's calls and what repeats cost"""
+
+    __slots__ = ("distinct", "time", "repeats", "repeat_time")
+
+    def __init__(self) -> None:
+        from .sketches import HyperLogLog
+
+        self.distinct = HyperLogLog()
+        self.time = 0.0
+        self.repeats = 0
+        self.repeat_time = 0.0
+
+    def add(self, fingerprint: int, duration: float) -> tuple[int, float]:
+        """Add a call; returns the change in (repeat calls, repeat time)"""
+        self.distinct.add(fingerprint)
+        self.time += duration
+        calls = self.distinct.total
+        # Every call beyond the distinct argument sets repeats one of them.
+        # Which calls those were is unknown, so they cost the average call.
+        repeats = max(calls - round(self.distinct.estimate()), 0)
+        repeat_time = self.time * repeats / calls
+        change = (repeats - self.repeats, repeat_time - self.repeat_time)
+        self.repeats, self.repeat_time = repeats, repeat_time
+        return change
+
+
+def _record_memo_stats(func_name: str, fingerprint: int, duration: float) -> None:
+    """Count a successful call and update the estimated repeats"""
+    sketch = _memo_sketches.get(func_name)
+    if sketch is None:
+        sketch = _memo_sketches[func_name] = _MemoSketch()
+
+    stats = performance_stats[func_name]
+    stats.memo_calls += 1
+    repeats, repeat_time = sketch.add(fingerprint, duration)
+    stats.repeat_calls += repeats
+    stats.repeat_time += repeat_time
 
 
 def performance_monitor(
-    track_recursion: bool = True, track_memory: bool = True, verbose: bool = True
+    track_recursion: bool = True,
+    track_memory: bool = True,
+    verbose: bool = True,
+    name: Optional[str] = None,
+    key: Optional[Callable[..., Any]] = None,
+    size_of: Optional[Callable[..., float]] = None,
+    advise_memo: bool = False,
+    track_allocations: bool = False,
+    sample_allocations: int = 0,
+    warmup_calls: Optional[int] = 0,
+    labels: Union[None, bool, Callable[..., Optional[Mapping[str, Any]]]] = None,
+    max_labels: int = 100,
+    max_buckets: int = 100,
 ) -> Callable[[F], F]:
+    """Decorate a function to record its timing, memory and call statistics
+
+    Stats are keyed by ``name`` if given, otherwise by the function's
+    ``__name__``.
+
+    ``key`` and ``size_of`` are called with the function's arguments to
+    additionally bucket each call: ``key`` returns a bucket label directly,
+    ``size_of`` returns an input size that is bucketed by powers of two so
+    the report can estimate how time scales with size. At most
+    ``max_buckets`` buckets are kept; calls that would open another one are
+    recorded in an ``"other"`` bucket.
+
+    With ``track_recursion`` (the default), calls the function makes to
+    itself on the same thread are folded into the outermost call, which is
+    the only one counted and timed as a call. Each outermost call also
+    records how deep it recursed and the self time spent at each depth.
+
+    Coroutine functions get an async wrapper that times each call from start
+    to finish, including time spent suspended. Every call is counted (there
+    is no recursion folding) and memory is not tracked, since other tasks
+    run while the coroutine is suspended (so are allocations).
+
+    ``advise_memo`` fingerprints the arguments of each successful call into a
+    fixed-size HyperLogLog sketch of the distinct argument sets. Calls beyond
+    that number are repeats of arguments already seen; ``repeat_time``
+    charges them the average call time (the saving a cache could bring).
+
+    ``track_allocations`` records the net number of memory blocks each call
+    leaves allocated (``sys.getallocatedblocks()`` before and after), which
+    is cheap enough to leave on. Blocks allocated and freed within the call
+    cancel out. ``sample_allocations=N`` additionally traces every Nth call
+    with ``tracemalloc`` and records, per source line, the blocks allocated
+    during the call that are still held when it returns; it implies
+    ``track_allocations``.
+
+    ``warmup_calls=N`` records the first N calls as cold starts, apart from
+    the steady-state timing fields and histograms; ``warmup_calls=None``
+    does so for every call until ``mark_warm()`` is called.
+
+    ``labels=True`` breaks calls down by the labels bound with
+    ``labels.bind_labels()``; a callable is also called with the function's
+    arguments and returns a mapping of extra labels. At most ``max_labels``
+    label combinations get their own row (see the labels module).
+    """
+    if key is not None and size_of is not None:
+        raise ValueError("Pass either key or size_of, not both")
+    if sample_allocations < 0:
+        raise ValueError("sample_allocations must be >= 0")
+    if warmup_calls is not None and warmup_calls < 0:
+        raise ValueError("warmup_calls must be >= 0 or None")
+    if max_labels < 1 or max_buckets < 1:
+        raise ValueError("max_labels and max_buckets must be >= 1")
+    track_allocations = track_allocations or sample_allocations > 0
+    bucketed = key is not None or size_of is not None
+    bucket_kind = "size" if size_of is not None else "key"
+    config = (
+        track_recursion,
+        track_memory,
+        bucketed,
+        advise_memo,
+        track_allocations,
+        sample_allocations,
+    )
+    _wrapper_configs.add(config)
+    if _overhead_accounting and config not in _overhead_ns:
+        from .overhead import _calibrate
+
+        _calibrate(config)
+
+    if track_memory or sample_allocations:
+        _load_memory_backend()
+
+    call_label: Optional[Callable[..., Optional[str]]] = None
+    record_label: Any = None
+    label_extractor = labels if callable(labels) else None
+    if labels is not None and labels is not False:
+        from .labels import _call_label, _record_label_stats
+
+        call_label, record_label = _call_label, _record_label_stats
+
     def decorator(func: F) -> F:
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            func_name = func.__name__
+        func_name = name or func.__name__
+
+        if _is_coroutine_function(func):
+
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                _init_function_stats(func_name, func.__module__)
+
+                bucket = None
+                if bucketed:
+                    bucket, size = _derive_bucket(key, size_of, args, kwargs)
+                label = None
+                if call_label is not None:
+                    label = call_label(label_extractor, args, kwargs)
+                fingerprint = None
+                if advise_memo:
+                    fingerprint = _call_fingerprint(args, kwargs)
+
+                token = _current_coroutine.set(func_name)
+                error: Optional[type] = None
+                coroutine = None
+                start_time = perf_counter_ns()
+                try:
+                    coroutine = func(*args, **kwargs)
+                    _running_coroutines[coroutine] = (
+                        func_name,
+                        start_time,
+                        get_ident(),
+                    )
+                    result = await coroutine
+                    success = True
+                except BaseException as exc:
+                    # Cancellation and KeyboardInterrupt end the call too
+                    success = False
+                    error = type(exc)
+                    raise
+                finally:
+                    elapsed_ns = perf_counter_ns() - start_time
+                    _running_coroutines.pop(coroutine, None)
+                    if _trace_sinks:
+                        _trace_call(func_name, start_time, elapsed_ns, success)
+                    try:
+                        _current_coroutine.reset(token)
+                    except ValueError:
+                        # Finalized from another context (e.g. closed by GC)
+                        pass
+
+                    stats = performance_stats[func_name]
+                    with stats._lock:
+                        duration, cold = _record_function_stats(
+                            func_name,
+                            elapsed_ns,
+                            0.0,
+                            0.0,
+                            success,
+                            error,
+                            warmup_calls,
+                        )
+                        if cold:
+                            # Cold calls stay out of the bucket, label and memo
+                            # tables
+                            bucket = label = fingerprint = None
+                        if bucket is not None:
+                            _record_bucket_stats(
+                                func_name,
+                                bucket,
+                                size,
+                                duration,
+                                bucket_kind,
+                                max_buckets,
+                            )
+                        if label is not None:
+                            record_label(
+                                func_name, label, duration, success, max_labels
+                            )
+                        if fingerprint is not None and success:
+                            _record_memo_stats(func_name, fingerprint, duration)
+                    for listener in _call_listeners:
+                        listener(func_name, duration, success)
+
+                    if verbose:
+                        status = "succeeded" if success else "failed"
+                        call_count = stats.call_count + stats.cold_calls
+                        times_text = "time" if call_count == 1 else "times"
+                        print(
+                            f"Coroutine {func_name} {status} in {duration:.4f} "
+                            f"seconds (called {call_count} {times_text})"
+                        )
+                return result
+
+            async_wrapper.__performance_monitored__ = True  # type: ignore
+            async_wrapper.__performance_name__ = func_name  # type: ignore
+            return async_wrapper  # type: ignore
 
+        # Per-thread recursion state of this function: current depth, and
+        # once it recurses, the deepest level, the number of nested calls,
+        # and per level the time spent in deeper levels and the self time
+        recursion = local()
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
             # Initialize stats for this function
-            _init_function_stats(func_name)
+            _init_function_stats(func_name, func.__module__)
 
             if track_recursion:
                 # Complex recursion tracking logic
-                recursion_key = f"_in_{func_name}"
-                is_recursive_call = getattr(_local, recursion_key, False)
+                depth = getattr(recursion, "depth", 0)
 
-                if not is_recursive_call:
+                if not depth:
                     # Top-level call with recursion tracking
-                    setattr(_local, recursion_key, True)
-                    setattr(_local, f"_recursive_count_{func_name}", 0)
+                    recursion.depth = 1
+                    recursion.nested_calls = 0
 
                     # Memory tracking setup for top-level call
                     start_memory = 0.0
@@ -84,19 +939,66 @@ def performance_monitor(
                         tracemalloc.clear_traces()
                         start_memory = tracemalloc.get_traced_memory()[0]
 
-                    start_time = perf_counter()
+                    bucket = None
+                    if bucketed:
+                        bucket, size = _derive_bucket(key, size_of, args, kwargs)
+                    label = None
+                    if call_label is not None:
+                        label = call_label(label_extractor, args, kwargs)
+                    fingerprint = None
+                    if advise_memo:
+                        fingerprint = _call_fingerprint(args, kwargs)
+                    sample = None
+                    if sample_allocations and (
+                        performance_stats[func_name].alloc_calls % sample_allocations
+                        == 0
+                    ):
+                        sample = _start_allocation_sample()
+                    start_blocks = getallocatedblocks() if track_allocations else 0
+
+                    active_calls = _active_calls()
+                    active_calls.append(func_name)
+                    call_starts = _local.call_starts
+                    frames = None
+                    if _overhead_accounting:
+                        frames = _overhead_frames()
+                        frames.append(0)
+                    error: Optional[type] = None
+                    start_time = perf_counter_ns()
+                    call_starts.append(start_time)
                     try:
                         result = func(*args, **kwargs)
                         success = True
-                    except Exception:
+                    except BaseException as exc:
+                        # Cancellation and KeyboardInterrupt end the call too
                         success = False
+                        error = type(exc)
                         raise
                     finally:
-                        end_time = perf_counter()
-                        duration = end_time - start_time
-                        recursive_count = getattr(
-                            _local, f"_recursive_count_{func_name}", 0
-                        )
+                        elapsed_ns = perf_counter_ns() - start_time
+                        if _trace_sinks:
+                            _trace_call(func_name, start_time, elapsed_ns, success)
+                        active_calls.pop()
+                        call_starts.pop()
+                        recursion.depth = 0
+                        if frames is not None:
+                            elapsed_ns = _settle_overhead(
+                                func_name, config, frames, elapsed_ns
+                            )
+                        allocation = None
+                        if track_allocations:
+                            allocation = (
+                                getallocatedblocks() - start_blocks,
+                                _finish_allocation_sample(sample),
+                            )
+                        recursive_count = recursion.nested_calls
+                        if recursive_count:
+                            level_ns = recursion.level_ns
+                            level_ns[0] += max(elapsed_ns - recursion.child_ns[0], 0)
+                            max_depth = recursion.max_depth
+                        else:
+                            level_ns = [elapsed_ns]
+                            max_depth = 1
 
                         # Memory calculations
                         memory_used = 0.0
@@ -112,10 +1014,43 @@ def performance_monitor(
                             memory_peak = peak_memory / 1024 / 1024  # MB
 
                         # Record stats and count this top-level call
-                        _record_function_stats(
-                            func_name, duration, memory_used, memory_peak, success
-                        )
-                        performance_stats[func_name]["call_count"] += 1
+                        stats = performance_stats[func_name]
+                        with stats._lock:
+                            if allocation is not None:
+                                _record_allocation_stats(func_name, *allocation)
+                            _record_recursion_stats(
+                                func_name, max_depth, level_ns, recursive_count
+                            )
+                            duration, cold = _record_function_stats(
+                                func_name,
+                                elapsed_ns,
+                                memory_used,
+                                memory_peak,
+                                success,
+                                error,
+                                warmup_calls,
+                            )
+                            if cold:
+                                # Cold calls stay out of the bucket, label and
+                                # memo tables
+                                bucket = label = fingerprint = None
+                            if bucket is not None:
+                                _record_bucket_stats(
+                                    func_name,
+                                    bucket,
+                                    size,
+                                    duration,
+                                    bucket_kind,
+                                    max_buckets,
+                                )
+                            if label is not None:
+                                record_label(
+                                    func_name, label, duration, success, max_labels
+                                )
+                            if fingerprint is not None and success:
+                                _record_memo_stats(func_name, fingerprint, duration)
+                        for listener in _call_listeners:
+                            listener(func_name, duration, success)
 
                         # Print verbose output if enabled
                         if verbose:
@@ -127,26 +1062,38 @@ def performance_monitor(
                                 )
 
                             status = "succeeded" if success else "failed"
-                            times_text = (
-                                "time"
-                                if performance_stats[func_name]["call_count"] == 1
-                                else "times"
-                            )
+                            call_count = stats.call_count + stats.cold_calls
+                            times_text = "time" if call_count == 1 else "times"
                             recursive_info = f", recursive calls: {recursive_count}"
                             print(
                                 f"Function {func_name} {status} in {duration:.4f} "
-                                f"seconds{memory_info} (called "
-                                f"{performance_stats[func_name]['call_count']} "
+                                f"seconds{memory_info} (called {call_count} "
                                 f"{times_text}{recursive_info})"
                             )
-
-                        setattr(_local, recursion_key, False)
                     return result
                 else:
-                    # Recursive call - no timing or memory tracking
-                    current_count = getattr(_local, f"_recursive_count_{func_name}", 0)
-                    setattr(_local, f"_recursive_count_{func_name}", current_count + 1)
-                    return func(*args, **kwargs)
+                    # Recursive call - only timed to split self time by depth
+                    if not recursion.nested_calls:
+                        recursion.max_depth = 1
+                        recursion.child_ns = [0]
+                        recursion.level_ns = [0]
+                    recursion.nested_calls += 1
+                    recursion.depth = depth + 1
+                    if depth >= recursion.max_depth:
+                        recursion.max_depth = depth + 1
+                    child_ns = recursion.child_ns
+                    child_ns.append(0)
+                    level_ns = recursion.level_ns
+                    if len(level_ns) == depth:
+                        level_ns.append(0)
+                    start_time = perf_counter_ns()
+                    try:
+                        return func(*args, **kwargs)
+                    finally:
+                        elapsed_ns = perf_counter_ns() - start_time
+                        recursion.depth = depth
+                        level_ns[depth] += elapsed_ns - child_ns.pop()
+                        child_ns[-1] += elapsed_ns
             else:
                 # Simple mode - time and track memory for every call
                 # Memory tracking setup
@@ -157,16 +1104,56 @@ def performance_monitor(
                     tracemalloc.clear_traces()
                     start_memory = tracemalloc.get_traced_memory()[0]
 
-                start_time = perf_counter()
+                bucket = None
+                if bucketed:
+                    bucket, size = _derive_bucket(key, size_of, args, kwargs)
+                label = None
+                if call_label is not None:
+                    label = call_label(label_extractor, args, kwargs)
+                fingerprint = None
+                if advise_memo:
+                    fingerprint = _call_fingerprint(args, kwargs)
+                sample = None
+                if sample_allocations and (
+                    performance_stats[func_name].alloc_calls % sample_allocations == 0
+                ):
+                    sample = _start_allocation_sample()
+                start_blocks = getallocatedblocks() if track_allocations else 0
+
+                active_calls = _active_calls()
+                active_calls.append(func_name)
+                call_starts = _local.call_starts
+                frames = None
+                if _overhead_accounting:
+                    frames = _overhead_frames()
+                    frames.append(0)
+                error: Optional[type] = None
+                start_time = perf_counter_ns()
+                call_starts.append(start_time)
                 try:
                     result = func(*args, **kwargs)
                     success = True
-                except Exception:
+                except BaseException as exc:
+                    # Cancellation and KeyboardInterrupt end the call too
                     success = False
+                    error = type(exc)
                     raise
                 finally:
-                    end_time = perf_counter()
-                    duration = end_time - start_time
+                    elapsed_ns = perf_counter_ns() - start_time
+                    if _trace_sinks:
+                        _trace_call(func_name, start_time, elapsed_ns, success)
+                    active_calls.pop()
+                    call_starts.pop()
+                    if frames is not None:
+                        elapsed_ns = _settle_overhead(
+                            func_name, config, frames, elapsed_ns
+                        )
+                    allocation = None
+                    if track_allocations:
+                        allocation = (
+                            getallocatedblocks() - start_blocks,
+                            _finish_allocation_sample(sample),
+                        )
 
                     # Memory calculations
                     memory_used = 0.0
@@ -179,10 +1166,40 @@ def performance_monitor(
                         memory_peak = peak_memory / 1024 / 1024  # MB
 
                     # Record stats and count this call
-                    _record_function_stats(
-                        func_name, duration, memory_used, memory_peak, success
-                    )
-                    performance_stats[func_name]["call_count"] += 1
+                    stats = performance_stats[func_name]
+                    with stats._lock:
+                        if allocation is not None:
+                            _record_allocation_stats(func_name, *allocation)
+                        duration, cold = _record_function_stats(
+                            func_name,
+                            elapsed_ns,
+                            memory_used,
+                            memory_peak,
+                            success,
+                            error,
+                            warmup_calls,
+                        )
+                        if cold:
+                            # Cold calls stay out of the bucket, label and memo
+                            # tables
+                            bucket = label = fingerprint = None
+                        if bucket is not None:
+                            _record_bucket_stats(
+                                func_name,
+                                bucket,
+                                size,
+                                duration,
+                                bucket_kind,
+                                max_buckets,
+                            )
+                        if label is not None:
+                            record_label(
+                                func_name, label, duration, success, max_labels
+                            )
+                        if fingerprint is not None and success:
+                            _record_memo_stats(func_name, fingerprint, duration)
+                    for listener in _call_listeners:
+                        listener(func_name, duration, success)
 
                     # Print verbose output if enabled
                     if verbose:
@@ -194,144 +1211,115 @@ def performance_monitor(
                             )
 
                         status = "succeeded" if success else "failed"
-                        times_text = (
-                            "time"
-                            if performance_stats[func_name]["call_count"] == 1
-                            else "times"
-                        )
+                        call_count = stats.call_count + stats.cold_calls
+                        times_text = "time" if call_count == 1 else "times"
                         print(
                             f"Function {func_name} {status} in {duration:.4f} "
-                            f"seconds{memory_info} (called "
-                            f"{performance_stats[func_name]['call_count']} "
+                            f"seconds{memory_info} (called {call_count} "
                             f"{times_text})"
                         )
 
                 return result
 
+        wrapper.__performance_monitored__ = True  # type: ignore
+        wrapper.__performance_name__ = func_name  # type: ignore
         return wrapper  # type: ignore
 
     return decorator
 
 
-def show_performance_report() -> None:
-    """Display a comprehensive performance report for all monitored functions"""
-    if not performance_stats:
-        print("No performance data collected yet.")
-        return
-
-    print("\n" + "=" * 80)
-    print("PERFORMANCE REPORT")
-    print("=" * 80)
+def show_performance_report(
+    sort_by: str = "total_time",
+    top: Optional[int] = 20,
+    pattern: Optional[str] = None,
+    module: Optional[str] = None,
+    output: str = "text",
+) -> None:
+    """Display a performance report for the monitored functions
 
-    for func_name, stats in performance_stats.items():
-        print(f"\nFunction: {func_name}")
-        print("-" * 40)
+    By default this prints a compact table of the 20 functions with the
+    highest total time. See ``report.format_performance_report`` for the
+    sorting, filtering and output options.
+    """
+    from .report import format_performance_report
 
-        # Call statistics
-        total_calls = stats["call_count"]
-        success_rate = (
-            (stats["success_count"] / total_calls * 100) if total_calls > 0 else 0
-        )
-        print(f"Total Calls: {total_calls}")
-        print(
-            f"Success Rate: {success_rate:.1f}% "
-            f"({stats['success_count']} succeeded, "
-            f"{stats['failure_count']} failed)"
+    print(
+        format_performance_report(
+            sort_by=sort_by, top=top, pattern=pattern, module=module, output=output
         )
-
-        # Timing statistics
-        if stats["times"]:
-            avg_time = stats["total_time"] / len(stats["times"])
-            print("Timing:")
-            print(f"  Total Time: {stats['total_time']:.4f} seconds")
-            print(f"  Average Time: {avg_time:.4f} seconds")
-            print(f"  Min Time: {stats['min_time']:.4f} seconds")
-            print(f"  Max Time: {stats['max_time']:.4f} seconds")
-
-        # Memory statistics
-        if stats["memory_peaks"]:
-            avg_peak = sum(stats["memory_peaks"]) / len(stats["memory_peaks"])
-            print("Memory:")
-            print(f"  Total Memory Used: {stats['total_memory_used']:.2f} MB")
-            print(f"  Average Peak: {avg_peak:.2f} MB")
-            print(f"  Max Peak: {stats['max_memory_peak']:.2f} MB")
+    )
 
 
 def reset_performance_stats() -> None:
     """Clear all performance statistics"""
+    global _all_warm
     performance_stats.clear()
+    _all_warm = False
+    _memo_sketches.clear()
+    _label_tables.clear()
     print("Performance statistics reset.")
 
 
-def get_performance_stats() -> dict[str, dict[str, Any]]:
-    """Return raw performance statistics for custom processing"""
-    return performance_stats.copy()
-
-
-# Test functions
-@performance_monitor(track_recursion=False, track_memory=True, verbose=True)
-def simple_function():
-    sleep(0.1)
-    return "done"
+def _copy_row(row: Mapping[str, Any]) -> dict[str, Any]:
+    """A table row that shares no mutable lists with ``row``"""
+    return {
+        field: list(value) if isinstance(value, (list, tuple)) else value
+        for field, value in row.items()
+    }
 
 
-@performance_monitor(track_memory=True, verbose=True)
-def memory_heavy_function():
-    big_list = [i for i in range(1000000)]
-    return len(big_list)
-
-
-@performance_monitor(track_memory=True, verbose=True)
-def recursive_factorial(n):
-    if n <= 1:
-        return 1
-    return n * recursive_factorial(n - 1)
-
-
-# Global variable to test memory retention
-memory_keeper = []
-
-
-@performance_monitor(track_memory=True, verbose=True)
-def function_that_keeps_memory():
-    big_list = [i for i in range(500000)]
-    memory_keeper.append(big_list)
-    return len(big_list)
-
-
-@performance_monitor(track_memory=True, verbose=True)
-def function_that_releases_memory():
-    big_list = [i for i in range(500000)]
-    return len(big_list)
-
-
-# Example usage
-if __name__ == "__main__":
-    print("Running performance tests...")
-
-    # Test each function multiple times
-    simple_function()
-    simple_function()
+def _merge_values(field: str, current: Any, incoming: Any) -> Any:
+    """Combine one stats field from two sources of the same function"""
+    if field.startswith("min_"):
+        return min(current, incoming)
+    if field.startswith("max_"):
+        return max(current, incoming)
+    if isinstance(current, dict):
+        merged = dict(current)
+        for key, value in incoming.items():
+            if key not in merged:
+                merged[key] = _copy_row(value) if isinstance(value, dict) else value
+            elif isinstance(value, dict):
+                merged[key] = {
+                    sub: _merge_values(sub, merged[key][sub], value[sub])
+                    for sub in merged[key]
+                }
+            else:
+                merged[key] = merged[key] + value
+        return merged
+    if isinstance(current, list) and (
+        field == "gc_collections" or field.endswith("latency")
+    ):
+        return [a + b for a, b in zip(current, incoming)]
+    if isinstance(current, list):
+        return current + incoming
+    if isinstance(current, (int, float)) and not isinstance(current, bool):
+        return current + incoming
+    return current or incoming
 
-    memory_heavy_function()
-    memory_heavy_function()
 
-    recursive_factorial(5)
-    recursive_factorial(3)
+def merge_performance_stats(other: Mapping[str, Mapping[str, Any]]) -> None:
+    """Merge statistics collected elsewhere (e.g. a worker process) into ours
 
-    function_that_keeps_memory()
-    function_that_releases_memory()
-    function_that_keeps_memory()
+    Counters and totals are added, ``min_*``/``max_*`` fields combined,
+    and per-call sample lists concatenated. Entries may be ``FunctionStats``
+    records or plain dicts with the same keys; unknown keys are ignored.
+    """
+    for func_name, incoming in other.items():
+        _init_function_stats(func_name, incoming.get("module", ""))
+        entry = performance_stats[func_name]
+        with entry._lock:
+            entry._merge(incoming)
+            if incoming.get("labels"):
+                from .labels import _enforce_label_cap
 
-    # Show the comprehensive report
-    show_performance_report()
+                _enforce_label_cap(func_name)
 
-    print("\n" + "=" * 50)
-    print("Testing report functions...")
 
-    # Test reset functionality
-    print("\nResetting stats...")
-    reset_performance_stats()
+def get_performance_stats() -> dict[str, dict[str, Any]]:
+    """Return raw performance statistics for custom processing
 
-    # Verify reset worked
-    show_performance_report()
+    Each function's entry is a plain dict copy of its ``FunctionStats``
+    record (the per-call sample lists are shared, not copied).
+    """
+    return {name: dict(entry) for name, entry in list(performance_stats.items())}
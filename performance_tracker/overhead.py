@@ -0,0 +1,193 @@
+"""Calibrate the cost of the monitoring wrappers and account for it
+
+Every monitored call costs a little more than the function itself, and
+when monitored functions nest, that cost is measured as part of the
+enclosing call. ``enable_overhead_accounting()`` times each wrapper
+configuration in use against a bare call of a no-op function, then keeps
+track of how much of every call's measured time went to the wrappers of the
+monitored calls nested in it (``nested_overhead``) and how much its own
+wrapper added to its callers (``own_overhead``). With ``subtract=True``
+the nested overhead is also taken out of the recorded durations.
+
+Only synchronous functions decorated with ``performance_monitor`` take
+part; recursive calls folded into their outermost call, coroutines and
+spans are not accounted for.
+"""
+
+from contextlib import contextmanager
+from time import perf_counter_ns
+from typing import Any, Callable, Iterator
+
+from . import monitor
+from .monitor import _memo_sketches, performance_monitor, performance_stats
+
+# Stats key the calibration function records under while it is measured
+_CALIBRATION_NAME = "performance_tracker.overhead.calibration"
+
+
+def _noop() -> None:
+    pass
+
+
+class _SkipCalibration:
+    """Pass a call listener or trace sink every call but the calibration's
+
+    Compares equal to the hook it wraps, so code that checks for or removes
+    its hook while a calibration runs still finds it.
+    """
+
+    __slots__ = ("hook",)
+
+    def __init__(self, hook: Callable[..., None]) -> None:
+        self.hook = hook
+
+    def __call__(self, func_name: str, *args: Any) -> None:
+        if func_name != _CALIBRATION_NAME:
+            self.hook(func_name, *args)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, _SkipCalibration):
+            other = other.hook
+        return bool(self.hook == other)
+
+    def __hash__(self) -> int:
+        return hash(self.hook)
+
+
+@contextmanager
+def _hooks_skip_calibration() -> Iterator[None]:
+    """Keep the calibration calls away from call listeners and trace sinks
+
+    The hooks stay in place, so calls made by other threads meanwhile are
+    still delivered and the calibrated cost includes dispatching to them.
+    """
+    hooks = (monitor._call_listeners, monitor._trace_sinks)
+    for hook_list in hooks:
+        hook_list[:] = [_SkipCalibration(hook) for hook in hook_list]
+    try:
+        yield
+    finally:
+        for hook_list in hooks:
+            hook_list[:] = [
+                hook.hook if isinstance(hook, _SkipCalibration) else hook
+                for hook in hook_list
+            ]
+
+
+def _bucket_key(*args: Any, **kwargs: Any) -> int:
+    return 0
+
+
+def _options(config: tuple[Any, ...]) -> dict[str, Any]:
+    """performance_monitor options for a wrapper configuration key"""
+    (
+        track_recursion,
+        track_memory,
+        bucketed,
+        advise_memo,
+        track_allocations,
+        sample_allocations,
+    ) = config
+    return {
+        "track_recursion": track_recursion,
+        "track_memory": track_memory,
+        "key": _bucket_key if bucketed else None,
+        "advise_memo": advise_memo,
+        "track_allocations": track_allocations,
+        "sample_allocations": sample_allocations,
+    }
+
+
+def _time_loop(func: Any, iterations: int) -> int:
+    start = perf_counter_ns()
+    for _ in range(iterations):
+        func()
+    return perf_counter_ns() - start
+
+
+def _calibrate(
+    config: tuple[Any, ...], iterations: int = 1000, repeats: int = 5
+) -> int:
+    """Measure and store the per-call cost in ns of one wrapper configuration
+
+    The best of ``repeats`` loops is kept for both the wrapped and the bare
+    no-op, which filters out most scheduling and GC noise.
+    """
+    # Decorating the calibration function must not calibrate it again
+    monitor._overhead_ns.setdefault(config, 0)
+    wrapped = performance_monitor(
+        verbose=False, name=_CALIBRATION_NAME, **_options(config)
+    )(_noop)
+    bare = wrapped_best = float("inf")
+    try:
+        with _hooks_skip_calibration():
+            for _ in range(repeats):
+                bare = min(bare, _time_loop(_noop, iterations))
+                wrapped_best = min(wrapped_best, _time_loop(wrapped, iterations))
+    finally:
+        performance_stats.pop(_CALIBRATION_NAME, None)
+        _memo_sketches.pop(_CALIBRATION_NAME, None)
+    overhead = max(round((wrapped_best - bare) / iterations), 0)
+    monitor._overhead_ns[config] = overhead
+    return overhead
+
+
+def calibrate_overhead(
+    iterations: int = 1000, repeats: int = 5, **monitor_options: Any
+) -> float:
+    """Seconds a call through a ``performance_monitor`` wrapper with these
+    options adds to its caller
+
+    ``verbose`` is always off while measuring. The figure includes the
+    bookkeeping of overhead accounting if it is enabled.
+    """
+    track_allocations = monitor_options.get("track_allocations", False)
+    sample_allocations = monitor_options.get("sample_allocations", 0)
+    config = (
+        monitor_options.get("track_recursion", True),
+        monitor_options.get("track_memory", True),
+        monitor_options.get("key") is not None
+        or monitor_options.get("size_of") is not None,
+        monitor_options.get("advise_memo", False),
+        track_allocations or sample_allocations > 0,
+        sample_allocations,
+    )
+    return _calibrate(config, iterations, repeats) / 1e9
+
+
+def enable_overhead_accounting(subtract: bool = False) -> dict[str, float]:
+    """Calibrate every wrapper configuration in use and start accounting
+
+    Configurations decorated later are calibrated when they are first
+    created. With ``subtract`` the overhead of nested monitored calls is
+    removed from the durations recorded for the calls enclosing them.
+    Returns the calibrated per-call overhead in seconds, keyed by a short
+    description of each configuration.
+    """
+    monitor._subtract_overhead = subtract
+    monitor._overhead_accounting = True
+    return {
+        _describe(config): _calibrate(config) / 1e9
+        for config in sorted(monitor._wrapper_configs, key=repr)
+    }
+
+
+def disable_overhead_accounting() -> None:
+    """Stop accounting for overhead; calibrations are kept"""
+    monitor._overhead_accounting = False
+    monitor._subtract_overhead = False
+
+
+def is_overhead_accounting_enabled() -> bool:
+    return monitor._overhead_accounting
+
+
+def _describe(config: tuple[Any, ...]) -> str:
+    options = _options(config)
+    options["key"] = options["key"] is not None
+    enabled = [
+        name if value is True else f"{name}={value}"
+        for name, value in options.items()
+        if value
+    ]
+    return ", ".join(enabled) if enabled else "plain"
@@ -0,0 +1,221 @@
+"""Statistical sampling profiler
+
+A background thread takes a snapshot of every thread's stack
+(``sys._current_frames()``) at a fixed interval. Stacks are merged into a
+trie that counts samples per distinct call path, and each sample is also
+charged to the innermost ``performance_monitor``-decorated function running
+on that thread, with a count per source line.
+
+The cost is set by the interval and the number of threads, not by how
+often the profiled code runs. Sampling measures wall-clock time, so threads
+blocked on I/O or locks are sampled too.
+"""
+
+import os
+import sys
+import threading
+from typing import Any, Optional
+
+from .monitor import _thread_calls
+
+UNATTRIBUTED = "(unattributed)"
+
+
+class _Node:
+    __slots__ = ("children", "count")
+
+    def __init__(self) -> None:
+        self.children: dict[str, "_Node"] = {}
+        # Samples whose stack ends at this node
+        self.count = 0
+
+
+def _frame_label(code: Any) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Sample all thread stacks every ``interval`` seconds
+
+    Args:
+        interval: Seconds between samples
+        max_depth: Innermost frames kept per stack; deeper frames are
+            dropped from the root end
+        max_nodes: Cap on distinct trie nodes; once reached, new call
+            paths are counted at their longest known prefix
+    """
+
+    def __init__(
+        self, interval: float = 0.01, max_depth: int = 64, max_nodes: int = 100_000
+    ) -> None:
+        if interval <= 0 or max_depth < 1 or max_nodes < 1:
+            raise ValueError("interval, max_depth and max_nodes must be positive")
+        self.interval = interval
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.samples = 0
+        self._root = _Node()
+        self._nodes = 0
+        # monitored function -> {(filename, line, code name): samples}
+        self._lines: dict[str, dict[tuple[str, int, str], int]] = {}
+        self._labels: dict[Any, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> "SamplingProfiler":
+        if self._thread is not None:
+            raise RuntimeError("SamplingProfiler is already running")
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="performance-tracker-profiler", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(exclude=own_id)
+
+    def sample(self, exclude: Optional[int] = None) -> None:
+        """Take one sample of every thread except ``exclude``"""
+        frames = sys._current_frames()
+        with self._lock:
+            for thread_id, frame in frames.items():
+                if thread_id != exclude:
+                    self._add(thread_id, frame)
+        del frames
+
+    def _add(self, thread_id: int, frame: Any) -> None:
+        self.samples += 1
+        leaf = frame
+        labels = []
+        while frame is not None and len(labels) < self.max_depth:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = _frame_label(code)
+            labels.append(label)
+            frame = frame.f_back
+
+        node = self._root
+        for label in reversed(labels):
+            child = node.children.get(label)
+            if child is None:
+                if self._nodes >= self.max_nodes:
+                    break
+                child = node.children[label] = _Node()
+                self._nodes += 1
+            node = child
+        node.count += 1
+
+        calls = _thread_calls.get(thread_id)
+        try:
+            owner = calls[-1] if calls else UNATTRIBUTED
+        except IndexError:  # the call finished while we were sampling
+            owner = UNATTRIBUTED
+        code = leaf.f_code
+        line_key = (code.co_filename, leaf.f_lineno, code.co_name)
+        lines = self._lines.get(owner)
+        if lines is None:
+            lines = self._lines[owner] = {}
+        lines[line_key] = lines.get(line_key, 0) + 1
+
+    def folded(self) -> str:
+        """Stacks in folded format (``root;caller;callee count`` per line),
+        as read by flamegraph.pl, speedscope and similar tools"""
+        with self._lock:
+            lines: list[str] = []
+            stack: list[tuple[_Node, list[str]]] = [(self._root, [])]
+            while stack:
+                node, path = stack.pop()
+                if node.count and path:
+                    lines.append(f"{';'.join(path)} {node.count}")
+                for label, child in node.children.items():
+                    stack.append((child, path + [label]))
+        return "\n".join(sorted(lines))
+
+    def write_folded(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(self.folded() + "\n")
+
+    def function_samples(self) -> dict[str, int]:
+        """Samples per monitored function (``UNATTRIBUTED`` for the rest)"""
+        with self._lock:
+            return {owner: sum(lines.values()) for owner, lines in self._lines.items()}
+
+    def hot_lines(
+        self, function: Optional[str] = None, limit: int = 10
+    ) -> list[dict[str, Any]]:
+        """The most sampled source lines, overall or within one function"""
+        with self._lock:
+            if function is not None:
+                sources = [self._lines.get(function, {})]
+            else:
+                sources = list(self._lines.values())
+            counts: dict[tuple[str, int, str], int] = {}
+            for lines in sources:
+                for key, count in lines.items():
+                    counts[key] = counts.get(key, 0) + count
+        total = sum(counts.values())
+        top = sorted(counts.items(), key=lambda item: -item[1])[:limit]
+        return [
+            {
+                "filename": filename,
+                "line": line,
+                "function": name,
+                "samples": count,
+                "share": count / total if total else 0.0,
+            }
+            for (filename, line, name), count in top
+        ]
+
+    def report(self, limit: int = 5) -> str:
+        """Text report: samples per monitored function and their hot lines"""
+        per_function = self.function_samples()
+        total = sum(per_function.values())
+        lines = [
+            "=" * 80,
+            f"SAMPLING PROFILE ({total} samples, "
+            f"{self.interval * 1000:.1f} ms interval)",
+            "=" * 80,
+        ]
+        for owner, count in sorted(per_function.items(), key=lambda item: -item[1]):
+            lines.append(f"\nFunction: {owner} ({count} samples, {count / total:.1%})")
+            for hot in self.hot_lines(owner, limit):
+                lines.append(
+                    f"  {os.path.basename(hot['filename'])}:{hot['line']} "
+                    f"in {hot['function']}: {hot['samples']} ({hot['share']:.1%})"
+                )
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.samples = 0
+            self._root = _Node()
+            self._nodes = 0
+            self._lines.clear()
+
+
+def start_profiler(interval: float = 0.01, **options: Any) -> SamplingProfiler:
+    """Start a ``SamplingProfiler`` and return it; call ``stop()`` when done"""
+    return SamplingProfiler(interval, **options).start()
@@ -1,22 +0,0 @@
-"""Utility functions for performance monitoring"""
-
-
-def format_memory(bytes_value):
-    """Convert bytes to human readable format"""
-    for unit in ["B", "KB", "MB", "GB"]:
-        if bytes_value < 1024.0:
-            return f"{bytes_value:.2f} {unit}"
-        bytes_value /= 1024.0
-    return f"{bytes_value:.2f} TB"
-
-
-def format_duration(seconds):
-    """Convert seconds to human readable format"""
-    if seconds < 1e-6:
-        return f"{seconds * 1e9:.2f} ns"
-    elif seconds < 1e-3:
-        return f"{seconds * 1e6:.2f} μs"
-    elif seconds < 1:
-        return f"{seconds * 1e3:.2f} ms"
-    else:
-        return f"{seconds:.4f} s"
@@ -0,0 +1,623 @@
+"""Sorted, filtered and multi-format performance reports
+
+Reports only build rows for the functions they will actually show: the
+candidates are filtered by name and module, the top N are picked with a
+heap-based partial selection, and only those are aggregated.
+"""
+
+import heapq
+import json
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Optional
+
+from .analysis import columnar_stats, estimate_complexity
+from .histogram import LatencyHistogram
+from .monitor import OTHER_BUCKET
+from .snapshots import StatsSnapshot
+
+
+def _ratio(part: int, whole: int) -> Optional[float]:
+    """part / whole, or None when nothing was measured"""
+    return part / whole if whole else None
+
+
+def _error_rate(stats: dict[str, Any]) -> float:
+    calls = stats["call_count"]
+    return stats["failure_count"] / calls if calls else 0.0
+
+
+def _outcome_latency(
+    stats: dict[str, Any], outcome: str
+) -> tuple[Optional[float], Optional[float]]:
+    """(average, p99) of the successful or failed calls, if there were any"""
+    count = stats[f"{outcome}_count"]
+    counts = stats.get(f"{outcome}_latency")
+    if not count or not counts or not any(counts):
+        return None, None
+    total = (
+        stats.get("failure_time", 0.0) if outcome == "failure" else stats["total_time"]
+    )
+    histogram = LatencyHistogram.from_counts(
+        counts, total, stats["min_time"], stats["max_time"]
+    )
+    return total / count, histogram.percentile(99)
+
+
+def _failure_table(stats: dict[str, Any]) -> list[dict[str, Any]]:
+    """Failures per exception type, most frequent first"""
+    calls = stats["call_count"]
+    return [
+        {
+            "exception": exception,
+            "count": failure["count"],
+            "error_rate": failure["count"] / calls if calls else 0.0,
+            "avg_time": failure["total_time"] / failure["count"],
+            "min_time": failure["min_time"],
+            "max_time": failure["max_time"],
+        }
+        for exception, failure in sorted(
+            stats.get("failures", {}).items(), key=lambda item: -item[1]["count"]
+        )
+    ]
+
+
+def _top_allocation_sites(
+    stats: dict[str, Any], limit: int = 5
+) -> list[tuple[str, float]]:
+    """Lines retaining the most blocks per sampled call, as (site, blocks)"""
+    samples = stats.get("alloc_samples", 0)
+    if not samples:
+        return []
+    sites = stats["alloc_sites"]
+    top = heapq.nlargest(limit, sites, key=sites.__getitem__)
+    return [(site, sites[site] / samples) for site in top]
+
+
+def _label_table(stats: dict[str, Any], limit: int = 10) -> list[dict[str, Any]]:
+    """Busiest label rows, most calls first, with ``"other"`` last"""
+    table = stats.get("labels") or {}
+    ranked = sorted(
+        (key for key in table if key != "other"), key=lambda key: -table[key]["calls"]
+    )[:limit]
+    if "other" in table:
+        ranked.append("other")
+    rows = []
+    for key in ranked:
+        row = table[key]
+        calls = row["calls"]
+        histogram = LatencyHistogram.from_counts(
+            row["latency"], row["total_time"], row["min_time"], row["max_time"]
+        )
+        rows.append(
+            {
+                "labels": key,
+                "calls": calls,
+                "failures": row["failures"],
+                "avg_time": row["total_time"] / calls if calls else 0.0,
+                "p99_time": histogram.percentile(99) if calls else 0.0,
+                "max_time": row["max_time"],
+                "count_error": row["error"],
+            }
+        )
+    return rows
+
+
+def _time_spent(stats: dict[str, Any]) -> float:
+    """Time spent in successful and failed calls together"""
+    return stats["total_time"] + stats.get("failure_time", 0.0)
+
+
+def _overhead_ratio(stats: dict[str, Any]) -> Optional[float]:
+    """Share of the measured time spent in nested monitoring wrappers"""
+    if not stats.get("own_overhead") and not stats.get("nested_overhead"):
+        return None
+    # With subtract=True the overhead is already out of the recorded time;
+    # compare against the time as measured
+    total = _time_spent(stats) + stats.get("subtracted_overhead", 0.0)
+    return stats["nested_overhead"] / total if total > 0 else 0.0
+
+
+def _lock_wait_ratio(stats: dict[str, Any]) -> Optional[float]:
+    """Share of the recorded time spent waiting for monitored locks"""
+    if not stats.get("lock_waits"):
+        return None
+    total = _time_spent(stats)
+    return min(stats["lock_wait_time"] / total, 1.0) if total > 0 else 0.0
+
+
+# Sort keys that can be read straight from a stats entry
+_SCALAR_SORT_KEYS: dict[str, Callable[[dict[str, Any]], float]] = {
+    "total_time": lambda stats: stats["total_time"],
+    "avg_time": lambda stats: (
+        stats["total_time"] / stats["success_count"]
+        if stats.get("success_count")
+        else 0.0
+    ),
+    "call_count": lambda stats: stats["call_count"],
+    "error_rate": _error_rate,
+    "memory": lambda stats: stats["max_memory_peak"],
+}
+
+SORT_KEYS = tuple(_SCALAR_SORT_KEYS) + ("p99",)
+OUTPUT_FORMATS = ("text", "json", "markdown", "detailed")
+
+
+def _module_matches(func_module: str, module: str) -> bool:
+    """Match a module exactly, as a package prefix, or as a glob pattern"""
+    return (
+        func_module == module
+        or func_module.startswith(module + ".")
+        or fnmatchcase(func_module, module)
+    )
+
+
+def select_functions(
+    stats: dict[str, dict[str, Any]],
+    sort_by: str = "total_time",
+    top: Optional[int] = 20,
+    pattern: Optional[str] = None,
+    module: Optional[str] = None,
+) -> list[str]:
+    """Return the names of the functions to report, best first
+
+    ``pattern`` is a glob matched against function names and ``module``
+    matches the defining module or any package prefix of it. When ``top``
+    is set, only that many names are selected with ``heapq.nlargest``
+    instead of sorting every candidate.
+    """
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"sort_by must be one of {', '.join(SORT_KEYS)}")
+    return _rank(stats, _matching_functions(stats, pattern, module), sort_by, top)
+
+
+def _matching_functions(
+    stats: dict[str, dict[str, Any]], pattern: Optional[str], module: Optional[str]
+) -> list[str]:
+    return [
+        name
+        for name, entry in stats.items()
+        if (pattern is None or fnmatchcase(name, pattern))
+        and (module is None or _module_matches(entry.get("module", ""), module))
+    ]
+
+
+def _rank(
+    stats: dict[str, dict[str, Any]],
+    names: list[str],
+    sort_by: str,
+    top: Optional[int],
+) -> list[str]:
+    """The ``top`` of ``names`` by ``sort_by``, best first"""
+    if sort_by == "p99":
+        columns = columnar_stats({name: stats[name] for name in names})
+        p99 = columns.percentile(99)
+        values = {name: p99[i] for i, name in enumerate(columns.names)}
+        key: Callable[[str], Any] = values.__getitem__
+    else:
+        scalar_key = _SCALAR_SORT_KEYS[sort_by]
+
+        def key(name: str) -> Any:
+            return scalar_key(stats[name])
+
+    if top is None:
+        return sorted(names, key=key, reverse=True)
+    return heapq.nlargest(top, names, key=key)
+
+
+def build_report_rows(
+    stats: dict[str, dict[str, Any]], names: list[str]
+) -> list[dict[str, Any]]:
+    """Summarize the selected functions, in order, as plain dict rows"""
+    columns = columnar_stats({name: stats[name] for name in names})
+    mean_times = columns.mean("times")
+    mean_peaks = columns.mean("memory_peaks")
+    p50 = columns.percentile(50)
+    p99 = columns.percentile(99)
+
+    rows = []
+    for i, name in enumerate(names):
+        entry = stats[name]
+        calls = entry["call_count"]
+        success_avg, success_p99 = _outcome_latency(entry, "success")
+        failure_avg, failure_p99 = _outcome_latency(entry, "failure")
+        rows.append(
+            {
+                "name": name,
+                "module": entry.get("module", ""),
+                "call_count": calls,
+                "success_count": entry["success_count"],
+                "failure_count": entry["failure_count"],
+                "error_rate": _error_rate(entry),
+                "success_avg_time": success_avg,
+                "success_p99_time": success_p99,
+                "failure_avg_time": failure_avg,
+                "failure_p99_time": failure_p99,
+                "failures": _failure_table(entry),
+                "total_time": entry["total_time"],
+                "avg_time": float(mean_times[i]),
+                "min_time": entry["min_time"] if calls else 0.0,
+                "max_time": entry["max_time"],
+                "p50_time": float(p50[i]),
+                "p99_time": float(p99[i]),
+                "total_memory_used": entry["total_memory_used"],
+                "avg_memory_peak": float(mean_peaks[i]),
+                "max_memory_peak": entry["max_memory_peak"],
+                "gc_pause_time": entry.get("gc_pause_time", 0.0),
+                "complexity": estimate_complexity(entry.get("buckets", {})),
+                "repeat_ratio": _ratio(
+                    entry.get("repeat_calls", 0), entry.get("memo_calls", 0)
+                ),
+                "repeat_time": entry.get("repeat_time", 0.0),
+                "cache_hit_rate": _ratio(
+                    entry.get("cache_hits", 0),
+                    entry.get("cache_hits", 0) + entry.get("cache_misses", 0),
+                ),
+                "cache_time_saved": entry.get("cache_time_saved", 0.0),
+                "net_blocks_per_call": (
+                    entry["alloc_blocks"] / entry["alloc_calls"]
+                    if entry.get("alloc_calls")
+                    else None
+                ),
+                "top_allocation_sites": _top_allocation_sites(entry),
+                "max_depth": (
+                    entry["max_depth"] if entry.get("recursive_calls") else None
+                ),
+                "recursive_calls": entry.get("recursive_calls", 0),
+                "own_overhead": entry.get("own_overhead", 0.0),
+                "nested_overhead": entry.get("nested_overhead", 0.0),
+                "overhead_ratio": _overhead_ratio(entry),
+                "cold_calls": entry.get("cold_calls", 0),
+                "cold_avg_time": (
+                    entry["cold_time"] / entry["cold_calls"]
+                    if entry.get("cold_calls")
+                    else None
+                ),
+                "cold_max_time": entry.get("max_cold_time", 0.0),
+                "labels": _label_table(entry),
+                "hung_calls": entry.get("hung_calls") or None,
+                "max_concurrency": entry.get("max_concurrency") or None,
+                "lock_waits": entry.get("lock_waits", 0),
+                "lock_wait_time": entry.get("lock_wait_time", 0.0),
+                "lock_wait_ratio": _lock_wait_ratio(entry),
+            }
+        )
+    return rows
+
+
+def _title(shown: int, total: int, sort_by: str) -> str:
+    if shown == total:
+        return f"PERFORMANCE REPORT ({total} functions by {sort_by})"
+    return f"PERFORMANCE REPORT (top {shown} of {total} functions by {sort_by})"
+
+
+_TABLE_COLUMNS = (
+    ("Calls", "call_count", "{:d}"),
+    ("Total (s)", "total_time", "{:.4f}"),
+    ("Avg (s)", "avg_time", "{:.4f}"),
+    ("P99 (s)", "p99_time", "{:.4f}"),
+    ("Errors", "error_rate", "{:.1%}"),
+    ("Peak MB", "max_memory_peak", "{:.2f}"),
+)
+
+# Columns only shown when at least one row has a value for them
+_OPTIONAL_TABLE_COLUMNS = (
+    ("Fail Avg", "failure_avg_time", "{:.4f}"),
+    ("Cold Avg", "cold_avg_time", "{:.4f}"),
+    ("Scaling", "complexity", "n^{:.2f}"),
+    ("Repeats", "repeat_ratio", "{:.1%}"),
+    ("Cache Hits", "cache_hit_rate", "{:.1%}"),
+    ("Net Blocks", "net_blocks_per_call", "{:.1f}"),
+    ("Depth", "max_depth", "{:d}"),
+    ("Overhead", "overhead_ratio", "{:.1%}"),
+    ("Hung", "hung_calls", "{:d}"),
+    ("Lock Wait", "lock_wait_ratio", "{:.1%}"),
+)
+
+
+def _table_columns(rows: list[dict[str, Any]]) -> tuple[tuple[str, str, str], ...]:
+    return _TABLE_COLUMNS + tuple(
+        column
+        for column in _OPTIONAL_TABLE_COLUMNS
+        if any(row[column[1]] is not None for row in rows)
+    )
+
+
+def _cell(spec: str, value: Any) -> str:
+    return "-" if value is None else spec.format(value)
+
+
+def _render_text(rows: list[dict[str, Any]], title: str) -> str:
+    columns = _table_columns(rows)
+    name_width = min(max([len("Function")] + [len(r["name"]) for r in rows]), 40)
+    header = f"{'Function':<{name_width}}" + "".join(
+        f"  {label:>10}" for label, _, _ in columns
+    )
+    lines = ["=" * len(header), title, "=" * len(header), header, "-" * len(header)]
+    for row in rows:
+        name = row["name"]
+        if len(name) > name_width:
+            name = name[: name_width - 3] + "..."
+        lines.append(
+            f"{name:<{name_width}}"
+            + "".join(f"  {_cell(spec, row[field]):>10}" for _, field, spec in columns)
+        )
+    return "\n".join(lines)
+
+
+def _render_markdown(rows: list[dict[str, Any]], title: str) -> str:
+    columns = _table_columns(rows)
+    labels = ["Function"] + [label for label, _, _ in columns]
+    lines = [
+        f"## {title}",
+        "",
+        "| " + " | ".join(labels) + " |",
+        "|" + "|".join(["---"] + ["---:"] * len(columns)) + "|",
+    ]
+    for row in rows:
+        cells = [f"`{row['name']}`"] + [
+            _cell(spec, row[field]) for _, field, spec in columns
+        ]
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def _bucket_order(bucket: Any) -> tuple[int, Any]:
+    """Numeric buckets in order, then labels alphabetically, ``"other"`` last"""
+    if bucket == OTHER_BUCKET:
+        return (2, "")
+    if isinstance(bucket, (int, float)):
+        return (0, bucket)
+    return (1, str(bucket))
+
+
+def _render_detailed(
+    rows: list[dict[str, Any]], stats: dict[str, dict[str, Any]]
+) -> str:
+    """The long per-function block format"""
+    lines = ["", "=" * 80, "PERFORMANCE REPORT", "=" * 80]
+
+    for row in rows:
+        entry = stats[row["name"]]
+        lines.append(f"\nFunction: {row['name']}")
+        lines.append("-" * 40)
+
+        # Call statistics
+        total_calls = row["call_count"]
+        success_rate = (1 - row["error_rate"]) * 100 if total_calls else 0
+        lines.append(f"Total Calls: {total_calls}")
+        lines.append(
+            f"Success Rate: {success_rate:.1f}% "
+            f"({row['success_count']} succeeded, "
+            f"{row['failure_count']} failed)"
+        )
+
+        # Timing statistics
+        if total_calls:
+            lines.append("Timing:")
+            lines.append(f"  Total Time: {row['total_time']:.4f} seconds")
+            lines.append(f"  Average Time: {row['avg_time']:.4f} seconds")
+            lines.append(f"  Min Time: {row['min_time']:.4f} seconds")
+            lines.append(f"  Max Time: {row['max_time']:.4f} seconds")
+
+            # Memory statistics
+            lines.append("Memory:")
+            lines.append(f"  Total Memory Used: {row['total_memory_used']:.2f} MB")
+            lines.append(f"  Average Peak: {row['avg_memory_peak']:.2f} MB")
+            lines.append(f"  Max Peak: {row['max_memory_peak']:.2f} MB")
+
+        # Cold starts next to the steady state (only with warmup_calls)
+        if row["cold_avg_time"] is not None:
+            lines.append("Cold Start:")
+            lines.append(
+                f"  Cold Calls: {row['cold_calls']} "
+                f"({entry['cold_failures']} failed), "
+                f"{entry['cold_time']:.4f} seconds total"
+            )
+            lines.append(
+                f"  Cold Avg: {row['cold_avg_time']:.4f} seconds, "
+                f"max {row['cold_max_time']:.4f} seconds"
+            )
+            if total_calls:
+                lines.append(
+                    f"  Steady Avg: {row['avg_time']:.4f} seconds, "
+                    f"p50 {row['p50_time']:.4f}, p99 {row['p99_time']:.4f} seconds"
+                )
+
+        # Calls seen in flight (only with a running Watchdog)
+        if row["hung_calls"] is not None or row["max_concurrency"] is not None:
+            lines.append("In Flight:")
+            lines.append(f"  Max Concurrency: {row['max_concurrency'] or 0}")
+            lines.append(f"  Hung Calls: {row['hung_calls'] or 0}")
+
+        # Time spent waiting for locks (only with monitored locks)
+        if row["lock_wait_ratio"] is not None:
+            lines.append("Locks:")
+            lines.append(
+                f"  Wait Time: {row['lock_wait_time']:.4f} seconds "
+                f"({row['lock_wait_ratio']:.1%} of total time), "
+                f"{row['lock_waits']} contended acquisitions"
+            )
+
+        # Failures by exception type, with latency kept apart from successes
+        if row["failures"]:
+            lines.append("Failures:")
+            for label, outcome in (("Success", "success"), ("Failure", "failure")):
+                avg = row[f"{outcome}_avg_time"]
+                if avg is not None:
+                    lines.append(
+                        f"  {label} Latency: avg {avg:.4f} seconds, "
+                        f"p99 {row[f'{outcome}_p99_time']:.4f} seconds"
+                    )
+            for failure in row["failures"]:
+                lines.append(
+                    f"  {failure['exception']}: {failure['count']} calls "
+                    f"({failure['error_rate']:.1%} of calls), "
+                    f"avg {failure['avg_time']:.4f} seconds, "
+                    f"max {failure['max_time']:.4f} seconds"
+                )
+
+        # Allocation counts (only with track_allocations / sample_allocations)
+        if row["net_blocks_per_call"] is not None:
+            lines.append("Allocations:")
+            lines.append(
+                f"  Net Retained Blocks per Call: {row['net_blocks_per_call']:.1f} "
+                f"(max {entry['max_alloc_blocks']})"
+            )
+            if row["top_allocation_sites"]:
+                lines.append(
+                    f"  Retained Blocks by Line ({entry['alloc_samples']} samples): "
+                    + ", ".join(
+                        f"{site} {per_call:.1f}"
+                        for site, per_call in row["top_allocation_sites"]
+                    )
+                )
+
+        # Recursion depth (only for functions that called themselves)
+        if row["max_depth"] is not None:
+            lines.append("Recursion:")
+            lines.append(
+                f"  Max Depth: {row['max_depth']} "
+                f"({row['recursive_calls']} recursive calls)"
+            )
+            lines.append(
+                "  Calls by Max Depth: "
+                + ", ".join(
+                    f"{depth}: {count}"
+                    for depth, count in sorted(entry["depth_counts"].items())
+                )
+            )
+            lines.append("  Self Time by Depth:")
+            for depth, seconds in sorted(entry["depth_self_time"].items()):
+                lines.append(f"    {depth}: {seconds:.4f} seconds")
+
+        # Instrumentation cost (only with overhead accounting enabled)
+        if row["overhead_ratio"] is not None:
+            lines.append("Instrumentation Overhead:")
+            per_call = row["own_overhead"] / total_calls if total_calls else 0.0
+            lines.append(f"  Own Wrapper: {per_call * 1e6:.2f} us per call")
+            lines.append(
+                f"  Nested Wrappers: {row['nested_overhead']:.4f} seconds "
+                f"({row['overhead_ratio']:.1%} of total time)"
+            )
+
+        # Label breakdown (only with labels=)
+        if row["labels"]:
+            lines.append("Labels:")
+            for label in row["labels"]:
+                bound = f" (±{label['count_error']})" if label["count_error"] else ""
+                lines.append(
+                    f"  {label['labels']}: {label['calls']} calls{bound}, "
+                    f"{label['failures']} failed, "
+                    f"avg {label['avg_time']:.4f} seconds, "
+                    f"p99 {label['p99_time']:.4f} seconds"
+                )
+
+        # Argument buckets (only with key= or size_of=)
+        buckets = entry.get("buckets")
+        if buckets:
+            lines.append("Buckets:")
+            for bucket in sorted(buckets, key=_bucket_order):
+                data = buckets[bucket]
+                sized = entry.get("bucket_kind") == "size" and bucket != OTHER_BUCKET
+                label = f"size {bucket}+" if sized else bucket
+                lines.append(
+                    f"  {label}: {data['call_count']} calls, "
+                    f"avg {data['total_time'] / data['call_count']:.4f} seconds, "
+                    f"max {data['max_time']:.4f} seconds"
+                )
+            if row["complexity"] is not None:
+                lines.append(f"  Empirical Complexity: ~O(n^{row['complexity']:.2f})")
+
+        # Memoization advice (only with advise_memo=True)
+        if row["repeat_ratio"] is not None:
+            lines.append("Memoization:")
+            lines.append(
+                f"  Repeated Arguments: {row['repeat_ratio']:.1%} of "
+                f"{entry['memo_calls']} calls"
+            )
+            lines.append(f"  Potential Time Saved: {row['repeat_time']:.4f} seconds")
+
+        # Cache statistics (only for cached_monitor)
+        if row["cache_hit_rate"] is not None:
+            lines.append("Cache:")
+            lines.append(
+                f"  Hit Rate: {row['cache_hit_rate']:.1%} "
+                f"({entry['cache_hits']} hits, {entry['cache_misses']} misses, "
+                f"{entry['cache_evictions']} evictions)"
+            )
+            lines.append(f"  Time Saved: {row['cache_time_saved']:.4f} seconds")
+
+        # Event-loop blocking (only with a running LoopMonitor)
+        if entry.get("slow_callbacks"):
+            lines.append("Event Loop:")
+            lines.append(
+                f"  Slow Callbacks: {entry['slow_callbacks']} "
+                f"({entry['loop_block_time']:.4f} seconds blocking the loop)"
+            )
+            lines.append(f"  Max Block: {entry['max_loop_block']:.4f} seconds")
+
+        # Garbage collection statistics (only with enable_gc_tracking())
+        if any(entry.get("gc_collections", ())):
+            gen0, gen1, gen2 = entry["gc_collections"]
+            spent = _time_spent(entry)
+            gc_share = entry["gc_pause_time"] / spent * 100 if spent > 0 else 0
+            lines.append("GC:")
+            lines.append(
+                f"  Collections: {gen0 + gen1 + gen2} "
+                f"(gen0/1/2: {gen0}/{gen1}/{gen2})"
+            )
+            lines.append(
+                f"  Pause Time: {entry['gc_pause_time']:.4f} seconds "
+                f"({gc_share:.1f}% of total)"
+            )
+            lines.append(f"  Max Pause: {entry['max_gc_pause']:.4f} seconds")
+            lines.append(
+                "  Time Excluding GC: " f"{spent - entry['gc_pause_time']:.4f} seconds"
+            )
+    return "\n".join(lines)
+
+
+def format_performance_report(
+    sort_by: str = "total_time",
+    top: Optional[int] = 20,
+    pattern: Optional[str] = None,
+    module: Optional[str] = None,
+    output: str = "text",
+    stats: Optional[dict[str, dict[str, Any]]] = None,
+) -> str:
+    """Render a performance report as a string
+
+    Args:
+        sort_by: One of ``total_time``, ``avg_time``, ``p99``, ``call_count``,
+            ``error_rate`` or ``memory`` (max peak), highest first
+        top: Maximum number of functions to include; None for all
+        pattern: Glob pattern the function name must match
+        module: Module name, package prefix or glob the function's module
+            must match
+        output: ``text`` (compact table), ``json``, ``markdown`` or
+            ``detailed`` (one block per function)
+        stats: Statistics to report on. Default: a snapshot of the global
+            statistics, so calls recorded while the report is built don't
+            skew it
+    """
+    if output not in OUTPUT_FORMATS:
+        raise ValueError(f"output must be one of {', '.join(OUTPUT_FORMATS)}")
+    if stats is None:
+        stats = StatsSnapshot()  # type: ignore[assignment]
+
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"sort_by must be one of {', '.join(SORT_KEYS)}")
+    matching = _matching_functions(stats, pattern, module)
+    rows = build_report_rows(stats, _rank(stats, matching, sort_by, top))
+
+    if output == "json":
+        return json.dumps(rows, indent=2)
+    if not rows:
+        return "No performance data collected yet."
+
+    title = _title(len(rows), len(matching), sort_by)
+    if output == "markdown":
+        return _render_markdown(rows, title)
+    if output == "detailed":
+        return _render_detailed(rows, stats)
+    return _render_text(rows, title)
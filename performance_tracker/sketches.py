@@ -0,0 +1,204 @@
+"""Fixed-memory probabilistic counters"""
+
+import heapq
+import math
+import random
+from array import array
+from itertools import count as _counter
+from typing import Hashable, Optional
+
+# Mersenne prime for the pairwise-independent hash family ((a * x + b) mod p)
+_PRIME = (1 << 61) - 1
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+
+class CountMinSketch:
+    """Approximate per-item counts in ``width * depth`` fixed counters
+
+    Estimates never undercount; they overcount by at most ``2N / width``
+    with probability ``1 - 0.5 ** depth`` after ``N`` additions.
+    """
+
+    __slots__ = ("width", "depth", "_rows", "_hashes", "total")
+
+    def __init__(self, width: int = 1024, depth: int = 4, seed: int = 0) -> None:
+        if width < 1 or depth < 1:
+            raise ValueError("CountMinSketch needs width >= 1 and depth >= 1")
+        self.width = width
+        self.depth = depth
+        self._rows = [array("Q", [0]) * width for _ in range(depth)]
+        rng = random.Random(seed)
+        self._hashes = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(depth)
+        ]
+        self.total = 0
+
+    def _indexes(self, item: int) -> list[int]:
+        x = item & _MASK64
+        return [((a * x + b) % _PRIME) % self.width for a, b in self._hashes]
+
+    def estimate(self, item: int) -> int:
+        """Estimated number of times ``item`` (an integer hash) was added"""
+        return min(row[i] for row, i in zip(self._rows, self._indexes(item)))
+
+    def add(self, item: int, count: int = 1) -> int:
+        """Add ``item`` and return its estimated count *before* this addition"""
+        indexes = self._indexes(item)
+        previous = min(row[i] for row, i in zip(self._rows, indexes))
+        for row, i in zip(self._rows, indexes):
+            row[i] += count
+        self.total += count
+        return previous
+
+    def clear(self) -> None:
+        self._rows = [array("Q", [0]) * self.width for _ in range(self.depth)]
+        self.total = 0
+
+
+class HyperLogLog:
+    """Approximate number of distinct items in ``2 ** precision`` registers
+
+    The relative error of ``estimate()`` is about ``1.04 / sqrt(2 **
+    precision)``; small cardinalities are counted almost exactly. Items are
+    integer hashes, such as ``hash()`` of the item.
+    """
+
+    __slots__ = ("precision", "_registers", "_inverse_sum", "_zeros", "total")
+
+    # Register values stay below this, so 2 ** -value sums exactly as integers
+    _MAX_RANK = 64
+
+    def __init__(self, precision: int = 12) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError("HyperLogLog needs 4 <= precision <= 16")
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+        # sum(2 ** (_MAX_RANK - register)), kept up to date by add() so that
+        # estimate() does not walk the registers
+        self._inverse_sum = (1 << precision) << self._MAX_RANK
+        self._zeros = 1 << precision
+        self.total = 0
+
+    def add(self, item: int) -> None:
+        """Add ``item`` (an integer hash)"""
+        self.total += 1
+        # Python hashes of small ints are the ints themselves, so mix the bits
+        # (the splitmix64 finalizer)
+        x = item & _MASK64
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+        x ^= x >> 31
+        index = x >> (64 - self.precision)
+        rest_bits = 64 - self.precision
+        rank = rest_bits - (x & ((1 << rest_bits) - 1)).bit_length() + 1
+        old = self._registers[index]
+        if rank > old:
+            self._registers[index] = rank
+            self._inverse_sum += (1 << (self._MAX_RANK - rank)) - (
+                1 << (self._MAX_RANK - old)
+            )
+            if old == 0:
+                self._zeros -= 1
+
+    def estimate(self) -> float:
+        """Estimated number of distinct items added"""
+        m = 1 << self.precision
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m * (1 << self._MAX_RANK) / self._inverse_sum
+        if raw <= 2.5 * m and self._zeros:
+            # Linear counting is more accurate while registers are still empty
+            return m * math.log(m / self._zeros)
+        return raw
+
+    def clear(self) -> None:
+        self._registers = bytearray(1 << self.precision)
+        self._inverse_sum = (1 << self.precision) << self._MAX_RANK
+        self._zeros = 1 << self.precision
+        self.total = 0
+
+
+class SpaceSaving:
+    """The most frequent items of a stream, tracking at most ``capacity``
+
+    Space-saving (Metwally et al.): a new item replaces the least counted
+    one and inherits its count as ``error``. A tracked item's true count lies
+    between ``count - error`` and ``count``, and every item seen more than
+    ``total / capacity`` times is tracked.
+    """
+
+    __slots__ = ("capacity", "_counts", "_heap", "_order", "total")
+
+    def __init__(self, capacity: int = 100) -> None:
+        if capacity < 1:
+            raise ValueError("SpaceSaving needs capacity >= 1")
+        self.capacity = capacity
+        # item -> [count, error]
+        self._counts: dict[Hashable, list[int]] = {}
+        # (count when pushed, tiebreak, item); exactly one entry per item,
+        # refreshed lazily since counts only grow
+        self._heap: list[tuple[int, int, Hashable]] = []
+        self._order = _counter()
+        self.total = 0
+
+    @classmethod
+    def from_counts(
+        cls, entries: list[tuple[Hashable, int, int]], capacity: int = 100
+    ) -> "SpaceSaving":
+        """Rebuild a counter from (item, count, error) entries kept elsewhere
+
+        Only the ``capacity`` most counted entries are kept.
+        """
+        counter = cls(capacity)
+        ranked = sorted(entries, key=lambda entry: -entry[1])
+        for item, count, error in ranked[:capacity]:
+            counter._counts[item] = [count, error]
+            counter._heap.append((count, next(counter._order), item))
+            counter.total += count
+        heapq.heapify(counter._heap)
+        return counter
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._counts
+
+    def add(self, item: Hashable, count: int = 1) -> Optional[Hashable]:
+        """Count ``item``; returns the item evicted to make room for it, if any"""
+        self.total += count
+        entry = self._counts.get(item)
+        if entry is not None:
+            entry[0] += count
+            return None
+        evicted = None
+        floor = 0
+        if len(self._counts) >= self.capacity:
+            evicted, floor = self._pop_min()
+        self._counts[item] = [floor + count, floor]
+        heapq.heappush(self._heap, (floor + count, next(self._order), item))
+        return evicted
+
+    def _pop_min(self) -> tuple[Hashable, int]:
+        while True:
+            stored, _, item = heapq.heappop(self._heap)
+            current = self._counts[item][0]
+            if stored == current:
+                del self._counts[item]
+                return item, current
+            heapq.heappush(self._heap, (current, next(self._order), item))
+
+    def get(self, item: Hashable) -> tuple[int, int]:
+        """(count, error) of a tracked item; (0, 0) if it is not tracked"""
+        entry = self._counts.get(item)
+        return (entry[0], entry[1]) if entry is not None else (0, 0)
+
+    def top(self, n: Optional[int] = None) -> list[tuple[Hashable, int, int]]:
+        """Tracked items as (item, count, error), most counted first"""
+        ranked = sorted(self._counts.items(), key=lambda entry: -entry[1][0])
+        return [(item, entry[0], entry[1]) for item, entry in ranked[:n]]
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self._heap.clear()
+        self.total = 0
@@ -0,0 +1,241 @@
+"""Cheap, read-only snapshots of performance_stats and deltas between them
+
+A snapshot copies each function's counters but not its per-call sample
+lists. Those lists only ever grow by appending, so the snapshot records
+their length and keeps a read-only view of that prefix. Taking one costs
+time proportional to the number of monitored functions, however many calls
+they have recorded.
+
+``delta(since)`` compares a fresh snapshot with an earlier one and returns
+only the functions that changed, with counters as differences and sample
+fields holding just the new samples, so exporters can poll without
+resetting global state.
+"""
+
+import time
+from contextlib import nullcontext
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping, Optional, Sequence, Union, overload
+
+from .monitor import performance_stats
+
+# Per-call sample lists that are shared as prefixes instead of copied
+SAMPLE_FIELDS = ("times", "memory_peaks", "cold_times")
+
+
+class SamplePrefix(Sequence[float]):
+    """Read-only view of the first ``len`` items of an append-only list"""
+
+    __slots__ = ("_items", "_length")
+
+    def __init__(self, items: list[float], length: int) -> None:
+        self._items = items
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> float:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[float]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._items[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("sample index out of range")
+        return self._items[index]
+
+    def __iter__(self) -> Iterator[float]:
+        return islice(self._items, self._length)
+
+    def __repr__(self) -> str:
+        return f"<SamplePrefix of {self._length} samples>"
+
+
+def _freeze_row(row: Mapping[str, Any]) -> Mapping[str, Any]:
+    return MappingProxyType(
+        {
+            field: tuple(value) if isinstance(value, list) else value
+            for field, value in row.items()
+        }
+    )
+
+
+def _freeze_entry(entry: Mapping[str, Any]) -> Mapping[str, Any]:
+    # Calls are recorded under the entry's lock, so holding it here yields
+    # counters, samples and tables that all cover the same calls
+    with getattr(entry, "_lock", None) or nullcontext():
+        frozen = dict(entry)
+        for field, value in frozen.items():
+            if field in SAMPLE_FIELDS:
+                frozen[field] = SamplePrefix(value, len(value))
+            elif isinstance(value, list):
+                frozen[field] = tuple(value)
+            elif isinstance(value, dict):
+                # buckets, failures, alloc_sites, labels
+                table = {
+                    key: _freeze_row(item) if isinstance(item, dict) else item
+                    for key, item in value.items()
+                }
+                frozen[field] = MappingProxyType(table)
+    return MappingProxyType(frozen)
+
+
+class StatsSnapshot(Mapping[str, Mapping[str, Any]]):
+    """An immutable view of ``performance_stats`` at one point in time
+
+    Each function's entry is copied under the lock its calls are recorded
+    under, so within an entry every counter, histogram, sample prefix and
+    table covers the same calls. Entries are copied one after another.
+    ``taken_at`` is the wall-clock time of the snapshot.
+    """
+
+    def __init__(self, stats: Optional[Mapping[str, Mapping[str, Any]]] = None) -> None:
+        source = performance_stats if stats is None else stats
+        self.taken_at = time.time()
+        self._entries = {
+            name: _freeze_entry(entry) for name, entry in list(source.items())
+        }
+
+    def __getitem__(self, name: str) -> Mapping[str, Any]:
+        return self._entries[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"<StatsSnapshot of {len(self)} functions at {self.taken_at:.3f}>"
+
+    def delta(self, since: "StatsSnapshot") -> dict[str, dict[str, Any]]:
+        """What changed between ``since`` and this snapshot, per function"""
+        changes = {}
+        for name, entry in self._entries.items():
+            previous = since._entries.get(name)
+            # A reset in between recreates the entry and its sample lists
+            if previous is not None and not _same_samples(entry, previous):
+                previous = None
+            change = _entry_delta(entry, previous)
+            if change is not None:
+                changes[name] = change
+        return changes
+
+
+def _same_samples(entry: Mapping[str, Any], previous: Mapping[str, Any]) -> bool:
+    current, old = entry.get("times"), previous.get("times")
+    if isinstance(current, SamplePrefix) and isinstance(old, SamplePrefix):
+        return current._items is old._items
+    return True
+
+
+def _thaw(value: Any) -> Any:
+    """Plain lists and dicts for a frozen value"""
+    if isinstance(value, (SamplePrefix, tuple)):
+        return list(value)
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    return value
+
+
+def _number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _table_delta(
+    current: Mapping[Any, Any], previous: Mapping[Any, Any]
+) -> dict[Any, Any]:
+    """Changed rows of a nested table (buckets, failures, types, labels)"""
+    changed = {}
+    for key, value in current.items():
+        old = previous.get(key)
+        if isinstance(value, Mapping):
+            row = {
+                field: _row_field_delta(field, item, old)
+                for field, item in value.items()
+            }
+            if old is None or row.get("call_count", row.get("count")):
+                changed[key] = row
+        elif old is None or value != old:
+            changed[key] = value - old if old is not None and _number(value) else value
+    return changed
+
+
+def _row_field_delta(field: str, item: Any, old: Optional[Mapping[str, Any]]) -> Any:
+    if old is None or _extreme(field):
+        return _thaw(item)
+    if _number(item):
+        return item - old[field]
+    if isinstance(item, tuple):
+        # Histogram counts, such as a label row's latency buckets
+        return [a - b for a, b in zip(item, old[field])]
+    return item
+
+
+def _extreme(field: str) -> bool:
+    return field.startswith(("min_", "max_"))
+
+
+def _entry_delta(
+    entry: Mapping[str, Any], previous: Optional[Mapping[str, Any]]
+) -> Optional[dict[str, Any]]:
+    if previous is None:
+        return {field: _thaw(value) for field, value in entry.items()}
+
+    changed = False
+    change: dict[str, Any] = {}
+    for field, value in entry.items():
+        old = previous.get(field)
+        if field in SAMPLE_FIELDS:
+            new_samples = value[len(old) :] if old is not None else list(value)
+            change[field] = new_samples
+            changed = changed or bool(new_samples)
+        elif _extreme(field):
+            change[field] = value
+        elif _number(value):
+            change[field] = value - (old or 0)
+            changed = changed or change[field] != 0
+        elif isinstance(value, tuple):
+            change[field] = [a - b for a, b in zip(value, old or (0,) * len(value))]
+            changed = changed or any(change[field])
+        elif isinstance(value, Mapping):
+            change[field] = _table_delta(value, old or {})
+            changed = changed or bool(change[field])
+        else:
+            change[field] = value
+    if not changed:
+        return None
+
+    # Extremes of the window, where the new samples allow it; failed calls
+    # are not sampled, so keep the cumulative extremes when there were any
+    times = change.get("times")
+    if times and not change.get("failure_count"):
+        change["min_time"] = min(times)
+        change["max_time"] = max(times)
+    return change
+
+
+def take_snapshot() -> StatsSnapshot:
+    """Return an immutable snapshot of the current ``performance_stats``"""
+    return StatsSnapshot()
+
+
+def delta(
+    since: Optional[StatsSnapshot] = None,
+) -> tuple[StatsSnapshot, dict[str, dict[str, Any]]]:
+    """Take a snapshot and return it with the changes since ``since``
+
+    Pass the returned snapshot as ``since`` on the next call. Without
+    ``since`` every function counts as changed.
+    """
+    current = StatsSnapshot()
+    return current, current.delta(since if since is not None else StatsSnapshot({}))
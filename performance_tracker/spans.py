@@ -0,0 +1,143 @@
+"""Time arbitrary code blocks with the same stats store as the decorator
+
+``track("db.query")`` returns a span usable as a ``with`` or ``async with``
+block; ``start_span("db.query")`` returns an already running span to
+``stop()`` later. A span records exactly like one call of a function
+decorated with ``performance_monitor(track_recursion=False)``.
+"""
+
+from time import perf_counter_ns
+from types import TracebackType
+from typing import Optional
+
+from . import monitor
+from .monitor import (
+    _active_calls,
+    _call_listeners,
+    _call_starts,
+    _init_function_stats,
+    _pop_active_call,
+    _record_function_stats,
+    _trace_call,
+    _trace_sinks,
+    performance_stats,
+)
+
+
+class Span:
+    """A reusable timer for one named block of code
+
+    Spans hold no per-run allocations, so a span created once outside a tight
+    loop can be re-entered on every iteration. A single span object must not
+    be running twice at the same time; create one per thread or task.
+    """
+
+    __slots__ = (
+        "name",
+        "track_memory",
+        "_start",
+        "_start_memory",
+        "_calls",
+        "_starts",
+    )
+
+    def __init__(self, name: str, track_memory: bool = False) -> None:
+        self.name = name
+        self.track_memory = track_memory
+        self._start: Optional[int] = None
+        self._start_memory = 0
+        self._calls: Optional[list[str]] = None
+        self._starts: Optional[list[int]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._start is not None
+
+    def start(self) -> "Span":
+        """Start timing; returns the span for chaining"""
+        if self._start is not None:
+            raise RuntimeError(f"Span {self.name!r} is already running")
+
+        _init_function_stats(self.name)
+        if self.track_memory:
+            tracemalloc = monitor._load_memory_backend()
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.clear_traces()
+            self._start_memory = tracemalloc.get_traced_memory()[0]
+
+        calls = self._calls = _active_calls()
+        starts = self._starts = _call_starts()
+        calls.append(self.name)
+        self._start = perf_counter_ns()
+        starts.append(self._start)
+        return self
+
+    def stop(self, success: bool = True, error: Optional[type] = None) -> float:
+        """Stop timing, record the block and return its duration in seconds
+
+        ``error`` is the exception class that ended a failed block.
+        """
+        end_time = perf_counter_ns()
+        if self._start is None:
+            raise RuntimeError(f"Span {self.name!r} is not running")
+        elapsed_ns = end_time - self._start
+        if _trace_sinks:
+            _trace_call(self.name, self._start, elapsed_ns, success)
+        self._start = None
+        if self._calls is not None and self._starts is not None:
+            _pop_active_call(self._calls, self._starts, self.name)
+            self._calls = self._starts = None
+
+        memory_used = 0.0
+        memory_peak = 0.0
+        if self.track_memory:
+            current_memory, peak_memory = monitor.tracemalloc.get_traced_memory()
+            memory_used = (current_memory - self._start_memory) / 1024 / 1024  # MB
+            memory_peak = peak_memory / 1024 / 1024  # MB
+
+        # Stats may have been reset while the span was running
+        _init_function_stats(self.name)
+        with performance_stats[self.name]._lock:
+            duration, _ = _record_function_stats(
+                self.name, elapsed_ns, memory_used, memory_peak, success, error
+            )
+        for listener in _call_listeners:
+            listener(self.name, duration, success)
+        return duration
+
+    def __enter__(self) -> "Span":
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.stop(success=exc_type is None, error=exc_type)
+
+    async def __aenter__(self) -> "Span":
+        return self.start()
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.stop(success=exc_type is None, error=exc_type)
+
+    def __repr__(self) -> str:
+        state = "running" if self.running else "stopped"
+        return f"<Span {self.name!r} {state}>"
+
+
+def track(name: str, track_memory: bool = False) -> Span:
+    """Return a span for ``with track(name):`` or ``async with track(name):``"""
+    return Span(name, track_memory)
+
+
+def start_span(name: str, track_memory: bool = False) -> Span:
+    """Start and return a span; call ``stop()`` on it when the block ends"""
+    return Span(name, track_memory).start()
@@ -0,0 +1,222 @@
+"""Push aggregated statistics to a StatsD or DogStatsD agent over UDP
+
+``StatsDExporter`` sends nothing per call. Every ``interval`` seconds it
+takes the changes since its previous flush (``snapshots.delta``) and sends
+a fixed set of metrics per function that was called in between:
+
+- ``calls`` and ``failures`` as counters
+- ``time.total`` as a counter of milliseconds
+- ``time.avg``, ``time.p50``, ``time.p99`` and ``time.max`` as gauges in
+  milliseconds, estimated from the latency histograms
+
+Metric lines are packed into datagrams of at most ``max_packet_size`` bytes,
+so the traffic grows with the number of active functions per interval,
+not with the call rate. The socket is created once, non-blocking; a
+datagram the kernel cannot take right away is counted in ``dropped`` and
+never blocks or raises in the flushing thread.
+"""
+
+import re
+import socket
+import threading
+from typing import Any, Iterator, Mapping, Optional
+
+from .histogram import LatencyHistogram
+from .snapshots import StatsSnapshot, delta
+
+# Ethernet MTU minus IP and UDP headers; the DogStatsD default for
+# non-local agents
+DEFAULT_PACKET_SIZE = 1432
+
+# Characters StatsD uses as separators
+_UNSAFE = re.compile(r"[^\w.\-]")
+
+
+def _metric_name(name: str) -> str:
+    return _UNSAFE.sub("_", name)
+
+
+def _tag_value(value: str) -> str:
+    return value.replace(",", "_").replace("|", "_").replace("\n", "_")
+
+
+def _format(value: float) -> str:
+    return f"{value:.6g}"
+
+
+def _time_spent(change: Mapping[str, Any]) -> float:
+    """Time spent in successful and failed calls together"""
+    return change["total_time"] + change.get("failure_time", 0.0)
+
+
+def _timings(change: Mapping[str, Any]) -> dict[str, float]:
+    """Interval latency gauges in ms from the success/failure histograms"""
+    calls = change["call_count"]
+    counts = [
+        a + b for a, b in zip(change["success_latency"], change["failure_latency"])
+    ]
+    total = _time_spent(change)
+    histogram = LatencyHistogram.from_counts(
+        counts, total, change["min_time"], change["max_time"]
+    )
+    return {
+        "avg": total / calls * 1000,
+        "p50": histogram.percentile(50) * 1000,
+        "p99": histogram.percentile(99) * 1000,
+        "max": change["max_time"] * 1000,
+    }
+
+
+class StatsDExporter:
+    """Flush per-function metrics to a StatsD agent every ``interval`` seconds
+
+    Args:
+        host: Agent host name or address
+        port: Agent UDP port
+        prefix: Prepended to every metric name
+        interval: Seconds between flushes of the background thread
+        dogstatsd: Send the function and module as DogStatsD tags instead of
+            encoding the function name in the metric name
+        tags: Extra tags added to every metric (DogStatsD only)
+        max_packet_size: Largest datagram sent, in bytes
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8125,
+        prefix: str = "performance_tracker",
+        interval: float = 10.0,
+        dogstatsd: bool = False,
+        tags: Optional[Mapping[str, str]] = None,
+        max_packet_size: int = DEFAULT_PACKET_SIZE,
+    ) -> None:
+        if interval <= 0 or max_packet_size < 64:
+            raise ValueError("interval must be positive and max_packet_size >= 64")
+        if tags and not dogstatsd:
+            raise ValueError("tags are a DogStatsD extension; pass dogstatsd=True")
+        self.prefix = _metric_name(prefix)
+        self.interval = interval
+        self.dogstatsd = dogstatsd
+        self.max_packet_size = max_packet_size
+        self.packets = 0
+        self.dropped = 0
+        self._tags = ",".join(
+            f"{_metric_name(key)}:{_tag_value(str(value))}"
+            for key, value in (tags or {}).items()
+        )
+
+        family, kind, proto, _, address = socket.getaddrinfo(
+            host, port, type=socket.SOCK_DGRAM
+        )[0]
+        self._socket = socket.socket(family, kind, proto)
+        self._socket.setblocking(False)
+        self._socket.connect(address)
+
+        self._since: Optional[StatsSnapshot] = None
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> "StatsDExporter":
+        if self._thread is not None:
+            raise RuntimeError("StatsDExporter is already running")
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="performance-tracker-statsd", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the flushing thread after one last flush"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.flush()
+
+    def close(self) -> None:
+        """Stop and close the socket"""
+        self.stop()
+        self._socket.close()
+
+    def __enter__(self) -> "StatsDExporter":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self) -> int:
+        """Send the changes since the previous flush; returns the number of
+        datagrams sent
+
+        The first flush sends everything recorded so far.
+        """
+        with self._flush_lock:
+            self._since, changes = delta(self._since)
+            sent = 0
+            for packet in self._packets(self._lines(changes)):
+                try:
+                    self._socket.send(packet)
+                    sent += 1
+                except OSError:
+                    # Full socket buffer or no agent listening
+                    self.dropped += 1
+            self.packets += sent
+            return sent
+
+    def _lines(self, changes: Mapping[str, Mapping[str, Any]]) -> Iterator[bytes]:
+        for name, change in changes.items():
+            calls = change.get("call_count", 0)
+            if not calls:
+                continue
+            if self.dogstatsd:
+                base = self.prefix
+                tags = f"function:{_tag_value(name)}"
+                if change.get("module"):
+                    tags += f",module:{_tag_value(change['module'])}"
+                if self._tags:
+                    tags += f",{self._tags}"
+                suffix = f"|#{tags}"
+            else:
+                base = f"{self.prefix}.{_metric_name(name)}"
+                suffix = ""
+
+            metrics = [
+                ("calls", calls, "c"),
+                ("failures", change["failure_count"], "c"),
+                ("time.total", _time_spent(change) * 1000, "c"),
+            ]
+            metrics += [
+                (f"time.{stat}", value, "g") for stat, value in _timings(change).items()
+            ]
+            for metric, value, kind in metrics:
+                yield f"{base}.{metric}:{_format(value)}|{kind}{suffix}".encode()
+
+    def _packets(self, lines: Iterator[bytes]) -> Iterator[bytes]:
+        """Join lines with newlines into datagrams up to the packet size"""
+        packet: list[bytes] = []
+        size = 0
+        for line in lines:
+            if packet and size + 1 + len(line) > self.max_packet_size:
+                yield b"\n".join(packet)
+                packet, size = [], 0
+            size += len(line) + (1 if packet else 0)
+            packet.append(line)
+        if packet:
+            yield b"\n".join(packet)
+
+
+def start_statsd_exporter(**options: Any) -> StatsDExporter:
+    """Create a ``StatsDExporter`` with ``options`` and start it"""
+    return StatsDExporter(**options).start()
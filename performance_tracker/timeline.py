@@ -0,0 +1,254 @@
+"""Record monitored calls on a timeline in the Chrome trace-event format
+
+Aggregated statistics hide how calls overlap. While a ``TraceRecorder`` is
+running, every call of a ``performance_monitor``-decorated function and
+every span is kept as one complete event (start time and duration) in a
+bounded ring buffer, and ``dump()`` writes the buffer as trace-event JSON
+that ``chrome://tracing`` and https://ui.perfetto.dev open as a timeline.
+
+Each thread is one track. Calls made inside an asyncio task go on a track
+of their own per task, since tasks interleave on their thread and their
+calls would not nest. ``TraceWriter`` streams events to a file for captures
+longer than the buffer holds, and ``capture_trace()`` records the next few
+seconds of a running process.
+
+Recursive calls folded into their outermost call (``track_recursion``)
+appear as that one call.
+"""
+
+import json
+import os
+import sys
+import threading
+from collections import deque
+from time import monotonic
+from typing import Any, Optional
+
+from . import monitor
+
+# Calls kept by default
+DEFAULT_CAPACITY = 100_000
+
+# (name, start ns, duration ns, track id, track name, success)
+_Event = tuple[str, int, int, int, str, bool]
+
+
+def _current_track() -> tuple[int, str]:
+    """Track id and name of the calling thread, or of its running task"""
+    asyncio = sys.modules.get("asyncio")
+    if asyncio is not None and asyncio._get_running_loop() is not None:
+        task = asyncio.current_task()
+        if task is not None:
+            return id(task), task.get_name()
+    thread = threading.current_thread()
+    return threading.get_ident(), thread.name
+
+
+def _trace_event(event: _Event, pid: int) -> dict[str, Any]:
+    name, start_ns, elapsed_ns, track, _, success = event
+    trace_event = {
+        "name": name,
+        "cat": "call" if success else "call,failed",
+        "ph": "X",
+        "ts": start_ns / 1000,
+        "dur": elapsed_ns / 1000,
+        "pid": pid,
+        "tid": track,
+    }
+    if not success:
+        trace_event["args"] = {"success": False}
+    return trace_event
+
+
+def _track_name_event(track: int, name: str, pid: int) -> dict[str, Any]:
+    return {
+        "name": "thread_name",
+        "ph": "M",
+        "pid": pid,
+        "tid": track,
+        "args": {"name": name},
+    }
+
+
+class TraceRecorder:
+    """Keep the most recent ``capacity`` monitored calls as trace events
+
+    Recording costs one tuple per call while the recorder is running and
+    nothing once it is stopped. Older events are dropped when the buffer is
+    full; ``dropped`` counts them.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.recorded = 0
+        self._events: deque[_Event] = deque(maxlen=capacity)
+
+    @property
+    def running(self) -> bool:
+        return self.record in monitor._trace_sinks
+
+    @property
+    def dropped(self) -> int:
+        return max(self.recorded - len(self._events), 0)
+
+    def start(self) -> "TraceRecorder":
+        if self.running:
+            raise RuntimeError("TraceRecorder is already running")
+        monitor._trace_sinks.append(self.record)
+        return self
+
+    def stop(self) -> None:
+        if self.record in monitor._trace_sinks:
+            monitor._trace_sinks.remove(self.record)
+
+    def __enter__(self) -> "TraceRecorder":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def record(
+        self, func_name: str, start_ns: int, elapsed_ns: int, success: bool
+    ) -> None:
+        """Add one call; called by the monitoring wrappers while running"""
+        track, track_name = _current_track()
+        self._events.append(
+            (func_name, start_ns, elapsed_ns, track, track_name, success)
+        )
+        self.recorded += 1
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def trace_events(self) -> list[dict[str, Any]]:
+        """The buffered calls as trace-event dicts, with track names first"""
+        pid = os.getpid()
+        events = list(self._events)
+        tracks = {event[3]: event[4] for event in events}
+        return [
+            _track_name_event(track, name, pid) for track, name in tracks.items()
+        ] + [_trace_event(event, pid) for event in events]
+
+    def dump(self, path: str) -> int:
+        """Write the buffer to ``path`` as trace-event JSON; returns the
+        number of calls written"""
+        events = self.trace_events()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, handle)
+        os.replace(tmp_path, path)
+        return sum(1 for event in events if event["ph"] == "X")
+
+    def clear(self) -> None:
+        self._events.clear()
+        self.recorded = 0
+
+
+class TraceWriter(TraceRecorder):
+    """Stream monitored calls to a trace-event file until stopped
+
+    A background thread moves buffered events to ``path`` every
+    ``flush_interval`` seconds, so the calling threads never write to the
+    file; the buffer only has to hold the calls of one interval. The file
+    is a JSON array of events, which trace viewers load even if the process
+    dies before ``stop()`` closes it. With ``duration`` the writer stops
+    itself after that many seconds.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        duration: Optional[float] = None,
+        flush_interval: float = 0.5,
+        capacity: int = DEFAULT_CAPACITY,
+    ) -> None:
+        if flush_interval <= 0 or (duration is not None and duration <= 0):
+            raise ValueError("flush_interval and duration must be positive")
+        super().__init__(capacity)
+        self.path = path
+        self.duration = duration
+        self.flush_interval = flush_interval
+        self.written = 0
+        self._pid = os.getpid()
+        self._tracks: dict[int, str] = {}
+        self._handle: Any = None
+        self._empty = True
+        self._stop = threading.Event()
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def dropped(self) -> int:
+        return max(self.recorded - self.written - len(self._events), 0)
+
+    def start(self) -> "TraceWriter":
+        if self._thread is not None:
+            raise RuntimeError("TraceWriter can only be started once")
+        self._handle = open(self.path, "w", encoding="utf-8")
+        self._handle.write("[")
+        self._thread = threading.Thread(
+            target=self._run, name="performance-tracker-timeline", daemon=True
+        )
+        super().start()
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop recording, write the remaining events and close the file"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the file is closed; False if ``timeout`` ran out"""
+        return self._done.wait(timeout)
+
+    def _run(self) -> None:
+        deadline = None if self.duration is None else monotonic() + self.duration
+        try:
+            while True:
+                timeout = self.flush_interval
+                if deadline is not None:
+                    timeout = min(timeout, deadline - monotonic())
+                if timeout <= 0 or self._stop.wait(timeout):
+                    break
+                self._flush()
+        finally:
+            super().stop()
+            self._flush()
+            self._handle.write("\n]\n")
+            self._handle.close()
+            self._done.set()
+
+    def _flush(self) -> None:
+        lines = []
+        while True:
+            try:
+                event = self._events.popleft()
+            except IndexError:
+                break
+            track, name = event[3], event[4]
+            if self._tracks.get(track) != name:
+                self._tracks[track] = name
+                lines.append(json.dumps(_track_name_event(track, name, self._pid)))
+            lines.append(json.dumps(_trace_event(event, self._pid)))
+            self.written += 1
+        if lines:
+            separator = "\n" if self._empty else ",\n"
+            self._handle.write(separator + ",\n".join(lines))
+            self._handle.flush()
+            self._empty = False
+
+
+def capture_trace(
+    path: str, seconds: float = 10.0, capacity: int = DEFAULT_CAPACITY
+) -> TraceWriter:
+    """Stream the monitored calls of the next ``seconds`` to ``path``
+
+    Returns the running writer; ``wait()`` on it blocks until the file is
+    complete.
+    """
+    return TraceWriter(path, duration=seconds, capacity=capacity).start()
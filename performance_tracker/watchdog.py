@@ -0,0 +1,234 @@
+"""See monitored calls while they run and report the ones that hang
+
+Statistics are recorded when a call returns, so a call that never returns
+never shows up in them. The monitoring wrappers also keep every running
+call in an in-flight table: a stack of names and start times per thread,
+plus one entry per running coroutine. ``in_flight_calls()`` and
+``concurrency()`` read that table.
+
+A ``Watchdog`` thread checks it every ``interval`` seconds and reports each
+call that has been running longer than its function's deadline once, with
+the stack of the thread (or coroutine) it is stuck in. It counts the call in
+the function's ``hung_calls`` and keeps the highest concurrency it sees
+in ``max_concurrency``.
+"""
+
+import sys
+import threading
+import traceback
+from collections import deque
+from time import perf_counter_ns
+from typing import Any, Callable, Mapping, NamedTuple, Optional
+
+from .monitor import (
+    _init_function_stats,
+    _running_coroutines,
+    _thread_calls,
+    _thread_starts,
+    performance_stats,
+)
+
+
+class InFlightCall(NamedTuple):
+    """A monitored call that has not returned yet"""
+
+    name: str
+    thread_id: int
+    coroutine: bool
+    running_time: float
+
+
+class HungCall(NamedTuple):
+    """A call found running past its deadline, with where it was stuck"""
+
+    name: str
+    thread_id: int
+    coroutine: bool
+    running_time: float
+    deadline: float
+    stack: str
+
+
+def _in_flight() -> list[tuple[str, int, int, Any]]:
+    """(name, thread id, start ns, coroutine or None) of every running call"""
+    calls = []
+    for thread_id, names in list(_thread_calls.items()):
+        starts = list(_thread_starts.get(thread_id, ()))
+        # A call being entered or left may be in one stack and not yet in
+        # the other; only entries present in both are paired
+        for name, start in zip(list(names), starts):
+            calls.append((name, thread_id, start, None))
+    for coroutine, (name, start, thread_id) in _running_coroutines.copy().items():
+        calls.append((name, thread_id, start, coroutine))
+    return calls
+
+
+def in_flight_calls() -> list[InFlightCall]:
+    """Every monitored call currently running, longest running first
+
+    Synchronous calls nested in each other are all listed. Recursive calls
+    folded into their outermost call (``track_recursion``) are not.
+    """
+    now = perf_counter_ns()
+    calls = [
+        InFlightCall(name, thread_id, coroutine is not None, (now - start) / 1e9)
+        for name, thread_id, start, coroutine in _in_flight()
+    ]
+    calls.sort(key=lambda call: -call.running_time)
+    return calls
+
+
+def concurrency() -> dict[str, int]:
+    """Number of calls of each monitored function running right now"""
+    counts: dict[str, int] = {}
+    for name, _, _, _ in _in_flight():
+        counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+def _coroutine_stack(coroutine: Any) -> str:
+    """Stack of a coroutine, following what it awaits"""
+    frames = []
+    while coroutine is not None:
+        frame = getattr(coroutine, "cr_frame", None) or getattr(
+            coroutine, "gi_frame", None
+        )
+        if frame is None:
+            break
+        frames.append((frame, frame.f_lineno))
+        coroutine = getattr(coroutine, "cr_await", None) or getattr(
+            coroutine, "gi_yieldfrom", None
+        )
+    return "".join(traceback.format_list(traceback.StackSummary.extract(frames)))
+
+
+def _thread_stack(thread_id: int) -> str:
+    frame = sys._current_frames().get(thread_id)
+    return "".join(traceback.format_stack(frame)) if frame is not None else ""
+
+
+def _print_hung(call: HungCall) -> None:
+    kind = "coroutine" if call.coroutine else "call"
+    print(
+        f"Hung {kind}: {call.name} running for {call.running_time:.1f} seconds "
+        f"(deadline {call.deadline:.1f} seconds) on thread {call.thread_id}\n"
+        f"{call.stack}",
+        file=sys.stderr,
+    )
+
+
+class Watchdog:
+    """Report monitored calls running past their deadline
+
+    Args:
+        deadline: Seconds a call may run before it is reported; None to only
+            check the functions named in ``deadlines``
+        deadlines: Per-function deadlines in seconds, by stats name
+        interval: Seconds between checks
+        on_hung: Called with each newly hung ``HungCall``; default prints
+            it to stderr
+        max_reports: Recent hung calls kept in ``hung``
+    """
+
+    def __init__(
+        self,
+        deadline: Optional[float] = 30.0,
+        deadlines: Optional[Mapping[str, float]] = None,
+        interval: float = 1.0,
+        on_hung: Optional[Callable[[HungCall], None]] = None,
+        max_reports: int = 100,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.deadline = deadline
+        self.deadlines = dict(deadlines or {})
+        self.interval = interval
+        self.on_hung = on_hung or _print_hung
+        self.hung: deque[HungCall] = deque(maxlen=max_reports)
+        # Calls already reported, by (name, thread id, start ns)
+        self._reported: set[tuple[str, int, int]] = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> "Watchdog":
+        if self._thread is not None:
+            raise RuntimeError("Watchdog is already running")
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="performance-tracker-watchdog", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> "Watchdog":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self) -> list[HungCall]:
+        """Look for hung calls once; returns the ones found for the first time"""
+        now = perf_counter_ns()
+        calls = _in_flight()
+        found = []
+        in_flight = set()
+        counts: dict[str, int] = {}
+        for name, thread_id, start, coroutine in calls:
+            counts[name] = counts.get(name, 0) + 1
+            deadline = self.deadlines.get(name, self.deadline)
+            running_time = (now - start) / 1e9
+            if deadline is None or running_time <= deadline:
+                continue
+            key = (name, thread_id, start)
+            in_flight.add(key)
+            if key in self._reported:
+                continue
+            self._reported.add(key)
+            stack = (
+                _coroutine_stack(coroutine)
+                if coroutine is not None
+                else _thread_stack(thread_id)
+            )
+            found.append(
+                HungCall(
+                    name,
+                    thread_id,
+                    coroutine is not None,
+                    running_time,
+                    deadline,
+                    stack,
+                )
+            )
+        # Forget calls that have finished since they were reported
+        self._reported &= in_flight
+
+        for name, count in counts.items():
+            stats = performance_stats.get(name)
+            if stats is not None and count > stats.max_concurrency:
+                stats.max_concurrency = count
+        for call in found:
+            _init_function_stats(call.name)
+            performance_stats[call.name].hung_calls += 1
+            self.hung.append(call)
+            self.on_hung(call)
+        return found
+
+
+def start_watchdog(deadline: Optional[float] = 30.0, **options: Any) -> Watchdog:
+    """Create a ``Watchdog`` with ``deadline`` and ``options`` and start it"""
+    return Watchdog(deadline, **options).start()
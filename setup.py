@@ -30,6 +30,8 @@ setup(
         # No external dependencies - uses only standard library
     ],
     extras_require={
+        "analysis": ["numpy>=1.20"],
+        "arrow": ["pyarrow>=8.0"],
         "dev": [
             "pytest>=6.0",
             "pytest-cov>=2.0",
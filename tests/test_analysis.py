@@ -0,0 +1,188 @@
+import importlib.util
+import os
+import statistics
+import tempfile
+import unittest
+from typing import Any
+
+from performance_tracker import StatsColumns, columnar_stats, export_columnar
+from performance_tracker.analysis import estimate_complexity, has_numpy
+
+
+def _make_stats(times: list[float], failures: int = 0) -> dict[str, Any]:
+    return {
+        "call_count": len(times),
+        "total_time": sum(times),
+        "min_time": min(times) if times else float("inf"),
+        "max_time": max(times) if times else 0.0,
+        "times": times,
+        "total_memory_used": 0.0,
+        "max_memory_peak": 2.0,
+        "memory_peaks": [1.0 + i for i in range(len(times))],
+        "success_count": len(times) - failures,
+        "failure_count": failures,
+    }
+
+
+SAMPLE_STATS = {
+    "fast": _make_stats([0.001, 0.002, 0.003, 0.004]),
+    "slow": _make_stats([0.5, 0.1, 0.3], failures=1),
+    "empty": _make_stats([]),
+    "single": _make_stats([0.25]),
+}
+
+
+class ColumnarStatsMixin:
+    backend = "array"
+
+    def columns(self) -> StatsColumns:
+        return columnar_stats(SAMPLE_STATS, backend=self.backend)
+
+    def test_layout(self) -> None:
+        """Test that samples are flattened with per-function offsets"""
+        columns = self.columns()
+        self.assertEqual(columns.names, list(SAMPLE_STATS))
+        self.assertEqual(list(columns.offsets), [0, 4, 7, 7, 8])
+        self.assertEqual(len(columns["times"]), 8)
+        self.assertEqual(list(columns["call_count"]), [4, 3, 0, 1])
+
+    def test_mean_and_sum(self) -> None:
+        """Test bulk sums and means against per-function Python math"""
+        columns = self.columns()
+        sums = columns.sum()
+        means = columns.mean()
+        self.assertAlmostEqual(sums[1], 0.9)
+        self.assertAlmostEqual(means[0], 0.0025)
+        self.assertEqual(means[2], 0.0)
+        self.assertAlmostEqual(columns.mean("memory_peaks")[1], 2.0)
+
+    def test_std(self) -> None:
+        """Test sample standard deviation, zero below two samples"""
+        std = self.columns().std()
+        self.assertAlmostEqual(std[1], statistics.stdev([0.5, 0.1, 0.3]))
+        self.assertEqual(std[2], 0.0)
+        self.assertEqual(std[3], 0.0)
+
+    def test_percentile(self) -> None:
+        """Test interpolated percentiles within each function's samples"""
+        columns = self.columns()
+        p50 = columns.percentile(50)
+        self.assertAlmostEqual(p50[0], 0.0025)
+        self.assertAlmostEqual(p50[1], 0.3)
+        self.assertEqual(p50[2], 0.0)
+        self.assertAlmostEqual(p50[3], 0.25)
+        self.assertAlmostEqual(columns.percentile(100)[1], 0.5)
+        self.assertAlmostEqual(columns.percentile(0)[1], 0.1)
+
+        with self.assertRaises(ValueError):
+            columns.percentile(101)
+
+    def test_rank(self) -> None:
+        """Test ranking by a column name and by a derived array"""
+        columns = self.columns()
+        self.assertEqual(columns.rank("total_time", limit=2), ["slow", "single"])
+        self.assertEqual(
+            columns.rank(columns.percentile(99), descending=False)[0], "empty"
+        )
+
+    def test_summary(self) -> None:
+        """Test the derived summary columns"""
+        summary = self.columns().summary()
+        self.assertIn("p99_time", summary)
+        self.assertAlmostEqual(summary["error_rate"][1], 1 / 3)
+        self.assertEqual(summary["error_rate"][2], 0.0)
+
+
+class TestArrayBackend(ColumnarStatsMixin, unittest.TestCase):
+    backend = "array"
+
+    def test_numpy_backend_unavailable(self) -> None:
+        """Test requesting NumPy without it installed raises ImportError"""
+        if has_numpy():
+            self.skipTest("numpy is installed")
+        with self.assertRaises(ImportError):
+            columnar_stats(SAMPLE_STATS, backend="numpy")
+
+
+@unittest.skipUnless(has_numpy(), "numpy not installed")
+class TestNumpyBackend(ColumnarStatsMixin, unittest.TestCase):
+    backend = "numpy"
+
+
+@unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+class TestArrowExport(unittest.TestCase):
+    def setUp(self) -> None:
+        """Create a scratch directory for exported files"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_to_arrow(self) -> None:
+        """Test samples become list columns grouped per function"""
+        table = columnar_stats(SAMPLE_STATS, backend="array").to_arrow()
+        self.assertEqual(table.column("name").to_pylist(), list(SAMPLE_STATS))
+        self.assertEqual(table.column("call_count").to_pylist(), [4, 3, 0, 1])
+        self.assertEqual(
+            table.column("times").to_pylist(),
+            [stats["times"] for stats in SAMPLE_STATS.values()],
+        )
+
+    def test_round_trip(self) -> None:
+        """Test Parquet and Feather files read back the same list columns"""
+        import pyarrow.feather as feather
+        import pyarrow.parquet as pq
+
+        readers = {".parquet": pq.read_table, ".feather": feather.read_table}
+        for extension, read in readers.items():
+            with self.subTest(extension=extension):
+                path = os.path.join(self.directory, f"stats{extension}")
+                export_columnar(path, SAMPLE_STATS)
+                table = read(path)
+                self.assertEqual(table.column("name").to_pylist(), list(SAMPLE_STATS))
+                for field in ("times", "memory_peaks"):
+                    self.assertEqual(
+                        table.column(field).to_pylist(),
+                        [stats[field] for stats in SAMPLE_STATS.values()],
+                    )
+
+
+class TestExportColumnar(unittest.TestCase):
+    def test_unsupported_extension(self) -> None:
+        """Test an unknown extension is rejected before anything is written"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stats.csv")
+            with self.assertRaises(ValueError):
+                export_columnar(path, SAMPLE_STATS)
+            self.assertFalse(os.path.exists(path))
+
+
+def _size_buckets(exponent: float) -> dict[int, dict[str, Any]]:
+    buckets = {}
+    for size in (8, 16, 32, 64, 128):
+        buckets[size] = {
+            "call_count": 2,
+            "total_time": 2 * 1e-6 * size**exponent,
+            "min_time": 0.0,
+            "max_time": 0.0,
+            "total_size": 2.0 * size,
+        }
+    return buckets
+
+
+class TestEstimateComplexity(unittest.TestCase):
+    def test_recovers_exponent(self) -> None:
+        """Test the log-log slope matches the generating exponent"""
+        for exponent in (1.0, 2.0, 0.5):
+            with self.subTest(exponent=exponent):
+                estimate = estimate_complexity(_size_buckets(exponent))
+                self.assertAlmostEqual(estimate, exponent)
+
+    def test_needs_two_sizes(self) -> None:
+        """Test that a single size gives no estimate"""
+        buckets = _size_buckets(2.0)
+        self.assertIsNone(estimate_complexity({8: buckets[8]}))
+        self.assertIsNone(estimate_complexity({}))
+
+
+if __name__ == "__main__":
+    unittest.main()
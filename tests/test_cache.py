@@ -0,0 +1,175 @@
+import time
+import unittest
+
+from performance_tracker import (
+    cached_monitor,
+    get_performance_stats,
+    performance_monitor,
+    reset_performance_stats,
+)
+
+
+class TestCachedMonitor(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_hits_and_misses(self) -> None:
+        """Test hits skip the function and are recorded in the same entry"""
+        calls = []
+
+        @cached_monitor(maxsize=8)
+        def square(n: int) -> int:
+            calls.append(n)
+            time.sleep(0.002)
+            return n * n
+
+        for n in (1, 2, 1, 1, 2, 3):
+            self.assertEqual(square(n), n * n)
+
+        self.assertEqual(calls, [1, 2, 3])
+        stats = get_performance_stats()["square"]
+        self.assertEqual(stats["call_count"], 3)
+        self.assertEqual(stats["cache_hits"], 3)
+        self.assertEqual(stats["cache_misses"], 3)
+        self.assertGreater(stats["cache_time_saved"], 0.004)
+
+        info = square.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (3, 3, 3))
+
+    def test_lru_eviction(self) -> None:
+        """Test the least recently used entry is evicted first"""
+
+        @cached_monitor(maxsize=2)
+        def ident(n: int) -> int:
+            return n
+
+        ident(1)
+        ident(2)
+        ident(1)  # 2 is now least recently used
+        ident(3)  # evicts 2
+        ident(1)  # hit
+
+        stats = get_performance_stats()["ident"]
+        self.assertEqual(stats["cache_evictions"], 1)
+        self.assertEqual(stats["cache_hits"], 2)
+        ident(2)
+        self.assertEqual(get_performance_stats()["ident"]["cache_misses"], 4)
+
+    def test_ttl_expiry(self) -> None:
+        """Test entries older than the TTL are recomputed"""
+
+        @cached_monitor(ttl=0.01)
+        def now(key: str) -> float:
+            return time.monotonic()
+
+        first = now("a")
+        self.assertEqual(now("a"), first)
+        time.sleep(0.02)
+        self.assertNotEqual(now("a"), first)
+        self.assertEqual(get_performance_stats()["now"]["cache_evictions"], 1)
+
+    def test_kwargs_and_clear(self) -> None:
+        """Test keyword arguments are part of the key and cache_clear works"""
+
+        @cached_monitor()
+        def join(a: str, sep: str = ",") -> str:
+            return sep.join(a)
+
+        join("ab", sep="-")
+        join("ab", sep="-")
+        join("ab", sep="+")
+        self.assertEqual(join.cache_info().hits, 1)
+
+        join.cache_clear()
+        self.assertEqual(join.cache_info().currsize, 0)
+
+    def test_exceptions_not_cached(self) -> None:
+        """Test failed calls are recorded but never cached"""
+
+        @cached_monitor()
+        def fail(n: int) -> int:
+            raise ValueError(n)
+
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                fail(1)
+
+        stats = get_performance_stats()["fail"]
+        self.assertEqual(stats["failure_count"], 2)
+        self.assertEqual(stats["cache_hits"], 0)
+
+
+class TestMemoAdvisor(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_repeat_ratio(self) -> None:
+        """Test repeated arguments are counted with their time"""
+
+        @performance_monitor(verbose=False, track_memory=False, advise_memo=True)
+        def lookup(key: str, region: str = "eu") -> str:
+            return key + region
+
+        for key in ("a", "b", "a", "a", "c"):
+            lookup(key)
+        lookup("a", region="us")
+
+        stats = get_performance_stats()["lookup"]
+        self.assertEqual(stats["memo_calls"], 6)
+        self.assertEqual(stats["repeat_calls"], 2)
+        self.assertGreater(stats["repeat_time"], 0)
+
+    def test_unique_arguments_are_not_repeats(self) -> None:
+        """Test many distinct arguments don't look like repeats"""
+
+        @performance_monitor(verbose=False, track_memory=False, advise_memo=True)
+        def square(n: int) -> int:
+            return n * n
+
+        @performance_monitor(verbose=False, track_memory=False, advise_memo=True)
+        def pair(a: int, b: str) -> str:
+            return b * a
+
+        for n in range(20000):
+            square(n)
+        for n in range(5000):
+            pair(n, "x")
+        for n in range(5000):
+            pair(n, "x")
+
+        stats = get_performance_stats()
+        self.assertLess(stats["square"]["repeat_calls"] / 20000, 0.05)
+        ratio = stats["pair"]["repeat_calls"] / stats["pair"]["memo_calls"]
+        self.assertAlmostEqual(ratio, 0.5, delta=0.05)
+
+    def test_unhashable_arguments_skipped(self) -> None:
+        """Test calls with unhashable arguments are not fingerprinted"""
+
+        @performance_monitor(verbose=False, track_memory=False, advise_memo=True)
+        def total(items: list[int]) -> int:
+            return sum(items)
+
+        total([1, 2])
+        total([1, 2])
+
+        stats = get_performance_stats()["total"]
+        self.assertEqual(stats["call_count"], 2)
+        self.assertEqual(stats["memo_calls"], 0)
+
+    def test_reset_forgets_arguments(self) -> None:
+        """Test reset clears the argument sketch too"""
+
+        @performance_monitor(verbose=False, track_memory=False, advise_memo=True)
+        def ident(n: int) -> int:
+            return n
+
+        ident(1)
+        reset_performance_stats()
+        ident(1)
+        self.assertEqual(get_performance_stats()["ident"]["repeat_calls"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
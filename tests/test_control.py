@@ -0,0 +1,187 @@
+import json
+import os
+import signal
+import socket
+import stat
+import tempfile
+import time
+import unittest
+
+from performance_tracker import (
+    attach,
+    detach,
+    get_performance_stats,
+    reset_performance_stats,
+)
+from performance_tracker.control import (
+    apply_config,
+    attached,
+    dump_stats,
+    install_reload_signal,
+    send_command,
+    start_control_server,
+)
+from performance_tracker.monitor import _init_function_stats
+
+
+def lookup(key: str) -> str:
+    return key.upper()
+
+
+class Service:
+    def handle(self, value: int) -> int:
+        return value + 1
+
+    @staticmethod
+    def ping() -> str:
+        return "pong"
+
+
+class TestAttachDetach(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def tearDown(self) -> None:
+        apply_config({})
+
+    def test_attach_and_detach_function(self) -> None:
+        """Test a module function is wrapped and restored by name"""
+        original = globals()["lookup"]
+        attach(f"{__name__}:lookup")
+        self.assertIsNot(globals()["lookup"], original)
+        self.assertEqual(globals()["lookup"]("a"), "A")
+        self.assertEqual(get_performance_stats()["lookup"]["call_count"], 1)
+
+        self.assertTrue(detach(f"{__name__}:lookup"))
+        self.assertIs(globals()["lookup"], original)
+        self.assertFalse(detach(f"{__name__}:lookup"))
+
+    def test_dotted_target_and_methods(self) -> None:
+        """Test targets without a colon and static methods resolve"""
+        attach(f"{__name__}.Service.handle")
+        attach(f"{__name__}:Service.ping")
+        self.assertEqual(Service().handle(1), 2)
+        self.assertEqual(Service.ping(), "pong")
+
+        stats = get_performance_stats()
+        self.assertEqual(stats["Service.handle"]["call_count"], 1)
+        self.assertEqual(stats["Service.ping"]["call_count"], 1)
+        self.assertEqual(len(attached()), 2)
+
+    def test_reattach_changes_options(self) -> None:
+        """Test attaching again re-wraps with the new options"""
+        attach(f"{__name__}:Service.handle")
+        attach(f"{__name__}:Service.handle", track_allocations=True)
+        Service().handle(1)
+
+        self.assertTrue(attached()[f"{__name__}:Service.handle"]["track_allocations"])
+        self.assertEqual(get_performance_stats()["Service.handle"]["alloc_calls"], 1)
+        detach(f"{__name__}:Service.handle")
+        self.assertFalse(
+            getattr(vars(Service)["handle"], "__performance_monitored__", False)
+        )
+
+    def test_unknown_target(self) -> None:
+        """Test missing attributes are reported"""
+        with self.assertRaises(ValueError):
+            attach(f"{__name__}:missing")
+
+    def test_dump_stats(self) -> None:
+        """Test stats are written as JSON"""
+        attach(f"{__name__}:lookup")
+        globals()["lookup"]("x")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stats.json")
+            self.assertEqual(dump_stats(path), 1)
+            with open(path, encoding="utf-8") as handle:
+                self.assertEqual(json.load(handle)["lookup"]["call_count"], 1)
+
+    def test_dump_stats_is_strict_json(self) -> None:
+        """Test the unset min_time of a running first call is written as null"""
+        _init_function_stats("lookup")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stats.json")
+            dump_stats(path)
+            with open(path, encoding="utf-8") as handle:
+                text = handle.read()
+        self.assertNotIn("Infinity", text)
+        self.assertIsNone(json.loads(text)["lookup"]["min_time"])
+
+
+@unittest.skipUnless(hasattr(signal, "SIGHUP"), "needs SIGHUP and UNIX sockets")
+class TestControlChannels(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        apply_config({})
+        self.directory.cleanup()
+
+    def test_socket_commands(self) -> None:
+        """Test attach, list, dump and detach over the control socket"""
+        path = os.path.join(self.directory.name, "control.sock")
+        server = start_control_server(path)
+        try:
+            target = f"{__name__}:lookup"
+            response = send_command(path, {"cmd": "attach", "target": target})
+            self.assertEqual(response, {"ok": True})
+            globals()["lookup"]("y")
+
+            listed = send_command(path, {"cmd": "list"})
+            self.assertIn(target, listed["attached"])
+
+            dump_path = os.path.join(self.directory.name, "dump.json")
+            dumped = send_command(path, {"cmd": "dump", "path": dump_path})
+            self.assertEqual(dumped["functions"], 1)
+
+            self.assertEqual(
+                send_command(path, {"cmd": "detach", "target": target}), {"ok": True}
+            )
+            self.assertFalse(send_command(path, {"cmd": "bogus"})["ok"])
+        finally:
+            server.stop()
+        self.assertFalse(os.path.exists(path))
+
+    def test_socket_permissions(self) -> None:
+        """Test the socket is private and only stale sockets are replaced"""
+        path = os.path.join(self.directory.name, "control.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        server = start_control_server(path)
+        try:
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode) & 0o077, 0)
+        finally:
+            server.stop()
+
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write("keep me")
+        with self.assertRaises(FileExistsError):
+            start_control_server(path)
+        with open(path, encoding="utf-8") as handle:
+            self.assertEqual(handle.read(), "keep me")
+
+    def test_signal_reload(self) -> None:
+        """Test sending the signal applies the config file"""
+        config_path = os.path.join(self.directory.name, "monitor.json")
+        with open(config_path, "w", encoding="utf-8") as handle:
+            json.dump({"functions": {f"{__name__}:Service.handle": {}}}, handle)
+
+        previous = signal.getsignal(signal.SIGHUP)
+        install_reload_signal(config_path)
+        try:
+            os.kill(os.getpid(), signal.SIGHUP)
+            deadline = time.monotonic() + 2
+            while not attached() and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            signal.signal(signal.SIGHUP, previous)
+
+        self.assertIn(f"{__name__}:Service.handle", attached())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import threading
+import time
+import unittest
+
+from performance_tracker import (
+    MonitoredProcessPoolExecutor,
+    MonitoredThreadPoolExecutor,
+    get_performance_stats,
+    merge_performance_stats,
+    performance_monitor,
+    reset_performance_stats,
+)
+
+
+@performance_monitor(verbose=False, track_memory=False)
+def child_work(n: int) -> int:
+    """Monitored helper called inside worker processes"""
+    return sum(range(n))
+
+
+def process_task(n: int) -> int:
+    return child_work(n) + child_work(n)
+
+
+def failing_task() -> None:
+    raise KeyError("missing")
+
+
+class TestThreadPoolExecutor(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_queue_wait_recorded(self) -> None:
+        """Test tasks queued behind a busy worker record their wait"""
+
+        def sleeper() -> None:
+            time.sleep(0.02)
+
+        with MonitoredThreadPoolExecutor(max_workers=1) as pool:
+            futures = [pool.submit(sleeper) for _ in range(3)]
+            for future in futures:
+                future.result()
+
+        stats = get_performance_stats()["sleeper"]
+        self.assertEqual(stats["task_count"], 3)
+        self.assertGreaterEqual(stats["task_run_time"], 0.06)
+        # The third task waits for the two before it
+        self.assertGreaterEqual(stats["max_queue_wait"], 0.035)
+        self.assertGreaterEqual(stats["queue_wait_time"], stats["max_queue_wait"])
+
+    def test_utilization(self) -> None:
+        """Test utilization reports busy time per task function"""
+        release = threading.Event()
+
+        def blocked() -> None:
+            release.wait(1)
+
+        with MonitoredThreadPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(blocked) for _ in range(2)]
+            time.sleep(0.03)
+            release.set()
+            for future in futures:
+                future.result()
+            report = pool.utilization()
+
+        self.assertEqual(report["workers"], 2)
+        self.assertGreater(report["utilization"], 0.5)
+        self.assertLessEqual(report["utilization"], 1.0)
+        self.assertIn("blocked", report["by_function"])
+        self.assertEqual(report["queue_wait"]["blocked"]["count"], 2)
+
+    def test_monitored_task_uses_monitor_name(self) -> None:
+        """Test monitored tasks record under their monitor name"""
+
+        @performance_monitor(verbose=False, track_memory=False, name="job")
+        def task() -> int:
+            return 1
+
+        with MonitoredThreadPoolExecutor(max_workers=1) as pool:
+            self.assertEqual(pool.submit(task).result(), 1)
+
+        stats = get_performance_stats()["job"]
+        self.assertEqual(stats["call_count"], 1)
+        self.assertEqual(stats["task_count"], 1)
+
+    def test_exceptions_propagate(self) -> None:
+        """Test a failing task still records its timing"""
+        with MonitoredThreadPoolExecutor(max_workers=1) as pool:
+            with self.assertRaises(KeyError):
+                pool.submit(failing_task).result()
+
+        self.assertEqual(get_performance_stats()["failing_task"]["task_count"], 1)
+
+
+class TestProcessPoolExecutor(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_child_stats_merged(self) -> None:
+        """Test monitored calls made in workers reach the parent's stats"""
+        with MonitoredProcessPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(process_task, range(100, 110)))
+
+        self.assertEqual(results, [2 * sum(range(n)) for n in range(100, 110)])
+        stats = get_performance_stats()
+        self.assertEqual(stats["child_work"]["call_count"], 20)
+        self.assertEqual(len(stats["child_work"]["times"]), 20)
+        self.assertEqual(stats["process_task"]["task_count"], 10)
+
+    def test_exceptions_propagate(self) -> None:
+        """Test exceptions raised in workers reach the caller"""
+        with MonitoredProcessPoolExecutor(max_workers=1) as pool:
+            with self.assertRaises(KeyError):
+                pool.submit(failing_task).result()
+
+        self.assertEqual(get_performance_stats()["failing_task"]["task_count"], 1)
+
+
+class TestMergeStats(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_merge_combines_entries(self) -> None:
+        """Test counters add and min/max combine when merging"""
+
+        @performance_monitor(verbose=False, track_memory=False)
+        def merged() -> None:
+            time.sleep(0.001)
+
+        merged()
+        snapshot = {
+            name: dict(entry, times=list(entry["times"]))
+            for name, entry in get_performance_stats().items()
+        }
+        merge_performance_stats(snapshot)
+
+        stats = get_performance_stats()["merged"]
+        self.assertEqual(stats["call_count"], 2)
+        self.assertEqual(len(stats["times"]), 2)
+        self.assertEqual(stats["min_time"], snapshot["merged"]["min_time"])
+        self.assertEqual(stats["max_time"], snapshot["merged"]["max_time"])
+
+
+if __name__ == "__main__":
+    unittest.main()
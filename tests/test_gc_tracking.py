@@ -0,0 +1,80 @@
+import gc
+import unittest
+
+from performance_tracker import (
+    disable_gc_tracking,
+    enable_gc_tracking,
+    get_performance_stats,
+    is_gc_tracking_enabled,
+    performance_monitor,
+    reset_performance_stats,
+)
+
+
+class TestGCTracking(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats and install the GC hook before each test"""
+        reset_performance_stats()
+        enable_gc_tracking()
+
+    def tearDown(self) -> None:
+        disable_gc_tracking()
+
+    def test_enable_disable(self) -> None:
+        """Test that the callback is installed exactly once and removed"""
+        enable_gc_tracking()
+        self.assertTrue(is_gc_tracking_enabled())
+        self.assertEqual(gc.callbacks.count(gc.callbacks[-1]), 1)
+
+        disable_gc_tracking()
+        self.assertFalse(is_gc_tracking_enabled())
+
+    def test_collection_attributed_to_active_call(self) -> None:
+        """Test that a full collection inside a call is charged to it"""
+
+        @performance_monitor(track_memory=False, verbose=False)
+        def collecting_func() -> None:
+            gc.collect()
+
+        collecting_func()
+
+        stats = get_performance_stats()["collecting_func"]
+        self.assertGreaterEqual(stats["gc_collections"][2], 1)
+        self.assertGreater(stats["gc_pause_time"], 0)
+        self.assertLessEqual(stats["gc_pause_time"], stats["total_time"])
+        self.assertGreater(stats["max_gc_pause"], 0)
+
+    def test_nested_calls_both_charged(self) -> None:
+        """Test that outer and inner monitored calls both see the pause"""
+
+        @performance_monitor(track_memory=False, verbose=False)
+        def inner() -> None:
+            gc.collect()
+
+        @performance_monitor(track_memory=False, verbose=False)
+        def outer() -> None:
+            inner()
+
+        outer()
+
+        stats = get_performance_stats()
+        self.assertGreaterEqual(stats["inner"]["gc_collections"][2], 1)
+        self.assertGreaterEqual(stats["outer"]["gc_collections"][2], 1)
+
+    def test_collection_outside_call_ignored(self) -> None:
+        """Test that collections with no active call are not attributed"""
+
+        @performance_monitor(track_memory=False, verbose=False)
+        def idle_func() -> None:
+            pass
+
+        idle_func()
+        gc.collect()
+
+        stats = get_performance_stats()["idle_func"]
+        self.assertEqual(stats["gc_collections"], [0, 0, 0])
+        self.assertEqual(stats["gc_pause_time"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import random
+import unittest
+
+from performance_tracker import LatencyHistogram
+from performance_tracker.histogram import log_buckets
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_log_buckets(self) -> None:
+        """Test geometric bucket bounds and argument validation"""
+        self.assertEqual(log_buckets(1, 2, 4), (1, 2, 4, 8))
+        with self.assertRaises(ValueError):
+            log_buckets(0, 2, 4)
+
+    def test_record_and_summary(self) -> None:
+        """Test exact count, sum, min and max alongside bucket counts"""
+        histogram = LatencyHistogram(bounds=(1, 2, 4))
+        for value in (0.5, 1.5, 3, 10):
+            histogram.record(value)
+
+        self.assertEqual(histogram.counts, [1, 1, 1, 1])
+        self.assertEqual(histogram.count, 4)
+        self.assertEqual(histogram.min, 0.5)
+        self.assertEqual(histogram.max, 10)
+        self.assertAlmostEqual(histogram.mean, 3.75)
+        self.assertEqual(histogram.to_dict()["buckets"]["+Inf"], 1)
+
+    def test_percentile_accuracy(self) -> None:
+        """Test percentile estimates stay within one bucket of the truth"""
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(-6, 1) for _ in range(10000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for q in (50, 90, 99):
+            exact = values[int(q / 100 * len(values)) - 1]
+            self.assertAlmostEqual(histogram.percentile(q), exact, delta=exact)
+        self.assertEqual(histogram.percentile(100), values[-1])
+        self.assertEqual(LatencyHistogram().percentile(50), 0.0)
+
+    def test_merge(self) -> None:
+        """Test merging histograms with matching bounds only"""
+        first = LatencyHistogram(bounds=(1, 2))
+        second = LatencyHistogram(bounds=(1, 2))
+        first.record(0.5)
+        second.record(1.5)
+        first.merge(second)
+        self.assertEqual(first.counts, [1, 1, 0])
+        self.assertEqual(first.max, 1.5)
+
+        with self.assertRaises(ValueError):
+            first.merge(LatencyHistogram(bounds=(1, 3)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import subprocess
+import sys
+import unittest
+
+import performance_tracker
+
+# Generous ceiling for the whole package import, including stdlib modules it
+# pulls in (typing, threading); a regression to eager imports of optional
+# subsystems or third-party libraries shows up well above this.
+IMPORT_BUDGET_US = 150_000
+
+LAZY_MODULES = (
+    "performance_tracker.analysis",
+    "performance_tracker.gc_tracking",
+    "performance_tracker.report",
+    "performance_tracker.instrument",
+    "performance_tracker.spans",
+    "performance_tracker.middleware",
+    "performance_tracker.histogram",
+    "performance_tracker.cache",
+    "performance_tracker.sketches",
+    "performance_tracker.executors",
+    "performance_tracker.loop_monitor",
+    "performance_tracker.profiler",
+    "performance_tracker.control",
+    "performance_tracker.snapshots",
+    "performance_tracker.overhead",
+    "performance_tracker.labels",
+    "performance_tracker.timeline",
+    "performance_tracker.statsd",
+    "performance_tracker.watchdog",
+    "performance_tracker.locks",
+    "asyncio",
+    "tracemalloc",
+    "numpy",
+    "pyarrow",
+)
+
+
+def _import_times(statement: str) -> dict[str, int]:
+    """Run ``statement`` with ``-X importtime``; return cumulative us per module"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+    def test_lean_import(self) -> None:
+        """Test that importing the package skips optional subsystems"""
+        times = _import_times("import performance_tracker")
+        self.assertIn("performance_tracker", times)
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, times)
+
+    def test_import_budget(self) -> None:
+        """Test that the package import stays within its time budget"""
+        # Best of three to ignore a cold filesystem cache on the first run
+        best = min(
+            _import_times("import performance_tracker")["performance_tracker"]
+            for _ in range(3)
+        )
+        self.assertLess(best, IMPORT_BUDGET_US)
+
+    def test_decorating_without_memory_skips_tracemalloc(self) -> None:
+        """Test that the memory backend is only loaded when requested"""
+        times = _import_times(
+            "import performance_tracker as pt\n"
+            "pt.performance_monitor(track_memory=False)(len)\n"
+            "import sys\n"
+            "assert 'tracemalloc' not in sys.modules"
+        )
+        self.assertNotIn("tracemalloc", times)
+
+
+class TestLazyAttributes(unittest.TestCase):
+    def test_lazy_names_resolve(self) -> None:
+        """Test that lazily exported names import their module on access"""
+        from performance_tracker import columnar_stats, enable_gc_tracking
+
+        self.assertTrue(callable(columnar_stats))
+        self.assertTrue(callable(enable_gc_tracking))
+        self.assertIn("columnar_stats", dir(performance_tracker))
+
+    def test_unknown_name(self) -> None:
+        """Test that unknown attributes still raise AttributeError"""
+        with self.assertRaises(AttributeError):
+            performance_tracker.not_a_real_name
+
+
+if __name__ == "__main__":
+    unittest.main()
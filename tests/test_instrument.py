@@ -0,0 +1,192 @@
+import os
+import sys
+import tempfile
+import textwrap
+import types
+import unittest
+
+from performance_tracker import (
+    get_performance_stats,
+    install_import_hook,
+    instrument_class,
+    instrument_module,
+    reset_performance_stats,
+    uninstall_import_hook,
+    uninstrument_class,
+    uninstrument_module,
+)
+
+
+class Service:
+    def fetch(self, key: str) -> str:
+        return key.upper()
+
+    def store(self, key: str) -> None:
+        pass
+
+    def _helper(self) -> int:
+        return 1
+
+    @staticmethod
+    def build() -> "Service":
+        return Service()
+
+    @classmethod
+    def name(cls) -> str:
+        return cls.__name__
+
+    @property
+    def size(self) -> int:
+        return 0
+
+
+class TestInstrumentClass(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def tearDown(self) -> None:
+        uninstrument_class(Service)
+
+    def test_methods_wrapped_and_restored(self) -> None:
+        """Test all method kinds are wrapped and restored exactly"""
+        original_fetch = Service.__dict__["fetch"]
+        wrapped = instrument_class(Service)
+        self.assertEqual(
+            sorted(wrapped), ["_helper", "build", "fetch", "name", "store"]
+        )
+
+        self.assertEqual(Service().fetch("a"), "A")
+        self.assertIsInstance(Service.build(), Service)
+        self.assertEqual(Service.name(), "Service")
+        self.assertEqual(Service().size, 0)
+
+        stats = get_performance_stats()
+        self.assertEqual(stats["Service.fetch"]["call_count"], 1)
+        self.assertEqual(stats["Service.build"]["call_count"], 1)
+        self.assertEqual(stats["Service.name"]["call_count"], 1)
+
+        uninstrument_class(Service)
+        self.assertIs(Service.__dict__["fetch"], original_fetch)
+        self.assertIsInstance(Service.__dict__["build"], staticmethod)
+
+    def test_include_exclude(self) -> None:
+        """Test glob include and exclude patterns"""
+        self.assertEqual(instrument_class(Service, include="f*"), ["fetch"])
+        uninstrument_class(Service)
+        self.assertEqual(
+            sorted(instrument_class(Service, exclude=["_*", "b*", "n*"])),
+            ["fetch", "store"],
+        )
+
+    def test_instrumenting_twice_is_a_no_op(self) -> None:
+        """Test that already monitored methods are not wrapped again"""
+        instrument_class(Service)
+        self.assertEqual(instrument_class(Service), [])
+        Service().store("x")
+        self.assertEqual(get_performance_stats()["Service.store"]["call_count"], 1)
+
+
+def _make_module(name: str) -> types.ModuleType:
+    module = types.ModuleType(name)
+    exec(
+        textwrap.dedent(
+            """
+            from os.path import join
+
+            def add(a, b):
+                return a + b
+
+            def _private():
+                return None
+
+            class Worker:
+                def run(self):
+                    return "ran"
+            """
+        ),
+        module.__dict__,
+    )
+    return module
+
+
+class TestInstrumentModule(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_module_functions(self) -> None:
+        """Test that only functions defined in the module are wrapped"""
+        module = _make_module("sample_module")
+        original_add = module.add
+
+        self.assertEqual(sorted(instrument_module(module)), ["_private", "add"])
+        self.assertEqual(module.add(1, 2), 3)
+        self.assertEqual(get_performance_stats()["add"]["call_count"], 1)
+        self.assertIs(module.join, os.path.join)
+
+        uninstrument_module(module)
+        self.assertIs(module.add, original_add)
+
+    def test_module_classes(self) -> None:
+        """Test instrumenting the classes defined in a module"""
+        module = _make_module("sample_module")
+        original_run = module.Worker.run
+
+        wrapped = instrument_module(module, exclude="_*", classes=True)
+        self.assertEqual(sorted(wrapped), ["Worker.run", "add"])
+        self.assertEqual(module.Worker().run(), "ran")
+        self.assertEqual(get_performance_stats()["Worker.run"]["call_count"], 1)
+
+        uninstrument_module(module)
+        self.assertIs(module.Worker.run, original_run)
+
+
+class TestImportHook(unittest.TestCase):
+    def setUp(self) -> None:
+        """Create a throwaway package on sys.path"""
+        reset_performance_stats()
+        self.tempdir = tempfile.TemporaryDirectory()
+        package = os.path.join(self.tempdir.name, "hooked_pkg")
+        os.mkdir(package)
+        with open(os.path.join(package, "__init__.py"), "w") as f:
+            f.write("def top():\n    return 'top'\n")
+        with open(os.path.join(package, "jobs.py"), "w") as f:
+            f.write("def work(n):\n    return n * 2\n")
+        with open(os.path.join(self.tempdir.name, "unhooked_mod.py"), "w") as f:
+            f.write("def other():\n    return 'other'\n")
+        sys.path.insert(0, self.tempdir.name)
+
+    def tearDown(self) -> None:
+        sys.path.remove(self.tempdir.name)
+        for name in ("hooked_pkg", "hooked_pkg.jobs", "unhooked_mod"):
+            sys.modules.pop(name, None)
+        self.tempdir.cleanup()
+
+    def test_modules_under_prefix_instrumented(self) -> None:
+        """Test that only modules under the prefix are instrumented"""
+        hook = install_import_hook("hooked_pkg")
+        try:
+            import hooked_pkg.jobs
+            import unhooked_mod
+
+            self.assertEqual(hooked_pkg.top(), "top")
+            self.assertEqual(hooked_pkg.jobs.work(2), 4)
+            self.assertEqual(unhooked_mod.other(), "other")
+
+            stats = get_performance_stats()
+            self.assertEqual(stats["top"]["call_count"], 1)
+            self.assertEqual(stats["work"]["call_count"], 1)
+            self.assertNotIn("other", stats)
+            self.assertEqual(hook.modules, ["hooked_pkg", "hooked_pkg.jobs"])
+        finally:
+            uninstall_import_hook(hook)
+
+        self.assertNotIn(hook, sys.meta_path)
+        self.assertFalse(
+            getattr(hooked_pkg.jobs.work, "__performance_monitored__", False)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
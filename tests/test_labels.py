@@ -0,0 +1,148 @@
+import asyncio
+import unittest
+
+from performance_tracker import (
+    bind_labels,
+    current_labels,
+    delta,
+    get_performance_stats,
+    merge_performance_stats,
+    performance_monitor,
+    reset_performance_stats,
+    take_snapshot,
+)
+from performance_tracker.labels import OTHER, label_key
+from performance_tracker.report import format_performance_report
+
+
+@performance_monitor(verbose=False, track_memory=False, labels=True)
+def handle() -> int:
+    return 1
+
+
+@performance_monitor(
+    verbose=False,
+    track_memory=False,
+    labels=lambda tenant, fail=False: {"tenant": tenant},
+    max_labels=3,
+)
+def query(tenant: str, fail: bool = False) -> str:
+    if fail:
+        raise ValueError(tenant)
+    return tenant
+
+
+class TestLabels(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_bound_labels_nest_and_reset(self) -> None:
+        """Test nested blocks add to the enclosing labels and restore them"""
+        with bind_labels(endpoint="/users"):
+            with bind_labels(shard=3):
+                self.assertEqual(current_labels(), {"endpoint": "/users", "shard": "3"})
+                handle()
+            handle()
+        handle()
+        self.assertEqual(current_labels(), {})
+
+        rows = get_performance_stats()["handle"]["labels"]
+        self.assertEqual(set(rows), {"endpoint=/users,shard=3", "endpoint=/users"})
+        self.assertEqual(rows["endpoint=/users"]["calls"], 1)
+        self.assertEqual(get_performance_stats()["handle"]["call_count"], 3)
+
+    def test_labels_follow_asyncio_tasks(self) -> None:
+        """Test each task records its own bound labels"""
+
+        async def request(tenant: str) -> None:
+            with bind_labels(tenant=tenant):
+                await asyncio.sleep(0)
+                handle()
+
+        async def main() -> None:
+            await asyncio.gather(request("a"), request("b"), request("a"))
+
+        asyncio.run(main())
+        rows = get_performance_stats()["handle"]["labels"]
+        self.assertEqual(rows["tenant=a"]["calls"], 2)
+        self.assertEqual(rows["tenant=b"]["calls"], 1)
+
+    def test_extractor_records_failures(self) -> None:
+        """Test labels derived from arguments, with failures per row"""
+        query("acme")
+        with self.assertRaises(ValueError):
+            query("acme", fail=True)
+
+        row = get_performance_stats()["query"]["labels"]["tenant=acme"]
+        self.assertEqual((row["calls"], row["failures"]), (2, 1))
+        self.assertEqual(sum(row["latency"]), 2)
+        self.assertEqual(label_key({"b": 1, "a": 2}), "a=2,b=1")
+
+    def test_invalid_extractor_results_are_dropped(self) -> None:
+        """Test non-mapping extractor results never break the call"""
+        for result in (("tenant", "a"), "tenant=a", ["tenant"], [], 1):
+
+            @performance_monitor(
+                verbose=False, track_memory=False, labels=lambda: result
+            )
+            def odd() -> int:
+                return 1
+
+            with bind_labels(shard=1):
+                self.assertEqual(odd(), 1)
+            self.assertEqual(odd(), 1)
+
+        stats = get_performance_stats()["odd"]
+        self.assertEqual(stats["call_count"], 10)
+        self.assertEqual(list(stats["labels"]), ["shard=1"])
+        self.assertEqual(stats["labels"]["shard=1"]["calls"], 5)
+
+    def test_cap_folds_rare_labels_into_other(self) -> None:
+        """Test the table stays bounded and heavy hitters keep their rows"""
+        for i in range(200):
+            query("big" if i % 2 else f"tenant{i}")
+
+        rows = get_performance_stats()["query"]["labels"]
+        self.assertLessEqual(len(rows), 4)
+        self.assertEqual(rows["tenant=big"]["calls"], 100)
+        self.assertEqual(sum(row["calls"] for row in rows.values()), 200)
+        self.assertGreater(rows[OTHER]["calls"], 0)
+
+        report = format_performance_report(output="detailed")
+        self.assertIn("Labels:", report)
+        self.assertIn("tenant=big: 100 calls", report)
+
+    def test_merge_enforces_cap(self) -> None:
+        """Test merged label tables are brought back under the cap"""
+        for tenant in ("a", "a", "b", "c"):
+            query(tenant)
+        worker = get_performance_stats()
+        reset_performance_stats()
+        query("a")
+        query("d")
+
+        merge_performance_stats(worker)
+        rows = get_performance_stats()["query"]["labels"]
+        self.assertLessEqual(len(rows) - (OTHER in rows), 3)
+        self.assertEqual(rows["tenant=a"]["calls"], 3)
+        self.assertEqual(sum(row["calls"] for row in rows.values()), 6)
+
+    def test_snapshot_delta_of_label_rows(self) -> None:
+        """Test deltas carry per-row call and histogram differences"""
+        query("a")
+        since = take_snapshot()
+        query("a")
+        query("b")
+
+        _, changes = delta(since)
+        rows = changes["query"]["labels"]
+        self.assertEqual(rows["tenant=a"]["calls"], 1)
+        self.assertEqual(sum(rows["tenant=a"]["latency"]), 1)
+        self.assertEqual(rows["tenant=b"]["calls"], 1)
+        with self.assertRaises(TypeError):
+            since["query"]["labels"]["tenant=a"]["latency"][0] = 5
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+import os
+import threading
+import unittest
+
+from performance_tracker import (
+    MonitoredBoundedSemaphore,
+    MonitoredCondition,
+    MonitoredLock,
+    MonitoredRLock,
+    MonitoredSemaphore,
+    get_lock_stats,
+    get_performance_stats,
+    patch_threading,
+    performance_monitor,
+    reset_lock_stats,
+    reset_performance_stats,
+    unpatch_threading,
+)
+from performance_tracker.locks import is_threading_patched
+from performance_tracker.report import format_performance_report
+
+shared = MonitoredLock("shared")
+held = threading.Event()
+release = threading.Event()
+
+
+@performance_monitor(verbose=False, track_memory=False)
+def holder() -> None:
+    with shared:
+        held.set()
+        release.wait(5)
+
+
+@performance_monitor(verbose=False, track_memory=False)
+def waiter() -> None:
+    with shared:
+        pass
+
+
+class TestMonitoredLocks(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset function and lock stats"""
+        reset_performance_stats()
+        reset_lock_stats()
+        held.clear()
+        release.clear()
+
+    def test_contention_is_charged_to_the_waiting_function(self) -> None:
+        """A blocked acquire records the wait on the lock and the function"""
+        holding = threading.Thread(target=holder)
+        holding.start()
+        held.wait(5)
+        waiting = threading.Thread(target=waiter)
+        waiting.start()
+        threading.Event().wait(0.05)
+        release.set()
+        holding.join()
+        waiting.join()
+
+        lock = get_lock_stats()["shared"]
+        self.assertEqual(lock["acquisitions"], 2)
+        self.assertEqual(lock["contended"], 1)
+        self.assertEqual(lock["contention_rate"], 0.5)
+        self.assertGreater(lock["wait_time"], 0.03)
+        self.assertGreater(lock["max_hold"], 0.03)
+        self.assertEqual(list(lock["functions"]), ["waiter"])
+
+        stats = get_performance_stats()
+        self.assertEqual(stats["waiter"]["lock_waits"], 1)
+        self.assertGreater(stats["waiter"]["lock_wait_time"], 0.03)
+        self.assertEqual(stats["holder"]["lock_waits"], 0)
+        self.assertIn("Lock Wait", format_performance_report())
+        self.assertIn("Locks:", format_performance_report(output="detailed"))
+
+    def test_failed_acquire_is_counted(self) -> None:
+        """Non-blocking and timed-out acquires count as failed"""
+        lock = MonitoredLock("busy")
+        self.assertTrue(lock.acquire())
+        self.assertFalse(lock.acquire(blocking=False))
+        self.assertFalse(lock.acquire(timeout=0.01))
+        lock.release()
+        stats = get_lock_stats()["busy"]
+        self.assertEqual((stats["acquisitions"], stats["failed"]), (1, 2))
+        self.assertEqual(stats["contended"], 1)
+
+    def test_rlock_records_one_hold_per_outermost_acquire(self) -> None:
+        """Reentrant acquires are one hold; foreign releases are refused"""
+        lock = MonitoredRLock()
+        with lock:
+            with lock:
+                pass
+            self.assertTrue(lock._is_owned())
+        self.assertFalse(lock._is_owned())
+        self.assertRaises(RuntimeError, lock.release)
+        self.assertTrue(lock.name.startswith("test_locks.py:"))
+        stats = get_lock_stats()[lock.name]
+        self.assertEqual((stats["acquisitions"], stats["holds"]), (2, 1))
+
+    def test_condition_wait_and_notify(self) -> None:
+        """Conditions work over both monitored lock types"""
+        for lock in (None, MonitoredLock("plain")):
+            condition = MonitoredCondition(lock, name="rlock")
+            ready = []
+
+            def produce() -> None:
+                with condition:
+                    ready.append(1)
+                    condition.notify()
+
+            with condition:
+                thread = threading.Thread(target=produce)
+                thread.start()
+                self.assertTrue(condition.wait_for(lambda: ready, timeout=5))
+            thread.join()
+        self.assertIn("rlock", get_lock_stats())
+        self.assertIn("plain", get_lock_stats())
+
+    def test_semaphores(self) -> None:
+        """Semaphores record holds and bounded ones refuse extra releases"""
+        semaphore = MonitoredSemaphore(2, name="pool")
+        with semaphore:
+            self.assertTrue(semaphore.acquire())
+            self.assertFalse(semaphore.acquire(timeout=0.01))
+            semaphore.release()
+        stats = get_lock_stats()["pool"]
+        self.assertEqual((stats["acquisitions"], stats["failed"]), (2, 1))
+        self.assertEqual(stats["holds"], 2)
+
+        bounded = MonitoredBoundedSemaphore(1, name="bounded")
+        with bounded:
+            pass
+        self.assertRaises(ValueError, bounded.release)
+
+    def test_patch_threading(self) -> None:
+        """Patching makes threading create monitored locks until unpatched"""
+        original = threading.Lock
+        patch_threading()
+        self.addCleanup(unpatch_threading)
+        self.assertTrue(is_threading_patched())
+        lock = threading.Lock()
+        self.assertIsInstance(lock, MonitoredLock)
+        self.assertIsInstance(threading.RLock(), MonitoredRLock)
+        self.assertIsInstance(threading.Semaphore(), MonitoredSemaphore)
+        event = threading.Event()
+        event.set()
+        self.assertTrue(event.wait(1))
+
+        unpatch_threading()
+        self.assertFalse(is_threading_patched())
+        self.assertIs(threading.Lock, original)
+        with lock:
+            pass
+        self.assertIn(lock.name, get_lock_stats())
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs os.fork")
+    def test_fork_while_patched(self) -> None:
+        """Forking reinitializes monitored locks and the child's threads"""
+        patch_threading()
+        self.addCleanup(unpatch_threading)
+        held_lock = MonitoredLock("held")
+        held_rlock = MonitoredRLock("held-r")
+        held_lock.acquire()
+        held_rlock.acquire()
+        self.addCleanup(held_lock.release)
+        self.addCleanup(held_rlock.release)
+        worker = threading.Thread(target=lambda: None)
+        worker.start()
+        worker.join()
+
+        pid = os.fork()
+        if pid == 0:
+            # Child: exit status 0 only if every check passes
+            try:
+                held_lock._at_fork_reinit()
+                held_rlock._at_fork_reinit()
+                ok = (
+                    threading.enumerate() == [threading.current_thread()]
+                    and held_lock.acquire(blocking=False)
+                    and held_rlock.acquire(blocking=False)
+                )
+                thread = threading.Thread(target=lambda: None)
+                thread.start()
+                thread.join()
+            except BaseException:
+                ok = False
+            os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import asyncio
+import time
+import unittest
+from asyncio import events
+
+from performance_tracker import (
+    LoopMonitor,
+    get_performance_stats,
+    monitor_event_loop,
+    performance_monitor,
+    reset_performance_stats,
+)
+from performance_tracker.report import format_performance_report
+
+
+class TestAsyncDecorator(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_coroutine_is_timed(self) -> None:
+        """Test decorated coroutines are awaited and timed to completion"""
+
+        @performance_monitor(verbose=False)
+        async def fetch(value: int) -> int:
+            await asyncio.sleep(0.01)
+            return value * 2
+
+        self.assertTrue(asyncio.iscoroutinefunction(fetch))
+        self.assertEqual(asyncio.run(fetch(21)), 42)
+
+        stats = get_performance_stats()["fetch"]
+        self.assertEqual(stats["call_count"], 1)
+        self.assertEqual(stats["success_count"], 1)
+        self.assertGreaterEqual(stats["total_time"], 0.009)
+
+    def test_coroutine_failure(self) -> None:
+        """Test exceptions from coroutines are counted as failures"""
+
+        @performance_monitor(verbose=False)
+        async def broken() -> None:
+            raise ValueError("bad")
+
+        with self.assertRaises(ValueError):
+            asyncio.run(broken())
+        self.assertEqual(get_performance_stats()["broken"]["failure_count"], 1)
+
+    def test_cancellation_propagates(self) -> None:
+        """Test cancelling a monitored coroutine raises CancelledError
+
+        The cancellation is recorded as a failure.
+        """
+
+        @performance_monitor(verbose=False)
+        async def slow() -> None:
+            await asyncio.sleep(10)
+
+        async def main() -> None:
+            task = asyncio.ensure_future(slow())
+            await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(slow(), 0.01)
+
+        asyncio.run(main())
+        stats = get_performance_stats()["slow"]
+        self.assertEqual(stats["failure_count"], 2)
+        (failure,) = stats["failures"].values()
+        self.assertEqual(failure["count"], 2)
+
+
+class TestLoopMonitor(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_slow_callback_attributed_to_coroutine(self) -> None:
+        """Test a blocking step is charged to the monitored coroutine"""
+
+        @performance_monitor(verbose=False)
+        async def blocking_handler() -> None:
+            time.sleep(0.05)
+            await asyncio.sleep(0)
+
+        async def main() -> LoopMonitor:
+            async with LoopMonitor(
+                slow_callback_threshold=0.02, probe_interval=0.01
+            ) as monitor:
+                await asyncio.sleep(0.02)
+                await blocking_handler()
+                await asyncio.sleep(0.02)
+            return monitor
+
+        monitor = asyncio.run(main())
+
+        stats = get_performance_stats()["blocking_handler"]
+        self.assertEqual(stats["slow_callbacks"], 1)
+        self.assertGreaterEqual(stats["max_loop_block"], 0.045)
+        self.assertEqual(monitor.slow_callbacks["blocking_handler"].count, 1)
+        # The probe was held up by the blocking step
+        self.assertGreaterEqual(monitor.lag.max, 0.03)
+
+        detailed = format_performance_report(output="detailed")
+        self.assertIn("Slow Callbacks: 1", detailed)
+
+    def test_unattributed_callback(self) -> None:
+        """Test slow callbacks outside monitored code are kept by name"""
+
+        def block() -> None:
+            time.sleep(0.03)
+
+        async def main() -> LoopMonitor:
+            monitor = monitor_event_loop(slow_callback_threshold=0.02)
+            asyncio.get_running_loop().call_soon(block)
+            await asyncio.sleep(0.05)
+            monitor.stop()
+            return monitor
+
+        monitor = asyncio.run(main())
+        self.assertIn("block", next(iter(monitor.stats()["slow_callbacks"])))
+        self.assertEqual(get_performance_stats(), {})
+
+    def test_hook_removed_after_stop(self) -> None:
+        """Test the callback hook is only installed while monitoring"""
+        original = events.Handle._run
+
+        async def main() -> None:
+            monitor = monitor_event_loop()
+            self.assertIsNot(events.Handle._run, original)
+            monitor.stop()
+
+        asyncio.run(main())
+        self.assertIs(events.Handle._run, original)
+
+
+if __name__ == "__main__":
+    unittest.main()
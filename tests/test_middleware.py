@@ -0,0 +1,230 @@
+import asyncio
+import http.client
+import threading
+import time
+import unittest
+from typing import Any, Callable, Iterator
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from performance_tracker import (
+    ASGIMiddleware,
+    WSGIMiddleware,
+    get_request_stats,
+    performance_monitor,
+    reset_performance_stats,
+    reset_request_stats,
+)
+from performance_tracker.middleware import in_flight_requests, template_path
+
+
+@performance_monitor(verbose=False, track_memory=False)
+def load_user(user_id: str) -> bytes:
+    return f"user {user_id}".encode()
+
+
+def wsgi_app(environ: dict[str, Any], start_response: Callable[..., Any]) -> Any:
+    path = environ["PATH_INFO"]
+    if path.startswith("/users/"):
+        body = load_user(path.rsplit("/", 1)[1])
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return [body]
+    if path == "/stream":
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return _stream()
+    if path == "/boom":
+        raise RuntimeError("handler crashed")
+    start_response("404 Not Found", [("Content-Type", "text/plain")])
+    return [b"missing"]
+
+
+def _stream() -> Iterator[bytes]:
+    for i in range(3):
+        yield load_user(str(i))
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class TestTemplatePath(unittest.TestCase):
+    def test_id_segments(self) -> None:
+        """Test numeric, hex and UUID segments are templated"""
+        self.assertEqual(template_path("/users/42"), "/users/{id}")
+        self.assertEqual(
+            template_path("/orders/123e4567-e89b-12d3-a456-426614174000/items"),
+            "/orders/{id}/items",
+        )
+        self.assertEqual(template_path("/blobs/deadbeefdeadbeef"), "/blobs/{id}")
+        self.assertEqual(template_path("/users/me"), "/users/me")
+
+
+class TestWSGIMiddleware(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = make_server(
+            "127.0.0.1",
+            0,
+            WSGIMiddleware(wsgi_app),
+            server_class=WSGIServer,
+            handler_class=_QuietHandler,
+        )
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        """Reset request and function stats before each test"""
+        reset_request_stats()
+        reset_performance_stats()
+
+    def request(self, method: str, path: str, body: bytes = b"") -> int:
+        return self.response(method, path, body).status
+
+    def response(
+        self, method: str, path: str, body: bytes = b""
+    ) -> http.client.HTTPResponse:
+        connection = http.client.HTTPConnection(*self.server.server_address)
+        try:
+            connection.request(method, path, body=body or None)
+            response = connection.getresponse()
+            response.read()
+        finally:
+            connection.close()
+        # With a Content-Length the client can finish reading before the
+        # server closes the body and records the request
+        deadline = time.monotonic() + 5
+        while in_flight_requests() and time.monotonic() < deadline:
+            time.sleep(0.001)
+        return response
+
+    def test_routes_templated_and_counted(self) -> None:
+        """Test requests to different IDs share one templated route"""
+        for user_id in (1, 2, 3):
+            self.assertEqual(self.request("GET", f"/users/{user_id}"), 200)
+        self.assertEqual(self.request("GET", "/nope"), 404)
+
+        stats = get_request_stats()
+        users = stats["GET /users/{id}"]
+        self.assertEqual(users["requests"], 3)
+        self.assertEqual(users["status_classes"], {"2xx": 3})
+        self.assertEqual(users["response_bytes"], len(b"user 1") * 3)
+        self.assertGreater(users["latency"]["p99"], 0)
+        self.assertEqual(stats["GET /nope"]["status_classes"], {"4xx": 1})
+        self.assertEqual(in_flight_requests(), 0)
+
+    def test_monitored_calls_attributed(self) -> None:
+        """Test decorated calls, including lazy body generators, are attributed"""
+        self.request("GET", "/users/7")
+        self.request("GET", "/stream")
+
+        stats = get_request_stats()
+        self.assertEqual(stats["GET /users/{id}"]["functions"]["load_user"]["calls"], 1)
+        self.assertEqual(stats["GET /stream"]["functions"]["load_user"]["calls"], 3)
+
+    def test_list_body_keeps_content_length(self) -> None:
+        """Test a one-item list body still gets a Content-Length header"""
+        response = self.response("GET", "/users/7")
+        self.assertEqual(response.getheader("Content-Length"), str(len(b"user 7")))
+        self.assertIsNone(self.response("GET", "/stream").getheader("Content-Length"))
+        self.assertEqual(get_request_stats()["GET /users/{id}"]["response_bytes"], 6)
+
+    def test_request_body_size(self) -> None:
+        """Test request body bytes are taken from Content-Length"""
+        self.request("POST", "/users/1", body=b"x" * 100)
+        self.assertEqual(get_request_stats()["POST /users/{id}"]["request_bytes"], 100)
+
+    def test_exception_counts_as_server_error(self) -> None:
+        """Test an application exception is recorded as a 5xx"""
+        self.assertEqual(self.request("GET", "/boom"), 500)
+        self.assertEqual(get_request_stats()["GET /boom"]["status_classes"], {"5xx": 1})
+
+
+async def asgi_app(scope: dict[str, Any], receive: Any, send: Any) -> None:
+    message = await receive()
+    user_id = scope["path"].rsplit("/", 1)[1]
+    body = load_user(user_id) + message.get("body", b"")
+    await asyncio.sleep(0.01)
+    await send({"type": "http.response.start", "status": 201, "headers": []})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _drive(app: Any, path: str, body: bytes = b"") -> list[dict[str, Any]]:
+    """Minimal in-process ASGI server: one request, collected responses"""
+    scope = {"type": "http", "method": "POST", "path": path, "headers": []}
+    sent: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent
+
+
+class TestASGIMiddleware(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset request and function stats before each test"""
+        reset_request_stats()
+        reset_performance_stats()
+
+    def test_concurrent_requests(self) -> None:
+        """Test latency, sizes, in-flight peak and attribution under concurrency"""
+        app = ASGIMiddleware(asgi_app)
+
+        async def main() -> None:
+            await asyncio.gather(
+                *(_drive(app, f"/users/{i}", body=b"abc") for i in range(5))
+            )
+
+        asyncio.run(main())
+
+        route = get_request_stats()["POST /users/{id}"]
+        self.assertEqual(route["requests"], 5)
+        self.assertEqual(route["status_classes"], {"2xx": 5})
+        self.assertEqual(route["request_bytes"], 15)
+        self.assertEqual(route["max_in_flight"], 5)
+        self.assertEqual(route["in_flight"], 0)
+        self.assertGreater(route["latency"]["min"], 0.005)
+        self.assertEqual(route["functions"]["load_user"]["calls"], 5)
+
+    def test_custom_route_resolver(self) -> None:
+        """Test a framework-supplied route template is used as the key"""
+        app = ASGIMiddleware(asgi_app, route_resolver=lambda scope: "/u/<name>")
+        asyncio.run(_drive(app, "/users/alice"))
+        self.assertIn("POST /u/<name>", get_request_stats())
+
+    def test_route_cap(self) -> None:
+        """Test routes past max_routes are counted under the other route"""
+        app = ASGIMiddleware(asgi_app, max_routes=2)
+
+        async def main() -> None:
+            for slug in ("a", "b", "c", "d"):
+                await _drive(app, f"/posts/{slug}")
+
+        asyncio.run(main())
+        stats = get_request_stats()
+        self.assertEqual(len(stats), 3)
+        self.assertEqual(stats["other"]["requests"], 2)
+
+    def test_non_http_passthrough(self) -> None:
+        """Test lifespan scopes are not measured"""
+        calls = []
+
+        async def lifespan_app(scope: Any, receive: Any, send: Any) -> None:
+            calls.append(scope["type"])
+
+        app = ASGIMiddleware(lifespan_app)
+        asyncio.run(app({"type": "lifespan"}, None, None))
+        self.assertEqual(calls, ["lifespan"])
+        self.assertEqual(get_request_stats(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
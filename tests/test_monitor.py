@@ -1,12 +1,22 @@
+import gc
 import time
+import tracemalloc
 import unittest
 from typing import Any
 
 from performance_tracker import (
     get_performance_stats,
+    mark_warm,
+    merge_performance_stats,
     performance_monitor,
     reset_performance_stats,
 )
+from performance_tracker.monitor import (
+    FunctionStats,
+    _record_function_stats,
+    performance_stats,
+)
+from performance_tracker.report import build_report_rows
 
 
 class TestPerformanceMonitor(unittest.TestCase):
@@ -199,5 +209,459 @@ class TestPerformanceMonitor(unittest.TestCase):
         self.assertEqual(stats["args_kwargs_func"]["call_count"], 1)
 
 
+class TestArgumentBuckets(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_size_buckets_are_powers_of_two(self) -> None:
+        """Test size_of buckets calls by power-of-two input size"""
+
+        @performance_monitor(verbose=False, track_memory=False, size_of=len)
+        def process_batch(items: list[int]) -> int:
+            return sum(items)
+
+        for size in (0, 1, 3, 5, 7, 8, 100):
+            process_batch(list(range(size)))
+
+        buckets = get_performance_stats()["process_batch"]["buckets"]
+        self.assertEqual(sorted(buckets), [0, 1, 2, 4, 8, 64])
+        self.assertEqual(buckets[4]["call_count"], 2)
+        self.assertEqual(buckets[4]["total_size"], 12)
+
+    def test_key_buckets(self) -> None:
+        """Test key= buckets calls by an arbitrary label"""
+
+        @performance_monitor(
+            verbose=False, track_memory=False, key=lambda query, **kw: kw["table"]
+        )
+        def run_query(query: str, table: str) -> str:
+            return query
+
+        run_query("select", table="users")
+        run_query("select", table="users")
+        run_query("select", table="orders")
+
+        buckets = get_performance_stats()["run_query"]["buckets"]
+        self.assertEqual(buckets["users"]["call_count"], 2)
+        self.assertEqual(buckets["orders"]["call_count"], 1)
+
+    def test_key_buckets_are_capped(self) -> None:
+        """Test key= labels past max_buckets share the other bucket"""
+
+        @performance_monitor(
+            verbose=False, track_memory=False, key=lambda n: n, max_buckets=3
+        )
+        def lookup(n: int) -> int:
+            return n
+
+        for n in range(10):
+            lookup(n)
+
+        stats = get_performance_stats()["lookup"]
+        self.assertEqual(sorted(stats["buckets"], key=str), [0, 1, 2, "other"])
+        self.assertEqual(stats["buckets"]["other"]["call_count"], 7)
+        self.assertEqual(stats["bucket_kind"], "key")
+
+    def test_broken_extractor_does_not_break_call(self) -> None:
+        """Test that a failing size_of leaves the call unaffected"""
+
+        @performance_monitor(verbose=False, track_memory=False, size_of=len)
+        def takes_int(n: int) -> int:
+            return n
+
+        self.assertEqual(takes_int(5), 5)
+        stats = get_performance_stats()["takes_int"]
+        self.assertEqual(stats["call_count"], 1)
+        self.assertEqual(stats["buckets"], {})
+
+    def test_unhashable_key_does_not_break_call(self) -> None:
+        """Test that a key= returning an unhashable value is skipped"""
+
+        @performance_monitor(verbose=False, track_memory=False, key=lambda n: [n])
+        def listed(n: int) -> int:
+            return n
+
+        self.assertEqual(listed(5), 5)
+        stats = get_performance_stats()["listed"]
+        self.assertEqual(stats["call_count"], 1)
+        self.assertEqual(stats["buckets"], {})
+
+    def test_key_and_size_of_exclusive(self) -> None:
+        """Test that key and size_of cannot be combined"""
+        with self.assertRaises(ValueError):
+            performance_monitor(key=len, size_of=len)
+
+    def test_recursive_function_buckets_top_level_only(self) -> None:
+        """Test recursion mode buckets only the top-level call"""
+
+        @performance_monitor(verbose=False, track_memory=False, size_of=lambda n: n)
+        def countdown(n: int) -> int:
+            return 0 if n == 0 else countdown(n - 1)
+
+        countdown(10)
+        buckets = get_performance_stats()["countdown"]["buckets"]
+        self.assertEqual(list(buckets), [8])
+        self.assertEqual(buckets[8]["call_count"], 1)
+
+
+class TestRecursionDepth(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_depth_histogram_and_max_depth(self) -> None:
+        """Test each top-level call records how deep it recursed"""
+
+        @performance_monitor(verbose=False, track_memory=False)
+        def walk(n: int) -> int:
+            return 0 if n == 0 else 1 + walk(n - 1)
+
+        walk(4)
+        walk(0)
+        walk(2)
+
+        stats = get_performance_stats()["walk"]
+        self.assertEqual(stats["call_count"], 3)
+        self.assertEqual(stats["max_depth"], 5)
+        self.assertEqual(stats["recursive_calls"], 6)
+        self.assertEqual(stats["depth_counts"], {5: 1, 1: 1, 3: 1})
+
+    def test_self_time_per_depth(self) -> None:
+        """Test time at each depth excludes the deeper levels"""
+
+        @performance_monitor(verbose=False, track_memory=False)
+        def nest(n: int) -> None:
+            if n == 0:
+                time.sleep(0.02)
+            else:
+                nest(n - 1)
+
+        nest(2)
+        stats = get_performance_stats()["nest"]
+        self_time = stats["depth_self_time"]
+        self.assertEqual(set(self_time), {1, 2, 3})
+        self.assertGreaterEqual(self_time[3], 0.019)
+        self.assertLess(self_time[1] + self_time[2], 0.01)
+        self.assertAlmostEqual(sum(self_time.values()), stats["total_time"])
+
+    def test_depth_resets_after_exception(self) -> None:
+        """Test a failure deep in the recursion leaves the next call top-level"""
+
+        @performance_monitor(verbose=False, track_memory=False)
+        def explode(n: int) -> None:
+            if n == 0:
+                raise ValueError("bottom")
+            explode(n - 1)
+
+        with self.assertRaises(ValueError):
+            explode(3)
+        with self.assertRaises(ValueError):
+            explode(0)
+
+        stats = get_performance_stats()["explode"]
+        self.assertEqual(stats["call_count"], 2)
+        self.assertEqual(stats["depth_counts"], {4: 1, 1: 1})
+
+
+class TestColdStart(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_first_calls_are_kept_apart(self) -> None:
+        """Test warmup calls stay out of the steady-state timings"""
+        delays = iter([0.02, 0.0, 0.0, 0.0, 0.0])
+
+        @performance_monitor(verbose=False, track_memory=False, warmup_calls=2)
+        def connect() -> None:
+            time.sleep(next(delays))
+
+        for _ in range(5):
+            connect()
+
+        stats = get_performance_stats()["connect"]
+        self.assertEqual(stats["cold_calls"], 2)
+        self.assertEqual(stats["call_count"], 3)
+        self.assertEqual(len(stats["times"]), 3)
+        self.assertEqual(sum(stats["success_latency"]), 3)
+        self.assertGreaterEqual(stats["max_cold_time"], 0.019)
+        self.assertLess(stats["max_time"], 0.019)
+        self.assertTrue(stats["warm"])
+
+    def test_cold_until_marked_warm(self) -> None:
+        """Test warmup_calls=None keeps calls cold until mark_warm()"""
+
+        @performance_monitor(verbose=False, track_memory=False, warmup_calls=None)
+        def load() -> None:
+            pass
+
+        load()
+        load()
+        mark_warm("load")
+        load()
+
+        stats = get_performance_stats()["load"]
+        self.assertEqual((stats["cold_calls"], stats["call_count"]), (2, 1))
+
+    def test_global_warm_signal(self) -> None:
+        """Test mark_warm() ends started warmups and waiting functions"""
+
+        @performance_monitor(verbose=False, track_memory=False, warmup_calls=5)
+        def started() -> None:
+            pass
+
+        @performance_monitor(verbose=False, track_memory=False, warmup_calls=None)
+        def waiting() -> None:
+            pass
+
+        started()
+        mark_warm()
+        started()
+        waiting()
+        stats = get_performance_stats()
+        self.assertEqual(
+            (stats["started"]["cold_calls"], stats["started"]["call_count"]), (1, 1)
+        )
+        self.assertEqual(
+            (stats["waiting"]["cold_calls"], stats["waiting"]["call_count"]), (0, 1)
+        )
+
+        reset_performance_stats()
+        waiting()
+        self.assertEqual(get_performance_stats()["waiting"]["cold_calls"], 1)
+
+    def test_cold_calls_stay_out_of_breakdowns(self) -> None:
+        """Test warmup calls are not counted in buckets, labels or memo stats"""
+        delays = iter([0.02, 0.02, 0.0, 0.0, 0.0])
+
+        @performance_monitor(
+            verbose=False,
+            track_memory=False,
+            warmup_calls=2,
+            size_of=len,
+            labels=lambda items: {"kind": "list"},
+            advise_memo=True,
+        )
+        def scan(items: tuple[int, ...]) -> None:
+            time.sleep(next(delays))
+
+        for _ in range(5):
+            scan((1, 2))
+
+        stats = get_performance_stats()["scan"]
+        self.assertEqual((stats["cold_calls"], stats["call_count"]), (2, 3))
+        (bucket,) = stats["buckets"].values()
+        self.assertEqual(bucket["call_count"], 3)
+        self.assertLess(bucket["max_time"], 0.019)
+        row = stats["labels"]["kind=list"]
+        self.assertEqual(row["calls"], 3)
+        self.assertLess(row["max_time"], 0.019)
+        self.assertEqual((stats["memo_calls"], stats["repeat_calls"]), (3, 2))
+
+    def test_global_warm_signal_keeps_later_warmups(self) -> None:
+        """Test warmup_calls=N called after mark_warm() still runs cold"""
+
+        @performance_monitor(verbose=False, track_memory=False, warmup_calls=3)
+        def later() -> None:
+            pass
+
+        mark_warm()
+        for _ in range(5):
+            later()
+
+        stats = get_performance_stats()["later"]
+        self.assertEqual((stats["cold_calls"], stats["call_count"]), (3, 2))
+        self.assertTrue(stats["warm"])
+
+
+class TestFailureBreakdown(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_failures_by_exception_type(self) -> None:
+        """Test failures are tabulated per exception class"""
+
+        @performance_monitor(verbose=False, track_memory=False)
+        def fetch(mode: str) -> str:
+            if mode == "timeout":
+                time.sleep(0.01)
+                raise TimeoutError("slow")
+            if mode == "reject":
+                raise PermissionError("no")
+            return "ok"
+
+        for mode in ("ok", "timeout", "reject", "reject", "ok"):
+            try:
+                fetch(mode)
+            except OSError:
+                pass
+
+        stats = get_performance_stats()["fetch"]
+        self.assertEqual(stats["failure_count"], 3)
+        failures = stats["failures"]
+        self.assertEqual(set(failures), {"TimeoutError", "PermissionError"})
+        self.assertEqual(failures["PermissionError"]["count"], 2)
+        self.assertGreaterEqual(failures["TimeoutError"]["min_time"], 0.009)
+        self.assertLess(failures["PermissionError"]["max_time"], 0.009)
+
+        self.assertEqual(sum(stats["success_latency"]), 2)
+        self.assertEqual(sum(stats["failure_latency"]), 3)
+        self.assertAlmostEqual(
+            stats["failure_time"],
+            sum(failure["total_time"] for failure in failures.values()),
+        )
+
+    def test_failures_kept_out_of_success_latency(self) -> None:
+        """Test failed calls stay out of times, total_time and the averages"""
+
+        @performance_monitor(verbose=False, track_memory=False)
+        def fetch(timeout: bool) -> None:
+            if timeout:
+                time.sleep(0.05)
+                raise TimeoutError("slow")
+
+        fetch(False)
+        with self.assertRaises(TimeoutError):
+            fetch(True)
+
+        stats = get_performance_stats()["fetch"]
+        self.assertEqual(stats["call_count"], 2)
+        self.assertEqual(len(stats["times"]), 1)
+        self.assertEqual(len(stats["memory_peaks"]), 1)
+        self.assertLess(stats["total_time"], 0.01)
+        self.assertGreaterEqual(stats["failure_time"], 0.049)
+        self.assertGreaterEqual(stats["max_time"], 0.049)
+        (row,) = build_report_rows({"fetch": stats}, ["fetch"])
+        self.assertLess(row["avg_time"], 0.01)
+        self.assertLess(row["p99_time"], 0.01)
+
+    def test_custom_exception_name_includes_module(self) -> None:
+        """Test non-builtin exceptions are labelled with their module"""
+
+        class QuotaExceeded(Exception):
+            pass
+
+        @performance_monitor(verbose=False, track_memory=False)
+        def call() -> None:
+            raise QuotaExceeded()
+
+        with self.assertRaises(QuotaExceeded):
+            call()
+
+        (label,) = get_performance_stats()["call"]["failures"]
+        self.assertTrue(label.startswith(__name__ + "."))
+        self.assertTrue(label.endswith("QuotaExceeded"))
+
+
+class Node:
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+
+class TestAllocationTracking(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_net_blocks_per_call(self) -> None:
+        """Test retained allocations are counted per call"""
+        kept: list[Any] = []
+
+        @performance_monitor(verbose=False, track_memory=False, track_allocations=True)
+        def leak() -> None:
+            kept.extend([i] * 4 for i in range(1000))
+
+        leak()
+        leak()
+
+        stats = get_performance_stats()["leak"]
+        self.assertEqual(stats["alloc_calls"], 2)
+        self.assertGreaterEqual(stats["alloc_blocks"], 2000)
+        self.assertGreaterEqual(stats["max_alloc_blocks"], 1000)
+        self.assertEqual(stats["alloc_samples"], 0)
+
+    def test_allocation_sampling(self) -> None:
+        """Test every Nth call records where its retained blocks were allocated"""
+        kept: list[Any] = []
+
+        @performance_monitor(verbose=False, track_memory=False, sample_allocations=2)
+        def build() -> None:
+            # Enough objects to run young collections during the call
+            kept.append([Node(i) for i in range(3000)])
+
+        was_tracing = tracemalloc.is_tracing()
+        collections = gc.get_stats()[0]["collections"]
+        for _ in range(10):
+            build()
+        self.assertGreater(gc.get_stats()[0]["collections"], collections)
+
+        stats = get_performance_stats()["build"]
+        self.assertEqual(stats["alloc_calls"], 10)
+        self.assertEqual(stats["alloc_samples"], 5)
+        site, blocks = max(stats["alloc_sites"].items(), key=lambda item: item[1])
+        self.assertTrue(site.startswith("test_monitor.py:"))
+        self.assertGreaterEqual(blocks, 3000 * 5)
+        self.assertEqual(tracemalloc.is_tracing(), was_tracing)
+
+    def test_invalid_sample_rate(self) -> None:
+        """Test a negative sample rate is rejected"""
+        with self.assertRaises(ValueError):
+            performance_monitor(sample_allocations=-1)
+
+
+class TestFunctionStatsRecord(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_read_only_view(self) -> None:
+        """Test the live entry reads like a dict but cannot be assigned to"""
+
+        @performance_monitor(verbose=False, track_memory=False)
+        def tick() -> None:
+            pass
+
+        tick()
+        record = performance_stats["tick"]
+        self.assertIsInstance(record, FunctionStats)
+        self.assertEqual(record["call_count"], 1)
+        self.assertIn("total_time", record)
+        self.assertNotIn("total_ns", record)
+        with self.assertRaises(TypeError):
+            record["call_count"] = 5  # type: ignore[index]
+        with self.assertRaises(KeyError):
+            record["missing"]
+
+        copy = get_performance_stats()["tick"]
+        self.assertIs(type(copy), dict)
+        self.assertEqual(copy, dict(record))
+
+    def test_nanosecond_totals(self) -> None:
+        """Test durations accumulate as exact integer nanoseconds"""
+        record = FunctionStats("tests")
+        self.assertEqual(record["min_time"], float("inf"))
+
+        performance_stats["manual"] = record
+        for _ in range(1000):
+            _record_function_stats("manual", 100, 0.0, 0.0, True)
+        self.assertEqual(record.total_ns, 100_000)
+        self.assertEqual(record["total_time"], 100_000 / 1e9)
+        self.assertEqual(record["min_time"], 100 / 1e9)
+
+    def test_merge_plain_dict(self) -> None:
+        """Test plain dict entries merge into records, seconds to ns"""
+        merge_performance_stats(
+            {"remote": {"call_count": 2, "total_time": 0.5, "min_time": 0.1}}
+        )
+        merge_performance_stats({"remote": dict(performance_stats["remote"])})
+
+        record = performance_stats["remote"]
+        self.assertEqual(record.call_count, 4)
+        self.assertEqual(record.total_ns, 1_000_000_000)
+        self.assertEqual(record.min_ns, 100_000_000)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,115 @@
+import itertools
+import unittest
+from unittest import mock
+
+from performance_tracker import (
+    calibrate_overhead,
+    disable_overhead_accounting,
+    enable_overhead_accounting,
+    get_performance_stats,
+    monitor,
+    performance_monitor,
+    reset_performance_stats,
+)
+from performance_tracker.monitor import _overhead_frames, performance_stats
+from performance_tracker.report import _overhead_ratio, format_performance_report
+
+
+@performance_monitor(verbose=False, track_memory=False)
+def leaf() -> int:
+    return 1
+
+
+@performance_monitor(verbose=False, track_memory=False)
+def parent(n: int) -> int:
+    return sum(leaf() for _ in range(n))
+
+
+class TestOverheadAccounting(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def tearDown(self) -> None:
+        disable_overhead_accounting()
+
+    def test_calibration_is_positive_and_leaves_no_stats(self) -> None:
+        """Test a wrapper costs more than a bare call and cleans up after itself"""
+        overhead = calibrate_overhead(track_memory=False)
+        self.assertGreater(overhead, 0)
+        self.assertLess(overhead, 0.001)
+        self.assertEqual(get_performance_stats(), {})
+
+    def test_calibration_skips_listeners_and_sinks(self) -> None:
+        """Test calibration calls reach no listener or sink, which stay attached"""
+        seen: list[str] = []
+
+        def listener(name: str, duration: float, success: bool) -> None:
+            seen.append(name)
+
+        def sink(name: str, start_ns: int, elapsed_ns: int, success: bool) -> None:
+            seen.append(name)
+
+        monitor._call_listeners.append(listener)
+        monitor._trace_sinks.append(sink)
+        self.addCleanup(monitor._call_listeners.remove, listener)
+        self.addCleanup(monitor._trace_sinks.remove, sink)
+
+        calibrate_overhead(track_memory=False)
+        self.assertEqual(seen, [])
+        self.assertIs(monitor._call_listeners[-1], listener)
+        self.assertIs(monitor._trace_sinks[-1], sink)
+
+        leaf()
+        self.assertEqual(seen, ["leaf", "leaf"])
+
+    def test_nested_overhead_is_charged_to_parent(self) -> None:
+        """Test the parent's nested overhead covers every child call"""
+        calibrated = enable_overhead_accounting()
+        self.assertIn("track_recursion", calibrated)
+
+        parent(50)
+        stats = get_performance_stats()
+        per_call = stats["leaf"]["own_overhead"] / stats["leaf"]["call_count"]
+        self.assertGreater(per_call, 0)
+        self.assertAlmostEqual(stats["parent"]["nested_overhead"], 50 * per_call)
+        self.assertEqual(stats["leaf"]["nested_overhead"], 0.0)
+        self.assertEqual(_overhead_frames(), [])
+
+        report = format_performance_report(output="detailed")
+        self.assertIn("Instrumentation Overhead:", report)
+
+    def test_subtract_reduces_parent_time(self) -> None:
+        """Test subtraction removes the nested overhead from recorded times"""
+        enable_overhead_accounting(subtract=True)
+        self.addCleanup(monitor._overhead_ns.update, dict(monitor._overhead_ns))
+        for config in monitor._overhead_ns:
+            monitor._overhead_ns[config] = 500
+
+        # Every clock read advances 1000 ns: leaf calls measure 1000 ns and
+        # the parent 2 reads per leaf call plus its own interval
+        clock = itertools.count(0, 1000)
+        with mock.patch.object(monitor, "perf_counter_ns", clock.__next__):
+            parent(10)
+
+        self.assertEqual(performance_stats["leaf"].total_ns, 10 * 1000)
+        record = performance_stats["parent"]
+        self.assertEqual(record.nested_overhead, 10 * 500 / 1e9)
+        self.assertEqual(record.total_ns, 21 * 1000 - 10 * 500)
+        self.assertEqual(record.subtracted_overhead, 10 * 500 / 1e9)
+
+        # The share is of the time as measured, before the subtraction
+        ratio = _overhead_ratio(get_performance_stats()["parent"])
+        self.assertAlmostEqual(ratio, 10 * 500 / (21 * 1000))
+
+    def test_disabled_by_default(self) -> None:
+        """Test nothing is accounted unless enabled"""
+        parent(5)
+        stats = get_performance_stats()
+        self.assertEqual(stats["parent"]["nested_overhead"], 0.0)
+        self.assertEqual(stats["leaf"]["own_overhead"], 0.0)
+        self.assertNotIn("Overhead", format_performance_report())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from performance_tracker import (
+    SamplingProfiler,
+    performance_monitor,
+    reset_performance_stats,
+    start_profiler,
+)
+
+
+def spin(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@performance_monitor(verbose=False, track_memory=False)
+def hot_function() -> None:
+    spin(0.2)
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_samples_attributed_to_monitored_function(self) -> None:
+        """Test samples land on the innermost monitored function"""
+        with SamplingProfiler(interval=0.002) as profiler:
+            hot_function()
+
+        samples = profiler.function_samples()
+        self.assertGreater(samples.get("hot_function", 0), 10)
+        (hottest,) = profiler.hot_lines("hot_function", limit=1)
+        self.assertEqual(hottest["function"], "spin")
+        self.assertTrue(hottest["filename"].endswith("test_profiler.py"))
+        self.assertIn("Function: hot_function", profiler.report())
+
+    def test_folded_stacks(self) -> None:
+        """Test folded output lists call paths root first with counts"""
+        profiler = SamplingProfiler()
+        worker = threading.Thread(target=hot_function)
+        worker.start()
+        time.sleep(0.05)
+        for _ in range(5):
+            profiler.sample()
+        worker.join()
+
+        folded = profiler.folded().splitlines()
+        spin_stacks = [line for line in folded if "hot_function" in line]
+        self.assertTrue(spin_stacks)
+        path, count = spin_stacks[0].rsplit(" ", 1)
+        self.assertTrue(path.split(";")[-1].startswith("spin ("))
+        self.assertGreaterEqual(int(count), 1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.folded")
+            profiler.write_folded(path)
+            with open(path, encoding="utf-8") as handle:
+                self.assertEqual(handle.read().strip(), profiler.folded())
+
+    def test_bounded_trie(self) -> None:
+        """Test new call paths stop growing the trie at max_nodes"""
+        profiler = SamplingProfiler(max_nodes=3)
+        for _ in range(3):
+            profiler.sample()
+        self.assertLessEqual(profiler._nodes, 3)
+        self.assertEqual(profiler.samples, sum(profiler.function_samples().values()))
+
+    def test_start_and_stop(self) -> None:
+        """Test the sampling thread starts and stops cleanly"""
+        profiler = start_profiler(interval=0.001)
+        self.assertTrue(profiler.running)
+        spin(0.02)
+        profiler.stop()
+        self.assertFalse(profiler.running)
+        self.assertGreater(profiler.samples, 0)
+        profiler.clear()
+        self.assertEqual(profiler.folded(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
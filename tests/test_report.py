@@ -0,0 +1,283 @@
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+from typing import Any
+
+from performance_tracker import (
+    performance_monitor,
+    reset_performance_stats,
+    show_performance_report,
+)
+from performance_tracker.report import format_performance_report, select_functions
+
+
+def _entry(times: list[float], module: str = "app", failures: int = 0) -> Any:
+    return {
+        "module": module,
+        "call_count": len(times),
+        "total_time": sum(times),
+        "min_time": min(times),
+        "max_time": max(times),
+        "times": times,
+        "total_memory_used": 0.0,
+        "max_memory_peak": float(len(times)),
+        "memory_peaks": [0.0] * len(times),
+        "success_count": len(times) - failures,
+        "failure_count": failures,
+    }
+
+
+SAMPLE_STATS = {
+    "many_fast_calls": _entry([0.001] * 50, module="app.db"),
+    "one_slow_call": _entry([0.9], module="app.views"),
+    "flaky_call": _entry([0.01, 0.2, 0.01, 0.02], failures=3, module="lib.http"),
+    "helper": _entry([0.001, 0.003], module="lib.util"),
+}
+
+
+class TestReportSelection(unittest.TestCase):
+    def test_sort_keys(self) -> None:
+        """Test each sort key picks the expected leader"""
+        expected = {
+            "total_time": "one_slow_call",
+            "call_count": "many_fast_calls",
+            "error_rate": "flaky_call",
+            "memory": "many_fast_calls",
+            "p99": "one_slow_call",
+        }
+        for sort_by, leader in expected.items():
+            with self.subTest(sort_by=sort_by):
+                names = select_functions(SAMPLE_STATS, sort_by=sort_by, top=1)
+                self.assertEqual(names, [leader])
+
+    def test_top_none_returns_all_sorted(self) -> None:
+        """Test that top=None returns every function in order"""
+        names = select_functions(SAMPLE_STATS, sort_by="call_count", top=None)
+        self.assertEqual(
+            names, ["many_fast_calls", "flaky_call", "helper", "one_slow_call"]
+        )
+
+    def test_filters(self) -> None:
+        """Test name pattern and module prefix filtering"""
+        self.assertEqual(
+            select_functions(SAMPLE_STATS, pattern="*_call", top=None),
+            ["one_slow_call", "flaky_call"],
+        )
+        self.assertEqual(
+            sorted(select_functions(SAMPLE_STATS, module="lib", top=None)),
+            ["flaky_call", "helper"],
+        )
+        self.assertEqual(
+            select_functions(SAMPLE_STATS, module="app.d*", top=None),
+            ["many_fast_calls"],
+        )
+
+    def test_invalid_sort_key(self) -> None:
+        """Test that unknown sort keys are rejected"""
+        with self.assertRaises(ValueError):
+            select_functions(SAMPLE_STATS, sort_by="latency")
+
+
+class TestReportFormats(unittest.TestCase):
+    def test_text_is_compact_top_n(self) -> None:
+        """Test the default table only lists the requested number of rows"""
+        report = format_performance_report(top=2, stats=SAMPLE_STATS)
+        self.assertIn("top 2 of 4 functions by total_time", report)
+        self.assertIn("one_slow_call", report)
+        self.assertIn("flaky_call", report)
+        self.assertNotIn("helper", report)
+
+    def test_title_counts_matching_functions(self) -> None:
+        """Test the title total only counts functions left after filtering"""
+        report = format_performance_report(top=1, module="lib", stats=SAMPLE_STATS)
+        self.assertIn("top 1 of 2 functions by total_time", report)
+        report = format_performance_report(module="lib", stats=SAMPLE_STATS)
+        self.assertIn("(2 functions by total_time)", report)
+
+    def test_json(self) -> None:
+        """Test JSON rows carry derived metrics"""
+        rows = json.loads(
+            format_performance_report(
+                sort_by="error_rate", output="json", stats=SAMPLE_STATS
+            )
+        )
+        self.assertEqual(rows[0]["name"], "flaky_call")
+        self.assertAlmostEqual(rows[0]["error_rate"], 0.75)
+        self.assertEqual(rows[0]["module"], "lib.http")
+        self.assertIn("p99_time", rows[0])
+
+    def test_markdown(self) -> None:
+        """Test Markdown output is a table with one row per function"""
+        report = format_performance_report(output="markdown", stats=SAMPLE_STATS)
+        table_rows = [line for line in report.splitlines() if line.startswith("| `")]
+        self.assertEqual(len(table_rows), 4)
+
+    def test_detailed(self) -> None:
+        """Test the per-function block format"""
+        report = format_performance_report(
+            output="detailed", pattern="helper", stats=SAMPLE_STATS
+        )
+        self.assertIn("Function: helper", report)
+        self.assertIn("Average Time: 0.0020 seconds", report)
+
+    def test_failure_breakdown(self) -> None:
+        """Test failure latency is reported per exception type"""
+        # times and total_time hold the successful calls only
+        entry = _entry([0.001, 0.001])
+        entry.update(call_count=3, failure_count=1, max_time=0.5)
+        entry["success_latency"] = [0] * 22
+        entry["success_latency"][4] = 2
+        entry["failure_latency"] = [0] * 22
+        entry["failure_latency"][13] = 1
+        entry["failure_time"] = 0.5
+        entry["failures"] = {
+            "TimeoutError": {
+                "count": 1,
+                "total_time": 0.5,
+                "min_time": 0.5,
+                "max_time": 0.5,
+            }
+        }
+        stats = {"fetch": entry}
+
+        rows = json.loads(format_performance_report(output="json", stats=stats))
+        self.assertAlmostEqual(rows[0]["failure_avg_time"], 0.5)
+        self.assertAlmostEqual(rows[0]["success_avg_time"], 0.001)
+        self.assertAlmostEqual(rows[0]["avg_time"], 0.001)
+        self.assertAlmostEqual(rows[0]["p99_time"], 0.001)
+        self.assertEqual(rows[0]["failures"][0]["exception"], "TimeoutError")
+        self.assertIn("Fail Avg", format_performance_report(stats=stats))
+        detailed = format_performance_report(output="detailed", stats=stats)
+        self.assertIn("TimeoutError: 1 calls (33.3% of calls)", detailed)
+        self.assertIn("Failure Latency: avg 0.5000 seconds", detailed)
+
+        self.assertNotIn("Fail Avg", format_performance_report(stats=SAMPLE_STATS))
+
+    def test_allocations(self) -> None:
+        """Test net retained blocks and top allocation sites are reported"""
+        entry = _entry([0.001, 0.002])
+        entry.update(
+            alloc_calls=2,
+            alloc_blocks=300,
+            max_alloc_blocks=200,
+            alloc_samples=1,
+            alloc_sites={"app.py:12": 5, "app.py:40": 120},
+        )
+        stats = {"build": entry}
+
+        self.assertIn("Net Blocks", format_performance_report(stats=stats))
+        detailed = format_performance_report(output="detailed", stats=stats)
+        self.assertIn("Net Retained Blocks per Call: 150.0 (max 200)", detailed)
+        self.assertIn("app.py:40 120.0, app.py:12 5.0", detailed)
+        self.assertNotIn("Net Blocks", format_performance_report(stats=SAMPLE_STATS))
+
+    def test_cold_start(self) -> None:
+        """Test cold-start cost is shown next to steady-state latency"""
+        entry = _entry([0.001, 0.002])
+        entry.update(cold_calls=1, cold_failures=0, cold_time=0.5, max_cold_time=0.5)
+        stats = {"connect": entry}
+
+        self.assertIn("Cold Avg", format_performance_report(stats=stats))
+        detailed = format_performance_report(output="detailed", stats=stats)
+        self.assertIn("Cold Avg: 0.5000 seconds, max 0.5000 seconds", detailed)
+        self.assertIn("Steady Avg: 0.0015 seconds", detailed)
+        self.assertNotIn("Cold Avg", format_performance_report(stats=SAMPLE_STATS))
+
+    def test_recursion(self) -> None:
+        """Test max depth and self time per depth are reported"""
+        entry = _entry([0.004])
+        entry.update(
+            recursive_calls=3,
+            max_depth=4,
+            depth_counts={4: 1},
+            depth_self_time={1: 0.001, 2: 0.0, 3: 0.0, 4: 0.003},
+        )
+        stats = {"walk": entry}
+
+        self.assertIn("Depth", format_performance_report(stats=stats))
+        detailed = format_performance_report(output="detailed", stats=stats)
+        self.assertIn("Max Depth: 4 (3 recursive calls)", detailed)
+        self.assertIn("4: 0.0030 seconds", detailed)
+        self.assertNotIn("Depth", format_performance_report(stats=SAMPLE_STATS))
+
+    def test_complexity_shown_for_size_buckets(self) -> None:
+        """Test the scaling column and bucket section for size_of functions"""
+        entry = _entry([0.001, 0.004, 0.016])
+        entry["buckets"] = {
+            size: {
+                "call_count": 1,
+                "total_time": 1e-6 * size**2,
+                "min_time": 1e-6 * size**2,
+                "max_time": 1e-6 * size**2,
+                "total_size": float(size),
+            }
+            for size in (32, 64, 128)
+        }
+        entry["bucket_kind"] = "size"
+        stats = {"quadratic": entry}
+
+        self.assertIn("n^2.00", format_performance_report(stats=stats))
+        detailed = format_performance_report(output="detailed", stats=stats)
+        self.assertIn("size 64+: 1 calls", detailed)
+        self.assertIn("Empirical Complexity: ~O(n^2.00)", detailed)
+        rows = json.loads(format_performance_report(output="json", stats=stats))
+        self.assertAlmostEqual(rows[0]["complexity"], 2.0)
+
+        self.assertNotIn("Scaling", format_performance_report(stats=SAMPLE_STATS))
+
+    def test_key_buckets_are_not_sizes(self) -> None:
+        """Test integer key= buckets are shown as plain labels"""
+        entry = _entry([0.01])
+        entry["buckets"] = {
+            404: {
+                "call_count": 1,
+                "total_time": 0.01,
+                "min_time": 0.01,
+                "max_time": 0.01,
+                "total_size": 0.0,
+            },
+        }
+        entry["bucket_kind"] = "key"
+        detailed = format_performance_report(output="detailed", stats={"status": entry})
+        self.assertIn("  404: 1 calls", detailed)
+        self.assertNotIn("size 404+", detailed)
+
+    def test_invalid_output(self) -> None:
+        """Test that unknown output formats are rejected"""
+        with self.assertRaises(ValueError):
+            format_performance_report(output="html", stats=SAMPLE_STATS)
+
+
+class TestShowPerformanceReport(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_empty(self) -> None:
+        """Test the message shown before any data is collected"""
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            show_performance_report()
+        self.assertIn("No performance data collected yet.", buffer.getvalue())
+
+    def test_live_stats_include_module(self) -> None:
+        """Test that live stats can be filtered by the defining module"""
+
+        @performance_monitor(verbose=False)
+        def reported_func() -> None:
+            pass
+
+        reported_func()
+
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            show_performance_report(module=__name__)
+            show_performance_report(module="some.other.module")
+        output = buffer.getvalue()
+        self.assertEqual(output.count("reported_func"), 1)
+        self.assertIn("No performance data collected yet.", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+
+from performance_tracker.sketches import CountMinSketch, HyperLogLog, SpaceSaving
+
+
+class TestCountMinSketch(unittest.TestCase):
+    def test_never_undercounts(self) -> None:
+        """Test estimates are at least the true count"""
+        sketch = CountMinSketch(width=64, depth=4)
+        for item in range(500):
+            for _ in range(item % 5):
+                sketch.add(item)
+
+        for item in range(500):
+            self.assertGreaterEqual(sketch.estimate(item), item % 5)
+
+    def test_add_returns_previous_estimate(self) -> None:
+        """Test add() reports the count before the addition"""
+        sketch = CountMinSketch()
+        self.assertEqual(sketch.add(hash("a")), 0)
+        self.assertEqual(sketch.add(hash("a")), 1)
+        self.assertEqual(sketch.total, 2)
+
+    def test_wide_sketch_is_exact_for_few_items(self) -> None:
+        """Test a wide sketch has no collisions for a handful of items"""
+        sketch = CountMinSketch(width=4096, depth=4)
+        for item in (1, 2, 3):
+            sketch.add(item, count=item)
+        self.assertEqual([sketch.estimate(i) for i in (1, 2, 3, 4)], [1, 2, 3, 0])
+
+    def test_clear_and_validation(self) -> None:
+        """Test clearing and invalid dimensions"""
+        sketch = CountMinSketch()
+        sketch.add(-5)
+        sketch.clear()
+        self.assertEqual(sketch.estimate(-5), 0)
+        with self.assertRaises(ValueError):
+            CountMinSketch(width=0)
+
+
+class TestHyperLogLog(unittest.TestCase):
+    def test_distinct_estimates(self) -> None:
+        """Test small counts are exact and large ones within a few percent"""
+        sketch = HyperLogLog()
+        for item in (3, 1, 3, 2, 1):
+            sketch.add(hash(item))
+        self.assertEqual(round(sketch.estimate()), 3)
+        self.assertEqual(sketch.total, 5)
+
+        for item in range(50000):
+            sketch.add(hash((item, "key")))
+        self.assertAlmostEqual(sketch.estimate() / 50003, 1.0, delta=0.05)
+
+    def test_clear_and_validation(self) -> None:
+        """Test clearing and invalid precision"""
+        sketch = HyperLogLog(precision=4)
+        sketch.add(7)
+        sketch.clear()
+        self.assertEqual((sketch.estimate(), sketch.total), (0.0, 0))
+        with self.assertRaises(ValueError):
+            HyperLogLog(precision=2)
+
+
+class TestSpaceSaving(unittest.TestCase):
+    def test_heavy_hitters_survive_a_long_tail(self) -> None:
+        """Test frequent items stay tracked while rare ones churn"""
+        counter = SpaceSaving(capacity=5)
+        for i in range(1000):
+            counter.add("hot" if i % 2 else "warm" if i % 3 else f"rare{i}")
+
+        top = counter.top(2)
+        self.assertEqual([item for item, _, _ in top], ["hot", "warm"])
+        count, error = counter.get("hot")
+        self.assertGreaterEqual(count, 500)
+        self.assertLessEqual(count - error, 500)
+        self.assertEqual(len(counter), 5)
+        self.assertEqual(counter.total, 1000)
+
+    def test_add_returns_evicted_item(self) -> None:
+        """Test a new item replaces the least counted and inherits its count"""
+        counter = SpaceSaving(capacity=2)
+        self.assertIsNone(counter.add("a", count=3))
+        self.assertIsNone(counter.add("b"))
+        self.assertEqual(counter.add("c"), "b")
+        self.assertNotIn("b", counter)
+        self.assertEqual(counter.get("c"), (2, 1))
+        self.assertEqual(counter.get("b"), (0, 0))
+
+    def test_from_counts_keeps_the_largest(self) -> None:
+        """Test rebuilding from entries keeps the most counted within capacity"""
+        counter = SpaceSaving.from_counts(
+            [("a", 1, 0), ("b", 5, 1), ("c", 3, 0)], capacity=2
+        )
+        self.assertEqual(counter.top(), [("b", 5, 1), ("c", 3, 0)])
+        self.assertEqual(counter.add("d"), "c")
+
+    def test_clear_and_validation(self) -> None:
+        """Test clearing and invalid capacity"""
+        counter = SpaceSaving()
+        counter.add("x")
+        counter.clear()
+        self.assertEqual(len(counter), 0)
+        self.assertEqual(counter.total, 0)
+        with self.assertRaises(ValueError):
+            SpaceSaving(capacity=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import sys
+import threading
+import time
+import unittest
+
+from performance_tracker import (
+    StatsSnapshot,
+    delta,
+    performance_monitor,
+    reset_performance_stats,
+    take_snapshot,
+)
+
+
+@performance_monitor(verbose=False, track_memory=False, key=lambda n: n % 2)
+def work(n: int) -> int:
+    if n < 0:
+        raise ValueError(n)
+    return n
+
+
+class TestSnapshots(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_snapshot_is_frozen(self) -> None:
+        """Test later calls don't change a snapshot, and it can't be edited"""
+        work(1)
+        snapshot = take_snapshot()
+        work(2)
+        work(3)
+
+        entry = snapshot["work"]
+        self.assertEqual(entry["call_count"], 1)
+        self.assertEqual(len(entry["times"]), 1)
+        self.assertEqual(list(entry["times"]), [entry["total_time"]])
+        self.assertEqual(entry["buckets"][1]["call_count"], 1)
+        with self.assertRaises(TypeError):
+            entry["call_count"] = 5  # type: ignore[index]
+        self.assertEqual(take_snapshot()["work"]["call_count"], 3)
+
+    def test_snapshot_does_not_copy_samples(self) -> None:
+        """Test snapshot cost does not grow with the number of samples"""
+        for n in range(20000):
+            work(n)
+        start = time.perf_counter()
+        snapshot = StatsSnapshot()
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(snapshot["work"]["times"]), 20000)
+        self.assertLess(elapsed, 0.01)
+
+    def test_delta_since_snapshot(self) -> None:
+        """Test deltas hold differences and only the new samples"""
+        work(1)
+        first, changes = delta()
+        self.assertEqual(changes["work"]["call_count"], 1)
+
+        work(2)
+        with self.assertRaises(ValueError):
+            work(-1)
+        second, changes = delta(since=first)
+        change = changes["work"]
+        self.assertEqual(change["call_count"], 2)
+        self.assertEqual(change["failure_count"], 1)
+        self.assertEqual(len(change["times"]), 1)
+        self.assertGreaterEqual(change["max_time"], max(change["times"]))
+        self.assertEqual(change["buckets"][0]["call_count"], 1)
+        self.assertEqual(change["failures"]["ValueError"]["count"], 1)
+
+        _, changes = delta(since=second)
+        self.assertEqual(changes, {})
+
+    def test_delta_after_reset(self) -> None:
+        """Test a reset between reads starts the function over"""
+        work(1)
+        work(3)
+        before = take_snapshot()
+        reset_performance_stats()
+        work(5)
+
+        changes = take_snapshot().delta(since=before)
+        self.assertEqual(changes["work"]["call_count"], 1)
+        self.assertEqual(len(changes["work"]["times"]), 1)
+
+    def test_consistent_while_recording(self) -> None:
+        """Test each entry agrees with itself while another thread records"""
+        stop = threading.Event()
+        # Switch threads often enough that copies and calls interleave
+        self.addCleanup(sys.setswitchinterval, sys.getswitchinterval())
+        sys.setswitchinterval(1e-6)
+
+        def record() -> None:
+            n = 0
+            while not stop.is_set():
+                n += 1
+                try:
+                    work(n if n % 5 else -n)
+                except ValueError:
+                    pass
+
+        thread = threading.Thread(target=record)
+        thread.start()
+        try:
+            checked = 0
+            deadline = time.monotonic() + 5
+            while checked < 500 and time.monotonic() < deadline:
+                entry = take_snapshot().get("work")
+                if entry is None:
+                    continue
+                checked += 1
+                calls = entry["call_count"]
+                latency = sum(entry["success_latency"]) + sum(entry["failure_latency"])
+                self.assertEqual(len(entry["times"]), entry["success_count"])
+                self.assertEqual(latency, calls)
+                buckets = sum(row["call_count"] for row in entry["buckets"].values())
+                self.assertEqual(buckets, calls)
+                failures = sum(row["count"] for row in entry["failures"].values())
+                self.assertEqual(failures, entry["failure_count"])
+        finally:
+            stop.set()
+            thread.join()
+        self.assertEqual(checked, 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import asyncio
+import time
+import unittest
+
+from performance_tracker import (
+    Span,
+    get_performance_stats,
+    performance_monitor,
+    reset_performance_stats,
+    start_span,
+    track,
+)
+from performance_tracker.monitor import _active_calls
+
+
+class TestSpans(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+
+    def test_context_manager(self) -> None:
+        """Test that a with-block records one call"""
+        with track("db.query"):
+            time.sleep(0.01)
+
+        stats = get_performance_stats()["db.query"]
+        self.assertEqual(stats["call_count"], 1)
+        self.assertEqual(stats["success_count"], 1)
+        self.assertGreater(stats["total_time"], 0.008)
+
+    def test_exception_marks_failure(self) -> None:
+        """Test that an exception inside the block is a failed call"""
+        with self.assertRaises(KeyError):
+            with track("lookup"):
+                raise KeyError("missing")
+
+        stats = get_performance_stats()["lookup"]
+        self.assertEqual(stats["failure_count"], 1)
+        self.assertEqual(_active_calls(), [])
+
+    def test_manual_start_stop(self) -> None:
+        """Test the start_span()/stop() API"""
+        span = start_span("manual")
+        self.assertTrue(span.running)
+        duration = span.stop()
+
+        self.assertFalse(span.running)
+        self.assertGreaterEqual(duration, 0)
+        self.assertEqual(get_performance_stats()["manual"]["times"], [duration])
+
+        with self.assertRaises(RuntimeError):
+            span.stop()
+
+    def test_reuse_in_loop(self) -> None:
+        """Test that one preallocated span can be re-entered repeatedly"""
+        span = Span("loop.body")
+        for _ in range(100):
+            with span:
+                pass
+
+        self.assertEqual(get_performance_stats()["loop.body"]["call_count"], 100)
+        with self.assertRaises(AttributeError):
+            span.extra = 1  # type: ignore
+
+    def test_double_start_rejected(self) -> None:
+        """Test that a running span cannot be started again"""
+        span = start_span("busy")
+        with self.assertRaises(RuntimeError):
+            span.start()
+        span.stop()
+
+    def test_span_inside_monitored_function(self) -> None:
+        """Test spans nest inside decorated functions on the call stack"""
+        seen = []
+
+        @performance_monitor(verbose=False, track_memory=False)
+        def view() -> None:
+            with track("view.sql"):
+                seen.append(list(_active_calls()))
+
+        view()
+        self.assertEqual(seen, [["view", "view.sql"]])
+        self.assertEqual(get_performance_stats()["view.sql"]["call_count"], 1)
+
+    def test_memory_tracking(self) -> None:
+        """Test optional memory tracking for a span"""
+        with track("alloc", track_memory=True):
+            data = [i for i in range(100000)]
+
+        self.assertEqual(len(data), 100000)
+        self.assertGreater(get_performance_stats()["alloc"]["max_memory_peak"], 0)
+
+    def test_async_spans_interleave(self) -> None:
+        """Test async with-blocks in concurrent tasks record separately"""
+
+        async def worker(name: str, delay: float) -> None:
+            async with track(name):
+                await asyncio.sleep(delay)
+
+        async def main() -> None:
+            await asyncio.gather(worker("task.a", 0.02), worker("task.b", 0.01))
+
+        asyncio.run(main())
+
+        stats = get_performance_stats()
+        self.assertEqual(stats["task.a"]["call_count"], 1)
+        self.assertEqual(stats["task.b"]["call_count"], 1)
+        self.assertGreater(stats["task.a"]["total_time"], 0.015)
+        self.assertEqual(_active_calls(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import socket
+import unittest
+
+from performance_tracker import (
+    StatsDExporter,
+    performance_monitor,
+    reset_performance_stats,
+)
+
+
+@performance_monitor(verbose=False, track_memory=False, name="db.query")
+def query(fail: bool = False) -> int:
+    if fail:
+        raise ValueError("boom")
+    return 1
+
+
+class TestStatsDExporter(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats and open a local UDP listener"""
+        reset_performance_stats()
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.settimeout(2)
+        self.addCleanup(self.listener.close)
+        self.port = self.listener.getsockname()[1]
+
+    def _exporter(self, **options: object) -> StatsDExporter:
+        exporter = StatsDExporter(port=self.port, **options)  # type: ignore[arg-type]
+        self.addCleanup(exporter.close)
+        return exporter
+
+    def _receive(self, packets: int) -> list[bytes]:
+        return [self.listener.recv(65535) for _ in range(packets)]
+
+    def _metrics(self) -> dict[str, str]:
+        lines = self._receive(1)[0].decode().split("\n")
+        return dict(line.split(":", 1) for line in lines)
+
+    def test_flush_sends_aggregates_once(self) -> None:
+        """Test one flush sends counters and gauges, and only what changed"""
+        exporter = self._exporter()
+        for _ in range(5):
+            query()
+        with self.assertRaises(ValueError):
+            query(fail=True)
+
+        self.assertEqual(exporter.flush(), 1)
+        metrics = self._metrics()
+        self.assertEqual(len(metrics), 7)
+        self.assertEqual(metrics["performance_tracker.db.query.calls"], "6|c")
+        self.assertEqual(metrics["performance_tracker.db.query.failures"], "1|c")
+        self.assertTrue(metrics["performance_tracker.db.query.time.p99"].endswith("|g"))
+
+        self.assertEqual(exporter.flush(), 0)
+        query()
+        exporter.flush()
+        self.assertEqual(self._metrics()["performance_tracker.db.query.calls"], "1|c")
+
+    def test_packets_fit_the_packet_size(self) -> None:
+        """Test many functions are split into datagrams under the limit"""
+        exporter = self._exporter(max_packet_size=512)
+        for i in range(20):
+            performance_monitor(verbose=False, track_memory=False, name=f"f{i}")(
+                lambda: None
+            )()
+
+        sent = exporter.flush()
+        self.assertGreater(sent, 1)
+        packets = self._receive(sent)
+        self.assertTrue(all(len(packet) <= 512 for packet in packets))
+        lines = b"\n".join(packets).split(b"\n")
+        self.assertEqual(len(lines), 20 * 7)
+        self.assertEqual(exporter.packets, sent)
+
+    def test_dogstatsd_tags(self) -> None:
+        """Test DogStatsD mode moves the function name into tags"""
+        exporter = self._exporter(dogstatsd=True, tags={"env": "test"}, prefix="app")
+        query()
+        exporter.flush()
+        line = self._receive(1)[0].split(b"\n")[0].decode()
+        self.assertEqual(
+            line, f"app.calls:1|c|#function:db.query,module:{__name__},env:test"
+        )
+        with self.assertRaises(ValueError):
+            StatsDExporter(tags={"env": "test"})
+
+    def test_background_thread_flushes_on_stop(self) -> None:
+        """Test the exporter thread sends a final flush when stopped"""
+        exporter = self._exporter(interval=60).start()
+        query()
+        exporter.stop()
+        self.assertFalse(exporter.running)
+        self.assertIn(b".calls:1|c", self._receive(1)[0])
+
+    def test_unreachable_agent_does_not_raise(self) -> None:
+        """Test send errors are counted instead of raised"""
+        self.listener.close()
+        exporter = self._exporter()
+        for _ in range(3):
+            query()
+            exporter.flush()
+        self.assertEqual(exporter.packets + exporter.dropped, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from performance_tracker import (
+    TraceRecorder,
+    TraceWriter,
+    capture_trace,
+    performance_monitor,
+    reset_performance_stats,
+    track,
+)
+from performance_tracker.control import handle_command
+from performance_tracker.monitor import _trace_sinks
+
+
+@performance_monitor(verbose=False, track_memory=False)
+def inner() -> int:
+    return 1
+
+
+@performance_monitor(verbose=False, track_memory=False)
+def outer(fail: bool = False) -> int:
+    if fail:
+        raise ValueError("boom")
+    return inner() + inner()
+
+
+@performance_monitor(verbose=False, track_memory=False)
+async def handler() -> int:
+    await asyncio.sleep(0)
+    return inner()
+
+
+def _calls(events: list[dict]) -> list[dict]:
+    return [event for event in events if event["ph"] == "X"]
+
+
+class TestTraceRecorder(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def tearDown(self) -> None:
+        self.assertEqual(_trace_sinks, [])
+
+    def test_nested_calls_nest_in_time(self) -> None:
+        """Test child events lie within their parent on the same track"""
+        with TraceRecorder() as recorder:
+            outer()
+            with self.assertRaises(ValueError):
+                outer(fail=True)
+            with track("block"):
+                pass
+        outer()
+
+        calls = _calls(recorder.trace_events())
+        self.assertEqual(
+            [event["name"] for event in calls],
+            ["inner", "inner", "outer", "outer", "block"],
+        )
+        parent = calls[2]
+        for child in calls[:2]:
+            self.assertEqual(child["tid"], parent["tid"])
+            self.assertGreaterEqual(child["ts"], parent["ts"])
+            self.assertLessEqual(
+                child["ts"] + child["dur"], parent["ts"] + parent["dur"]
+            )
+        self.assertEqual(calls[3]["args"], {"success": False})
+
+    def test_ring_buffer_drops_oldest(self) -> None:
+        """Test the buffer keeps the most recent calls and counts the rest"""
+        with TraceRecorder(capacity=4) as recorder:
+            for _ in range(5):
+                outer()
+        self.assertEqual(len(recorder), 4)
+        self.assertEqual(recorder.dropped, 11)
+
+        path = os.path.join(self.directory.name, "trace.json")
+        self.assertEqual(recorder.dump(path), 4)
+        with open(path, encoding="utf-8") as handle:
+            trace = json.load(handle)
+        names = [e for e in trace["traceEvents"] if e["name"] == "thread_name"]
+        self.assertEqual(names[0]["args"]["name"], threading.current_thread().name)
+
+    def test_threads_and_tasks_get_their_own_tracks(self) -> None:
+        """Test overlapping tasks and threads are recorded on separate tracks"""
+
+        async def main() -> None:
+            await asyncio.gather(handler(), handler())
+
+        with TraceRecorder() as recorder:
+            thread = threading.Thread(target=outer, name="worker")
+            thread.start()
+            thread.join()
+            asyncio.run(main())
+
+        events = recorder.trace_events()
+        tracks = {e["tid"]: e["args"]["name"] for e in events if e["ph"] == "M"}
+        handlers = [e for e in _calls(events) if e["name"] == "handler"]
+        self.assertEqual(len(handlers), 2)
+        self.assertNotEqual(handlers[0]["tid"], handlers[1]["tid"])
+        self.assertTrue(tracks[handlers[0]["tid"]].startswith("Task-"))
+        self.assertIn("worker", tracks.values())
+
+
+class TestTraceWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats before each test"""
+        reset_performance_stats()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _read(self, path: str) -> list[dict]:
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)  # type: ignore[no-any-return]
+
+    def test_streams_across_flushes(self) -> None:
+        """Test events written over several flushes form one valid array"""
+        path = os.path.join(self.directory.name, "stream.json")
+        writer = TraceWriter(path, flush_interval=0.01).start()
+        outer()
+        self.assertFalse(writer.wait(0.05))
+        outer()
+        writer.stop()
+
+        self.assertTrue(writer.wait(0))
+        self.assertEqual(_trace_sinks, [])
+        events = self._read(path)
+        self.assertEqual(len(_calls(events)), 6)
+        self.assertEqual(writer.written, 6)
+        self.assertEqual(writer.dropped, 0)
+
+    def test_capture_window_stops_itself(self) -> None:
+        """Test a timed capture closes its file when the window ends"""
+        path = os.path.join(self.directory.name, "window.json")
+        writer = capture_trace(path, seconds=0.05)
+        outer()
+        self.assertTrue(writer.wait(5))
+        outer()
+        self.assertEqual(len(_calls(self._read(path))), 3)
+        self.assertEqual(_trace_sinks, [])
+
+    def test_control_command(self) -> None:
+        """Test a capture can be started through the control protocol"""
+        path = os.path.join(self.directory.name, "control.json")
+        response = handle_command({"cmd": "trace", "path": path, "seconds": 0.01})
+        self.assertEqual(response, {"ok": True})
+        for _ in range(500):
+            with open(path, encoding="utf-8") as handle:
+                if handle.read().endswith("]\n"):
+                    break
+            threading.Event().wait(0.01)
+        self.assertEqual(self._read(path), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
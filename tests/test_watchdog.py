@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import unittest
+
+from performance_tracker import (
+    Watchdog,
+    concurrency,
+    get_performance_stats,
+    in_flight_calls,
+    performance_monitor,
+    reset_performance_stats,
+    track,
+)
+from performance_tracker.report import format_performance_report
+from performance_tracker.watchdog import HungCall
+
+release = threading.Event()
+
+
+@performance_monitor(verbose=False, track_memory=False)
+def stuck() -> None:
+    release.wait(5)
+
+
+@performance_monitor(verbose=False, track_memory=False)
+def quick() -> int:
+    return 1
+
+
+@performance_monitor(verbose=False, track_memory=False)
+async def stuck_coroutine(event: asyncio.Event) -> None:
+    await event.wait()
+
+
+class TestWatchdog(unittest.TestCase):
+    def setUp(self) -> None:
+        """Reset stats and start two stuck threads"""
+        reset_performance_stats()
+        release.clear()
+        self.threads = [threading.Thread(target=stuck) for _ in range(2)]
+        for thread in self.threads:
+            thread.start()
+        self.addCleanup(self._release)
+        while concurrency().get("stuck", 0) < 2:
+            threading.Event().wait(0.001)
+
+    def _release(self) -> None:
+        release.set()
+        for thread in self.threads:
+            thread.join()
+
+    def test_in_flight_table(self) -> None:
+        """Test running calls are listed and finished ones are not"""
+        quick()
+        with track("block"):
+            calls = in_flight_calls()
+        names = [call.name for call in calls]
+        self.assertEqual(sorted(names), ["block", "stuck", "stuck"])
+        self.assertEqual(names[-1], "block")
+        self.assertFalse(calls[0].coroutine)
+
+        self._release()
+        self.assertEqual(in_flight_calls(), [])
+        self.assertEqual(concurrency(), {})
+
+    def test_hung_calls_reported_once_with_stack(self) -> None:
+        """Test calls past the deadline are reported once, with their stack"""
+        reports: list[HungCall] = []
+        watchdog = Watchdog(
+            deadline=None, deadlines={"stuck": 0}, on_hung=reports.append
+        )
+
+        found = watchdog.check()
+        self.assertEqual(len(found), 2)
+        self.assertEqual(watchdog.check(), [])
+        self.assertEqual(reports, found)
+        self.assertIn("release.wait(5)", found[0].stack)
+
+        stats = get_performance_stats()["stuck"]
+        self.assertEqual(stats["hung_calls"], 2)
+        self.assertEqual(stats["max_concurrency"], 2)
+        self.assertEqual(stats["call_count"], 0)
+        report = format_performance_report(output="detailed")
+        self.assertIn("Hung Calls: 2", report)
+
+    def test_deadline_not_reached(self) -> None:
+        """Test calls within their deadline are not reported"""
+        watchdog = Watchdog(deadline=60, on_hung=self.fail)
+        self.assertEqual(watchdog.check(), [])
+        self.assertEqual(get_performance_stats()["stuck"]["hung_calls"], 0)
+
+    def test_hung_coroutine(self) -> None:
+        """Test a suspended coroutine is reported with its await stack"""
+        reports: list[HungCall] = []
+
+        async def main() -> None:
+            event = asyncio.Event()
+            task = asyncio.ensure_future(stuck_coroutine(event))
+            await asyncio.sleep(0)
+            reports.extend(Watchdog(deadline=0, on_hung=lambda call: None).check())
+            event.set()
+            await task
+
+        asyncio.run(main())
+        hung = [call for call in reports if call.coroutine]
+        self.assertEqual([call.name for call in hung], ["stuck_coroutine"])
+        self.assertIn("await event.wait()", hung[0].stack)
+
+    def test_background_thread(self) -> None:
+        """Test the watchdog thread checks on its own"""
+        reports: list[HungCall] = []
+        with Watchdog(deadline=0, interval=0.01, on_hung=reports.append) as watchdog:
+            while len(reports) < 2:
+                threading.Event().wait(0.01)
+        self.assertFalse(watchdog.running)
+        self.assertEqual(len(watchdog.hung), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()